@@ -0,0 +1,131 @@
+#This module defines the Autosaver class, which saves a TaskStore in the background after changes settle.
+
+import threading
+import time
+from typing import Optional
+from task import Task
+from task_store import TaskStore, TaskStoreListener
+
+
+class Autosaver(TaskStoreListener):
+    """
+    Saves a TaskStore on a background thread once no change has happened for delay seconds.
+
+    A burst of changes leads to a single write.  Changes only record that a save is due, so they never
+    wait for the disk.  Savers that rewrite the whole file save a copy of the store taken on the
+    background thread; CSVSaver and TextTaskSaver replace the file atomically.  Incremental savers
+    (JournalTaskSaver, SQLiteTaskSaver) take the changes of the store itself while holding its lock and
+    write them after releasing it, so they keep the task ids and changes never wait for the write.  Only
+    their first save, which writes the whole file, holds the lock throughout.
+    """
+    def __init__(self, store: TaskStore, saver, filename: str, delay: float = 1.0):
+        """
+        Subscribes to the store and starts the background thread.
+
+        :param store: The store to save.
+        :param saver: The TaskSaver used for writing.
+        :param filename: The name of the file to save to.
+        :param delay: The quiet period in seconds after the last change before saving.
+        """
+        if not isinstance(filename, str):
+            raise TypeError("Filename must be a string.")
+        if not isinstance(delay, (int, float)):
+            raise TypeError("Delay must be a number.")
+        if delay < 0:
+            raise ValueError("Delay cannot be negative.")
+        self._store = store
+        self._saver = saver
+        self.filename = filename
+        self.delay = delay
+        self._condition = threading.Condition()
+        self._changes = 0  # number of changes seen so far
+        self._saved = 0  # value of _changes covered by the last write
+        self._last_change = 0.0
+        self._flush_requested = False
+        self._closed = False
+        self._error: Optional[Exception] = None
+        store.subscribe(self)
+        self._thread = threading.Thread(target=self._run, name="autosave", daemon=True)
+        self._thread.start()
+
+    def _changed(self) -> None:
+        with self._condition:
+            self._changes += 1
+            self._last_change = time.monotonic()
+            self._condition.notify_all()
+
+    def task_added(self, store: TaskStore, slot: int) -> None:
+        self._changed()
+
+    def task_updated(self, store: TaskStore, slot: int, old: Task) -> None:
+        self._changed()
+
+    def task_deleting(self, store: TaskStore, slot: int) -> None:
+        self._changed()
+
+    def tasks_reset(self, store: TaskStore) -> None:
+        self._changed()
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while True:
+                    if self._changes == self._saved:
+                        if self._closed:
+                            return
+                        self._condition.wait()
+                        continue
+                    remaining = self._last_change + self.delay - time.monotonic()
+                    if remaining <= 0 or self._flush_requested or self._closed:
+                        break
+                    self._condition.wait(remaining)
+                self._flush_requested = False
+                target = self._changes
+            try:
+                if getattr(self._saver, "incremental", False):
+                    # Taking the changes needs the bound store itself; holding its lock keeps it still.
+                    with self._store._lock:
+                        taken = self._saver.take_changes(self._store, self.filename)
+                        if not taken:
+                            self._saver.save(self._store, self.filename)
+                    if taken:
+                        self._saver.write_changes(self.filename)
+                else:
+                    self._saver.save(self._store.copy(), self.filename)
+                error = None
+            except Exception as e:
+                error = e
+            with self._condition:
+                self._error = error
+                self._saved = target
+                self._condition.notify_all()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Saves pending changes now and waits for the write to finish.
+
+        :param timeout: The maximum number of seconds to wait; by default no limit.
+        :return: True if every change made before the call has been written.
+        """
+        with self._condition:
+            target = self._changes
+            self._flush_requested = True
+            self._condition.notify_all()
+            done = self._condition.wait_for(lambda: self._saved >= target, timeout)
+            if self._error is not None:
+                error, self._error = self._error, None
+                raise Exception(f"Error autosaving: {error}")
+            return done
+
+    def close(self) -> None:
+        """
+        Writes pending changes, then stops the background thread and the tracking of the store.
+        """
+        self._store.unsubscribe(self)
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        self._thread.join()
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise Exception(f"Error autosaving: {error}")
@@ -0,0 +1 @@
+#This package contains benchmarks for the to-do list manager.  Run them from the repository root, e.g. python -m benchmarks.memory
@@ -0,0 +1,141 @@
+#This module stress-tests ConcurrentTodoListManager with concurrent reader and writer threads and processes.
+#
+#Usage (from the repository root):
+#    python -m benchmarks.concurrency --readers 1 2 4 8 --writers 0 1 2 4 --seconds 2
+#    python -m benchmarks.concurrency --processes 4 --saves 20
+
+import argparse
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from typing import Dict, List
+from concurrency import ConcurrentTodoListManager
+from todo_list_manager import CSVSaver
+from benchmarks.data import WORDS, generate_tasks
+
+# With CPython's global interpreter lock the threads share one core: the benchmark shows how the lock
+# divides it between readers and writers and that readers do not serialize each other, not a speedup.
+
+
+def _reader(manager: ConcurrentTodoListManager, stop: threading.Event, counts: List[int], slot: int, seed: int) -> None:
+    rng = random.Random(seed)
+    size = len(manager.tasks)
+    ids = manager.tasks.ids()
+    done = 0
+    while not stop.is_set():
+        operation = done % 4
+        if operation == 0:
+            manager.search(rng.choice(WORDS), limit=10)
+        elif operation == 1:
+            manager.next_tasks(10)
+        elif operation == 2:
+            start = rng.randrange(max(size - 20, 1))
+            manager.list_tasks(start, 20)
+        else:
+            manager.get_task(rng.choice(ids))
+        done += 1
+    counts[slot] = done
+
+
+def _writer(manager: ConcurrentTodoListManager, stop: threading.Event, counts: List[int], slot: int, seed: int) -> None:
+    rng = random.Random(seed)
+    done = 0
+    while not stop.is_set():
+        task_id = manager.add_task(" ".join(rng.choice(WORDS) for _ in range(3)), rng.choice([None, 1, 2, 3]))
+        manager.mark_done_many([task_id])
+        done += 1
+    counts[slot] = done
+
+
+def run_threads(size: int, readers: int, writers: int, seconds: float, seed: int = 0) -> Dict[str, float]:
+    """
+    Runs reader and writer threads on one manager for a number of seconds.
+
+    :return: Reads and writes per second.
+    """
+    manager = ConcurrentTodoListManager()
+    manager.add_tasks(generate_tasks(size, seed))
+    manager.search("warm", limit=1)  # builds the lazy structures, so every run measures steady state
+    manager.next_tasks(1)
+    manager.list_tasks(0, 1)
+    counts = [0] * (readers + writers)
+    stop = threading.Event()
+    threads = [threading.Thread(target=_reader, args=(manager, stop, counts, slot, seed + slot))
+               for slot in range(readers)]
+    threads += [threading.Thread(target=_writer, args=(manager, stop, counts, readers + slot, seed + readers + slot))
+                for slot in range(writers)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    return {"reads_per_second": sum(counts[:readers]) / elapsed, "writes_per_second": sum(counts[readers:]) / elapsed}
+
+
+def _saving_process(filename: str, saves: int, worker: int) -> None:
+    manager = ConcurrentTodoListManager(CSVSaver())
+    manager.load_from_file(filename)
+    for number in range(saves):
+        manager.add_task(f"Process {worker} task {number}")
+        manager.save_to_file(filename)
+
+
+def run_processes(size: int, processes: int, saves: int, seed: int = 0) -> Dict[str, float]:
+    """
+    Starts processes that each load the same file, then repeatedly add a task and save it.
+
+    :return: Saves per second and whether the file ended up with every task of every process.
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        filename = os.path.join(directory, "tasks.csv")
+        manager = ConcurrentTodoListManager(CSVSaver())
+        manager.add_tasks(generate_tasks(size, seed))
+        manager.save_to_file(filename)
+        workers = [multiprocessing.Process(target=_saving_process, args=(filename, saves, worker))
+                   for worker in range(processes)]
+        start = time.perf_counter()
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        elapsed = time.perf_counter() - start
+        manager.load_from_file(filename)
+        return {"saves_per_second": processes * saves / elapsed,
+                "complete": float(len(manager.tasks) == size + processes * saves)}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Stress-test the concurrent to-do list manager.")
+    parser.add_argument("--size", type=int, default=100_000, help="tasks in the list")
+    parser.add_argument("--readers", nargs="+", type=int, default=[1, 2, 4, 8])
+    parser.add_argument("--writers", nargs="+", type=int, default=[0, 1, 2, 4])
+    parser.add_argument("--seconds", type=float, default=2.0, help="duration of each thread run")
+    parser.add_argument("--processes", type=int, default=0, help="also run this many saving processes")
+    parser.add_argument("--saves", type=int, default=20, help="saves per process")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'readers':>8} {'writers':>8} {'reads/s':>12} {'writes/s':>12}")
+    for writers in args.writers:
+        for readers in args.readers:
+            result = run_threads(args.size, readers, writers, args.seconds, args.seed)
+            print(f"{readers:8} {writers:8} {result['reads_per_second']:12,.0f} {result['writes_per_second']:12,.0f}",
+                  flush=True)
+    if args.processes:
+        result = run_processes(args.size, args.processes, args.saves, args.seed)
+        print(f"{args.processes} processes: {result['saves_per_second']:,.1f} saves/s, "
+              f"{'no task lost' if result['complete'] else 'TASKS LOST'}")
+        if not result["complete"]:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,34 @@
+#This module generates seeded synthetic tasks for the benchmarks.
+
+import datetime
+import random
+from typing import Iterator, List, Tuple
+from task import Task
+
+WORDS = ["buy", "call", "write", "review", "pay", "fix", "plan", "report", "bills", "groceries", "John", "team", "milk, eggs"]
+SIZES = {"10k": 10_000, "100k": 100_000, "1m": 1_000_000}
+
+
+def generate_rows(count: int, seed: int = 0, unique: bool = False) -> Iterator[Tuple[str, bool, int, datetime.date]]:
+    """
+    Yields synthetic task fields, building a fresh description string for every row as a file loader would.
+    The same seed always gives the same rows.
+
+    Descriptions are three words out of WORDS, so only about 2,200 distinct texts recur, as in a list of
+    routine chores; with unique=True each description ends with its row number, so none repeats.
+    """
+    rng = random.Random(seed)
+    start = datetime.date(2025, 1, 1).toordinal()
+    for number in range(count):
+        description = " ".join(rng.choice(WORDS) for _ in range(3))
+        if unique:
+            description += f" #{number}"
+        deadline = datetime.date.fromordinal(start + rng.randrange(365)) if rng.random() < 0.8 else None
+        yield description, rng.random() < 0.3, rng.choice([None, 1, 2, 3]), deadline
+
+
+def generate_tasks(count: int, seed: int = 0, unique: bool = False) -> List[Task]:
+    """
+    Returns count synthetic tasks.  See generate_rows.
+    """
+    return [Task(*row) for row in generate_rows(count, seed, unique)]
@@ -0,0 +1,131 @@
+#This module generates load against a TaskServer and reports requests per second and latency percentiles.
+#
+#Usage (from the repository root):
+#    python -m benchmarks.load_client --clients 64 --requests 200 --write-ratio 0.5
+#    python -m benchmarks.load_client --socket /tmp/todo.sock --clients 64 --duration 10
+#
+#Without --socket or --port an in-process server is started on a temporary file holding --size tasks.
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+from typing import Dict, List, Optional
+from task_server import SAVERS, TaskClient, TaskServer
+from todo_list_manager import TodoListManager
+from benchmarks.data import WORDS, generate_tasks
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """
+    Returns the nearest-rank percentile of sorted values, e.g. fraction 0.99 for p99.
+    """
+    if not sorted_values:
+        return 0.0
+    rank = max(int(fraction * len(sorted_values) + 0.999999) - 1, 0)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+
+async def _client(client: TaskClient, rng: random.Random, write_ratio: float, requests: Optional[int],
+                  deadline: float, latencies: List[float], errors: List[str]) -> None:
+    # A closed loop: each simulated client waits for an answer before sending its next request.
+    own_ids: List[int] = []
+    sent = 0
+    while (requests is None or sent < requests) and time.perf_counter() < deadline:
+        if rng.random() < write_ratio:
+            if own_ids and rng.random() < 0.5:
+                op, args = "done", {"id": own_ids.pop(rng.randrange(len(own_ids)))}
+            else:
+                op, args = "add", {"description": " ".join(rng.choice(WORDS) for _ in range(3)),
+                                   "priority": rng.choice([None, 1, 2, 3])}
+        else:
+            op, args = rng.choice([("search", {"query": rng.choice(WORDS), "limit": 10}),
+                                   ("next", {"k": 10}), ("count", {})])
+        start = time.perf_counter()
+        try:
+            result = await client.request(op, **args)
+        except Exception as e:
+            errors.append(str(e))
+        else:
+            if op == "add":
+                own_ids.append(result)
+        latencies.append(time.perf_counter() - start)
+        sent += 1
+
+
+async def run_load(clients: int, requests: Optional[int], duration: float, write_ratio: float, seed: int = 0,
+                   host: str = "127.0.0.1", port: int = 0, path: Optional[str] = None) -> Dict[str, float]:
+    """
+    Runs simulated clients against a server, each sending requests or running for duration seconds.
+
+    :return: Requests per second, latency percentiles in seconds and the number of errors.
+    """
+    connections = [await TaskClient.connect(host, port, path) for _ in range(clients)]
+    before = await connections[0].request("stats")
+    latencies: List[float] = []
+    errors: List[str] = []
+    start = time.perf_counter()
+    await asyncio.gather(*(_client(client, random.Random(seed + number), write_ratio, requests,
+                                   start + duration, latencies, errors)
+                           for number, client in enumerate(connections)))
+    elapsed = time.perf_counter() - start
+    after = await connections[0].request("stats")
+    for client in connections:
+        await client.close()
+    latencies.sort()
+    batches = after["batches"] - before["batches"]
+    return {"requests": len(latencies), "requests_per_second": len(latencies) / elapsed,
+            "p50": percentile(latencies, 0.5), "p99": percentile(latencies, 0.99), "max": latencies[-1] if latencies else 0.0,
+            "errors": len(errors), "saves": after["saves"] - before["saves"],
+            "mutations_per_batch": (after["mutations"] - before["mutations"]) / batches if batches else 0.0}
+
+
+async def run_self_hosted(size: int, saver: str, clients: int, requests: Optional[int], duration: float,
+                          write_ratio: float, seed: int = 0) -> Dict[str, float]:
+    """
+    Starts a server on a temporary file holding size tasks and runs the load against it.
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        filename = os.path.join(directory, "tasks.csv")
+        manager = TodoListManager(SAVERS[saver]())
+        manager.add_tasks(generate_tasks(size, seed))
+        manager.save_to_file(filename)
+        server = TaskServer(manager, filename)
+        await server.start()
+        try:
+            return await run_load(clients, requests, duration, write_ratio, seed, *server.address[:2])
+        finally:
+            await server.close()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Generate load against a task server.")
+    parser.add_argument("--socket", help="connect to a server on this Unix socket")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, help="connect to a server on this TCP port")
+    parser.add_argument("--clients", type=int, default=32, help="concurrent connections")
+    parser.add_argument("--requests", type=int, help="requests per client; by default run for --duration")
+    parser.add_argument("--duration", type=float, default=5.0, help="seconds to run")
+    parser.add_argument("--write-ratio", type=float, default=0.5, help="fraction of requests that change the list")
+    parser.add_argument("--size", type=int, default=10_000, help="tasks in the self-hosted server's list")
+    parser.add_argument("--saver", choices=list(SAVERS), default="csv", help="saver of the self-hosted server")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    duration = float("inf") if args.requests else args.duration
+    if args.socket or args.port:
+        result = asyncio.run(run_load(args.clients, args.requests, duration, args.write_ratio, args.seed,
+                                      args.host, args.port or 0, args.socket))
+    else:
+        result = asyncio.run(run_self_hosted(args.size, args.saver, args.clients, args.requests, duration,
+                                             args.write_ratio, args.seed))
+    print(f"{result['requests']:,} requests, {result['requests_per_second']:,.0f} requests/s, "
+          f"p50 {result['p50'] * 1000:.2f} ms, p99 {result['p99'] * 1000:.2f} ms, max {result['max'] * 1000:.2f} ms")
+    print(f"{result['saves']:,} saves, {result['mutations_per_batch']:.1f} mutations per batch, {result['errors']} errors")
+    return 1 if result["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
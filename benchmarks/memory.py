@@ -0,0 +1,54 @@
+#This module compares the memory used by a list of Task objects with the memory used by a TaskStore.
+
+import argparse
+import tracemalloc
+from typing import Callable
+from task import Task
+from task_store import TaskStore
+from benchmarks.data import generate_rows
+
+
+class DictTask:
+    """
+    The previous Task layout: a plain object with an instance __dict__.
+    """
+    def __init__(self, description, is_done, priority, deadline):
+        self.description = description
+        self.is_done = is_done
+        self.priority = priority
+        self.deadline = deadline
+
+
+def measure(build: Callable[[], object]) -> int:
+    """
+    Returns the number of bytes still allocated by the object that build() returns.
+    """
+    tracemalloc.start()
+    result = build()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return current
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare task representations by memory use.")
+    parser.add_argument("--count", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    # TaskStore interns descriptions, so repeated texts are stored once; with unique descriptions only the
+    # compact columns save memory.  Both cases are reported so the saving is not mistaken for de-duplication.
+    for label, unique in (("repeated descriptions", False), ("unique descriptions", True)):
+        rows = lambda: generate_rows(args.count, unique=unique)
+        results = {
+            "list of dict-based objects": measure(lambda: [DictTask(*row) for row in rows()]),
+            "list of Task": measure(lambda: [Task(*row) for row in rows()]),
+            "TaskStore": measure(lambda: TaskStore(Task(*row) for row in rows())),
+        }
+        baseline = results["list of dict-based objects"]
+        print(f"{args.count:,} tasks, {label}:")
+        for name, size in results.items():
+            print(f"  {name:28} {size / 2 ** 20:9.1f} MiB  {size / args.count:7.1f} B/task  {baseline / size:5.1f}x")
+
+if __name__ == "__main__":
+    main()
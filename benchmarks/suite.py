@@ -0,0 +1,236 @@
+#This module runs the benchmark suite for TodoListManager, Task and the TaskSaver strategies.
+#
+#Usage (from the repository root):
+#    python -m benchmarks.suite --sizes 10k 100k --save-baseline benchmarks/baseline.json
+#    python -m benchmarks.suite --sizes 10k 100k --baseline benchmarks/baseline.json --threshold 0.25
+
+import argparse
+import gc
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Tuple
+from task import Task
+from todo_list_manager import TodoListManager, CSVSaver, TextTaskSaver
+from binary_saver import BinaryTaskSaver
+from journal_saver import JournalTaskSaver
+from sqlite_saver import SQLiteTaskSaver
+from benchmarks.data import SIZES, generate_tasks
+
+MUTATIONS = 1000  # calls of mark_task_as_done and delete_task per run
+
+# A benchmark prepares its state untimed and returns the timed callable and the number of items it processes.
+Benchmark = Callable[[List[Task], str], Tuple[Callable[[], object], int]]
+
+
+def loaded_manager(tasks: List[Task], saver=None) -> TodoListManager:
+    manager = TodoListManager(saver or CSVSaver())
+    manager.add_tasks(tasks)
+    return manager
+
+
+def bench_add_task(tasks: List[Task], workdir: str):
+    manager = TodoListManager()
+    def run():
+        for task in tasks:
+            manager.add_task(task.description, task.priority, task.deadline)
+    return run, len(tasks)
+
+
+def bench_add_tasks(tasks: List[Task], workdir: str):
+    manager = TodoListManager()
+    return lambda: manager.add_tasks(tasks), len(tasks)
+
+
+def bench_task_str(tasks: List[Task], workdir: str):
+    return lambda: [str(task) for task in tasks], len(tasks)
+
+
+def bench_list_tasks(tasks: List[Task], workdir: str):
+    manager = loaded_manager(tasks)
+    return manager.list_tasks, len(tasks)
+
+
+def bench_mark_task_as_done(tasks: List[Task], workdir: str):
+    manager = loaded_manager(tasks)
+    rng = random.Random(1)
+    indices = [rng.randint(1, len(tasks)) for _ in range(MUTATIONS)]
+    def run():
+        for index in indices:
+            manager.mark_task_as_done(index)
+    return run, len(indices)
+
+
+def bench_delete_task(tasks: List[Task], workdir: str):
+    manager = loaded_manager(tasks)
+    rng = random.Random(2)
+    count = min(MUTATIONS, len(tasks))
+    indices = [rng.randint(1, len(tasks) - done) for done in range(count)]
+    def run():
+        for index in indices:
+            manager.delete_task(index)
+    return run, len(indices)
+
+
+def saver_benchmark(saver_class, suffix: str) -> Benchmark:
+    def bench(tasks: List[Task], workdir: str):
+        manager = loaded_manager(tasks, saver_class())
+        filename = os.path.join(workdir, "save" + suffix)
+        return lambda: manager.save_to_file(filename), len(tasks)
+    return bench
+
+
+def changes_benchmark(saver_class, suffix: str) -> Benchmark:
+    """
+    Times saving MUTATIONS changes after a full save, which incremental savers write without rewriting the file.
+    """
+    def bench(tasks: List[Task], workdir: str):
+        manager = loaded_manager(tasks, saver_class())
+        filename = os.path.join(workdir, "save" + suffix)
+        manager.save_to_file(filename)
+        rng = random.Random(3)
+        count = min(MUTATIONS, len(tasks))
+        for done in range(count):
+            if done % 2:
+                manager.mark_task_as_done(rng.randint(1, len(manager.tasks)))
+            else:
+                manager.add_task(f"Change {done}", 2)
+        return lambda: manager.save_to_file(filename), count
+    return bench
+
+
+def loader_benchmark(saver_class, suffix: str) -> Benchmark:
+    def bench(tasks: List[Task], workdir: str):
+        filename = os.path.join(workdir, "load" + suffix)
+        saver_class().save(tasks, filename)
+        manager = TodoListManager(saver_class())
+        return lambda: manager.load_from_file(filename), len(tasks)
+    return bench
+
+
+BENCHMARKS: Dict[str, Benchmark] = {
+    "add_task": bench_add_task,
+    "add_tasks": bench_add_tasks,
+    "Task.__str__": bench_task_str,
+    "list_tasks": bench_list_tasks,
+    "mark_task_as_done": bench_mark_task_as_done,
+    "delete_task": bench_delete_task,
+    "save[csv]": saver_benchmark(CSVSaver, ".csv"),
+    "save[text]": saver_benchmark(TextTaskSaver, ".txt"),
+    "save[binary]": saver_benchmark(BinaryTaskSaver, ".bin"),
+    "save[journal]": saver_benchmark(JournalTaskSaver, ".csv"),
+    "save[sqlite]": saver_benchmark(SQLiteTaskSaver, ".db"),
+    "save_changes[journal]": changes_benchmark(JournalTaskSaver, ".csv"),
+    "save_changes[sqlite]": changes_benchmark(SQLiteTaskSaver, ".db"),
+    "load[csv]": loader_benchmark(CSVSaver, ".csv"),
+    "load[text]": loader_benchmark(TextTaskSaver, ".csv"),  # header-less rows; a .txt name would be read as .csv
+    "load[binary]": loader_benchmark(BinaryTaskSaver, ".bin"),
+    "load[journal]": loader_benchmark(JournalTaskSaver, ".csv"),
+    "load[sqlite]": loader_benchmark(SQLiteTaskSaver, ".db"),
+}
+
+
+def measure(benchmark: Benchmark, tasks: List[Task], repeat: int, memory: bool) -> Dict[str, float]:
+    """
+    Runs one benchmark and returns its best wall time, throughput and (optionally) peak traced memory.
+    """
+    best = float("inf")
+    peak = 0
+    for attempt in range(repeat + (1 if memory else 0)):
+        workdir = tempfile.mkdtemp(prefix="todo-bench-")
+        try:
+            run, items = benchmark(tasks, workdir)
+            gc.collect()
+            tracing = memory and attempt == repeat  # the traced run is extra, because tracing slows it down
+            if tracing:
+                tracemalloc.start()
+            start = time.perf_counter()
+            run()
+            elapsed = time.perf_counter() - start
+            if tracing:
+                peak = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+            else:
+                best = min(best, elapsed)
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
+    result = {"seconds": best, "throughput": items / best if best else float("inf")}
+    if memory:
+        result["peak_bytes"] = peak
+    return result
+
+
+def run_suite(sizes: List[str], names: List[str], repeat: int = 3, memory: bool = True, seed: int = 0) -> Dict[str, Dict[str, float]]:
+    """
+    Runs the selected benchmarks at the selected sizes.
+
+    :return: The results keyed by "operation@size".
+    """
+    results = {}
+    for size in sizes:
+        tasks = generate_tasks(SIZES[size], seed)
+        for name in names:
+            key = f"{name}@{size}"
+            results[key] = measure(BENCHMARKS[name], tasks, repeat, memory)
+            print(format_result(key, results[key]), flush=True)
+    return results
+
+
+def format_result(key: str, result: Dict[str, float]) -> str:
+    line = f"{key:28} {result['seconds'] * 1000:10.2f} ms {result['throughput']:14,.0f} items/s"
+    if "peak_bytes" in result:
+        line += f" {result['peak_bytes'] / 2 ** 20:9.1f} MiB peak"
+    return line
+
+
+def find_regressions(results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]],
+                     threshold: float) -> List[str]:
+    """
+    Compares results with a baseline.
+
+    :param threshold: The allowed relative increase, e.g. 0.2 for 20%.
+    :return: A description of every metric that grew by more than the threshold.
+    """
+    regressions = []
+    for key, result in results.items():
+        for metric in ("seconds", "peak_bytes"):
+            if key in baseline and metric in result and metric in baseline[key]:
+                old, new = baseline[key][metric], result[metric]
+                if old and new > old * (1 + threshold):
+                    regressions.append(f"{key} {metric}: {old:.6g} -> {new:.6g} (+{(new / old - 1) * 100:.0f}%)")
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the to-do list manager.")
+    parser.add_argument("--sizes", nargs="+", choices=list(SIZES), default=list(SIZES))
+    parser.add_argument("--only", nargs="+", choices=list(BENCHMARKS), default=list(BENCHMARKS))
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per benchmark; the best is kept")
+    parser.add_argument("--no-memory", action="store_true", help="skip the extra run that traces peak memory")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--baseline", help="JSON file to compare against")
+    parser.add_argument("--save-baseline", help="JSON file to write the results to")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed relative regression (default 0.2)")
+    args = parser.parse_args()
+
+    results = run_suite(args.sizes, args.only, args.repeat, not args.no_memory, args.seed)
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = find_regressions(results, json.load(f), args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
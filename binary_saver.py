@@ -0,0 +1,134 @@
+#This module defines the BinaryTaskSaver class and the MappedTaskFile class for a fixed-record binary task format.
+
+import datetime
+import mmap
+import os
+import struct
+from collections.abc import Sequence
+from typing import Dict, List, Tuple, Union
+from task import Task
+from task_store import DONE_FLAG, PRIORITY_MASK, TaskStore
+from todo_list_manager import TaskSaver, atomic_write
+
+MAGIC = b"TODOBIN\0"
+VERSION = 1
+# File layout: header, then one fixed-width record per task, then the description heap.
+HEADER = struct.Struct("<8sIQ")  # magic, version, number of tasks
+RECORD = struct.Struct("<QIiB3x")  # description offset in the heap, description length, deadline ordinal, flags
+
+
+class BinaryTaskSaver(TaskSaver):
+    """
+    Saves tasks to a binary file with fixed-width records, so any task can be located without parsing the others.
+
+    Descriptions are stored once each in a heap after the records.  Flags use the TaskStore encoding
+    (priority in the low bits, DONE_FLAG for completion) and deadlines are date ordinals (0 means none).
+    """
+    def save(self, tasks: List[Task], filename: str) -> None:
+        """Saves tasks to a binary file.  The file is replaced atomically, so readers that mapped it keep a consistent view."""
+        if not isinstance(filename, str):
+            raise TypeError("Filename must be a string.")
+        try:
+            records = bytearray(RECORD.size * len(tasks))
+            heap = bytearray()
+            heap_offsets: Dict[str, Tuple[int, int]] = {}
+            for position, task in enumerate(tasks):
+                description = heap_offsets.get(task.description)
+                if description is None:
+                    encoded = task.description.encode("utf-8")
+                    description = heap_offsets[task.description] = (len(heap), len(encoded))
+                    heap += encoded
+                flags = (task.priority or 0) | (DONE_FLAG if task.is_done else 0)
+                deadline = task.deadline.toordinal() if task.deadline else 0
+                RECORD.pack_into(records, position * RECORD.size, description[0], description[1], deadline, flags)
+            with atomic_write(filename, mode="wb") as f:
+                f.write(HEADER.pack(MAGIC, VERSION, len(tasks)))
+                f.write(records)
+                f.write(heap)
+        except Exception as e:
+            raise Exception(f"Error saving to binary file: {e}")
+
+    def open(self, filename: str) -> "MappedTaskFile":
+        """
+        Opens a saved file for random access without reading it.
+
+        :param filename: The name of the file to open.
+        """
+        return MappedTaskFile(filename)
+
+    def load(self, filename: str) -> TaskStore:
+        """
+        Loads every task of a saved file into a TaskStore.
+
+        :param filename: The name of the file to load from.
+        """
+        with MappedTaskFile(filename) as mapped:
+            return TaskStore(mapped)
+
+
+class MappedTaskFile(Sequence):
+    """
+    A read-only sequence of the tasks in a file written by BinaryTaskSaver.
+
+    The file is memory-mapped, so opening it takes constant time and tasks[i] decodes only the i-th record.
+    Several processes can map the same file; pickling a MappedTaskFile sends only its filename.
+    """
+    def __init__(self, filename: str):
+        """
+        Maps the file and checks its header.
+
+        :param filename: The name of the file to open.
+        """
+        if not isinstance(filename, str):
+            raise TypeError("Filename must be a string.")
+        self.filename = filename
+        with open(filename, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if size < HEADER.size:
+                raise ValueError("Not a binary task file.")
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self._count = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError("Not a binary task file.")
+        if version != VERSION:
+            self.close()
+            raise ValueError(f"Unsupported binary task file version: {version}")
+        self._heap = HEADER.size + self._count * RECORD.size
+        if self._heap > size:
+            self.close()
+            raise ValueError("Binary task file is truncated.")
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Task, List[Task]]:
+        if isinstance(index, slice):
+            return [self[position] for position in range(*index.indices(self._count))]
+        if not isinstance(index, int):
+            raise TypeError("Index must be an integer.")
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("Task index out of range.")
+        offset, length, deadline, flags = RECORD.unpack_from(self._map, HEADER.size + index * RECORD.size)
+        start = self._heap + offset
+        return Task(str(self._map[start:start + length], "utf-8"),
+                    bool(flags & DONE_FLAG),
+                    flags & PRIORITY_MASK or None,
+                    datetime.date.fromordinal(deadline) if deadline else None)
+
+    def close(self) -> None:
+        """
+        Unmaps the file.
+        """
+        self._map.close()
+
+    def __enter__(self) -> "MappedTaskFile":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __reduce__(self):
+        return MappedTaskFile, (self.filename,)
@@ -0,0 +1,292 @@
+#This module defines the ConcurrentTodoListManager class and the locks it uses for concurrent threads and processes.
+
+import contextlib
+import datetime
+import functools
+import os
+import threading
+from collections import defaultdict, deque
+from typing import Callable, Deque, Dict, Iterator, List, Optional, Sequence, Tuple
+from task import Task
+from task_index import ANY
+from task_loader import DEFAULT_CHUNK_SIZE, iter_tasks
+from task_store import TaskStore
+from scheduler import urgency_key
+from todo_list_manager import TaskSaver, TodoListManager
+
+try:
+    import fcntl
+except ImportError:  # not available on Windows
+    fcntl = None
+
+LOCK_SUFFIX = ".lock"  # processes lock filename + LOCK_SUFFIX, which is never replaced
+
+
+class RWLock:
+    """
+    A reader-writer lock: any number of threads may read at once, a writer runs alone.
+
+    Waiting writers go first, so a steady stream of readers cannot starve them.  The lock is reentrant:
+    a thread holding it may take it again, and a writer may also read.
+    """
+    def __init__(self):
+        self._condition = threading.Condition(threading.Lock())
+        self._readers: Dict[int, int] = {}  # thread id -> read depth
+        self._writer: Optional[int] = None
+        self._write_depth = 0
+        self._waiting_writers = 0
+
+    @contextlib.contextmanager
+    def read(self) -> Iterator[None]:
+        """
+        Holds the lock for reading during the with block.
+        """
+        me = threading.get_ident()
+        with self._condition:
+            if self._writer != me and me not in self._readers:
+                while self._writer is not None or self._waiting_writers:
+                    self._condition.wait()
+            self._readers[me] = self._readers.get(me, 0) + 1
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._readers[me] -= 1
+                if not self._readers[me]:
+                    del self._readers[me]
+                    self._condition.notify_all()
+
+    @contextlib.contextmanager
+    def write(self) -> Iterator[None]:
+        """
+        Holds the lock for writing during the with block.
+        """
+        me = threading.get_ident()
+        with self._condition:
+            if self._writer != me:
+                if me in self._readers:
+                    raise RuntimeError("A reading thread cannot start writing; take the write lock first.")
+                self._waiting_writers += 1
+                try:
+                    while self._writer is not None or self._readers:
+                        self._condition.wait()
+                finally:
+                    self._waiting_writers -= 1
+                self._writer = me
+            self._write_depth += 1
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._write_depth -= 1
+                if not self._write_depth:
+                    self._writer = None
+                    self._condition.notify_all()
+
+
+@contextlib.contextmanager
+def file_lock(filename: str, exclusive: bool = True) -> Iterator[None]:
+    """
+    Holds an advisory lock on a task file, shared with other processes, during the with block.
+
+    The lock is taken on filename + LOCK_SUFFIX, because savers replace the task file itself.
+
+    :param filename: The name of the task file.
+    :param exclusive: True for writing, False to share the lock with other readers.
+    """
+    if fcntl is None:
+        raise OSError("File locking is not supported on this platform.")
+    with open(filename + LOCK_SUFFIX, "a") as f:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        try:
+            yield
+        finally:
+            fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+def _row(task: Task) -> tuple:
+    return task.description, task.is_done, task.priority, task.deadline
+
+
+def merge_tasks(base: TaskStore, ours: TaskStore, theirs: Sequence[Task]) -> List[Tuple[Task, Optional[int]]]:
+    """
+    Merges our changes since base into a file that another process saved since then.
+
+    Our changes are found by id: tasks added, updated or deleted since base.  Their tasks have no ids, so
+    each base task is matched with the first equal task in theirs that is still unmatched.  Their file is
+    kept as it is, except that tasks we deleted are dropped and tasks we updated are replaced.  A task we
+    updated that they changed or deleted too is kept in our version after their tasks, followed by the
+    tasks we added.  Nothing is lost, but a task changed on both sides may appear twice.
+
+    :param base: Our tasks as last loaded from or saved to the file.
+    :param ours: Our current tasks.
+    :param theirs: The tasks now in the file.
+    :return: The merged tasks, each with our id or None for tasks only they have.
+    """
+    our_tasks = {task_id: task for task_id, task in zip(ours.ids(), ours.detach())}
+    positions: Dict[tuple, Deque[int]] = defaultdict(deque)
+    for position, task in enumerate(theirs):
+        positions[_row(task)].append(position)
+    merged: List[Tuple[Task, Optional[int]]] = [(task, None) for task in theirs]
+    dropped = set()
+    moved: List[Tuple[Task, int]] = []
+    for task_id, task in zip(base.ids(), base.detach()):
+        candidates = positions.get(_row(task))
+        position = candidates.popleft() if candidates else None
+        our_task = our_tasks.get(task_id)
+        if position is None:
+            if our_task is not None and _row(our_task) != _row(task):
+                moved.append((our_task, task_id))
+        elif our_task is None:
+            dropped.add(position)
+        else:
+            merged[position] = (our_task, task_id)
+    known = set(base.ids())
+    added = [(task, task_id) for task_id, task in our_tasks.items() if task_id not in known]
+    return [entry for position, entry in enumerate(merged) if position not in dropped] + moved + added
+
+
+def _writes(method: Callable) -> Callable:
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._rwlock.write():
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
+def _detached(tasks) -> List[Task]:
+    return [Task(task.description, task.is_done, task.priority, task.deadline) for task in tasks]
+
+
+class ConcurrentTodoListManager(TodoListManager):
+    """
+    A TodoListManager that can be shared by threads and whose files can be shared by processes.
+
+    Reads hold a reader-writer lock for reading and run concurrently; changes hold it for writing and
+    run one at a time.  Queries return standalone Task copies, because views would refer to positions
+    that other threads may shift.  Positions are only meaningful while no other thread changes the list,
+    so threads should prefer the id-based methods (add_task's ids, get_task, mark_done_many, delete_many).
+    Using the tasks property directly bypasses the lock.
+
+    save_to_file and load_from_file lock the file against other processes.  If another process saved the
+    file since this manager last loaded or saved it, save_to_file first merges this manager's changes
+    into the file's contents with merge_tasks, and the merged list becomes the current list.  A background
+    compaction the save starts finishes before the file lock is released.
+    """
+    def __init__(self, task_saver: TaskSaver = None):
+        """
+        Initializes the manager.
+        """
+        self._rwlock = RWLock()
+        self._base: Optional[TaskStore] = None  # the tasks as last loaded from or saved to _base_file
+        self._base_file: Optional[str] = None
+        self._base_stamp: Optional[tuple] = None  # the saver's version of _base_file at that time
+        super().__init__(task_saver)
+
+    add_task = _writes(TodoListManager.add_task)
+    add_tasks = _writes(TodoListManager.add_tasks)
+    mark_task_as_done = _writes(TodoListManager.mark_task_as_done)
+    mark_done_many = _writes(TodoListManager.mark_done_many)
+    delete_task = _writes(TodoListManager.delete_task)
+    delete_many = _writes(TodoListManager.delete_many)
+    undo = _writes(TodoListManager.undo)
+    redo = _writes(TodoListManager.redo)
+    load_many = _writes(TodoListManager.load_many)
+
+    def _query(self, built: bool, query: Callable[[], object]):
+        # The first query builds an index or cache, which changes the manager, so it takes the write lock.
+        with (self._rwlock.read() if built else self._rwlock.write()):
+            return query()
+
+    def get_task(self, task_id: int) -> Task:
+        """
+        Returns a copy of the task with the given id.
+        """
+        with self._rwlock.read():
+            return _detached([TodoListManager.get_task(self, task_id)])[0]
+
+    def list_tasks(self, offset: int = 0, limit: Optional[int] = None) -> str:
+        return self._query(self._renderer is not None, lambda: TodoListManager.list_tasks(self, offset, limit))
+
+    def iter_task_lines(self, offset: int = 0, limit: Optional[int] = None) -> Iterator[str]:
+        return iter(self._query(self._renderer is not None,
+                                lambda: list(TodoListManager.iter_task_lines(self, offset, limit))))
+
+    def find(self, priority=ANY, due_before: Optional[datetime.date] = None, due_after: Optional[datetime.date] = None,
+             done: Optional[bool] = None) -> Iterator[Task]:
+        return iter(self._query(self._index is not None,
+                                lambda: _detached(TodoListManager.find(self, priority, due_before, due_after, done))))
+
+    def search(self, query: str, limit: Optional[int] = None, prefix: bool = False) -> List[Task]:
+        return self._query(self._search is not None,
+                           lambda: _detached(TodoListManager.search(self, query, limit, prefix)))
+
+    def search_lines(self, query: str, limit: Optional[int] = None, prefix: bool = True) -> List[str]:
+        return self._query(self._search is not None and self._renderer is not None,
+                           lambda: TodoListManager.search_lines(self, query, limit, prefix))
+
+    def next_tasks(self, k: int = 1, key: Callable[[Task], object] = urgency_key) -> List[Task]:
+        return self._query(self._scheduler is not None and self._scheduler.key is key,
+                           lambda: _detached(TodoListManager.next_tasks(self, k, key)))
+
+    def _stamp(self, filename: str) -> Optional[tuple]:
+        # The saver's version also covers the files it appends to instead, such as a journal or a write-ahead log.
+        return self.task_saver.version(filename) if os.path.exists(filename) else None
+
+    def _remember(self, filename: str) -> None:
+        self._base = self.tasks.copy()
+        self._base_file = filename
+        self._base_stamp = self._stamp(filename)
+
+    def save_to_file(self, filename: str, search_index: bool = False) -> None:
+        """
+        Saves the to-do list while holding the file lock, first merging changes other processes saved.
+
+        :param filename: The name of the file to save to.
+        :param search_index: Whether to also save the search index next to the file.
+        """
+        with self._rwlock.write(), file_lock(filename):
+            stamp = self._stamp(filename)
+            if filename == self._base_file and stamp is not None and stamp != self._base_stamp:
+                theirs = self._read(filename)
+                merged = TaskStore()
+                merged._next_id = self.tasks._next_id  # ids of deleted tasks are not handed out again
+                if self.task_saver.keeps_ids:  # nor ids the other process handed out and saved
+                    merged._next_id = max(merged._next_id, theirs._next_id)
+                for task, task_id in merge_tasks(self._base, self.tasks, theirs):
+                    merged.append(task, task_id)
+                self.tasks = merged  # incremental savers write the merged list in full, as it was not loaded
+            TodoListManager.save_to_file(self, filename, search_index)
+            wait = getattr(self.task_saver, "wait", None)
+            if wait is not None:  # background writes of the saver, such as a compaction, finish under the lock
+                wait()
+            self._remember(filename)
+
+    def _read(self, filename: str) -> TaskStore:
+        if getattr(self.task_saver, "load", None) is None:
+            try:
+                return TaskStore(iter_tasks(filename))
+            except Exception as e:
+                raise Exception(f"Error loading from file: {e}")
+        # A separate saver reads the file, so our saver does not take the file's state for that of our tasks.
+        reader = type(self.task_saver)()
+        try:
+            return reader.load(filename)
+        except Exception as e:
+            raise Exception(f"Error loading from file: {e}")
+        finally:
+            close = getattr(reader, "close", None)
+            if close is not None:
+                close()
+
+    def load_from_file(self, filename: str = "todo_list.txt", chunk_size: int = DEFAULT_CHUNK_SIZE,
+                       progress: Optional[Callable[[int], None]] = None, search_index: bool = False) -> None:
+        """
+        Loads the to-do list while holding the file lock shared, so no other process is saving it meanwhile.
+        """
+        if not isinstance(filename, str):
+            raise TypeError("Filename must be a string.")
+        source = self._source_file(filename)
+        with self._rwlock.write(), file_lock(source, exclusive=False):
+            TodoListManager.load_from_file(self, filename, chunk_size, progress, search_index)
+            self._remember(source)
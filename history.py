@@ -0,0 +1,140 @@
+#This module defines the History class, which records inverse operations of TaskStore changes for undo and redo.
+
+import contextlib
+from collections import deque
+from typing import Deque, Iterator, List, Optional, Tuple
+from task import Task
+from task_store import TaskStore, TaskStoreListener
+
+# One recorded change and how to invert it:
+#   ("added", task_id)             -> delete the task with that id
+#   ("updated", task_id, old)      -> write the old values back
+#   ("deleted", slot, task_id, task) -> insert the task at slot again, with its id
+Record = Tuple
+
+
+class History(TaskStoreListener):
+    """
+    Keeps bounded undo and redo stacks for a TaskStore.
+
+    Every change is recorded as the information needed to invert it, so a step costs memory for the tasks
+    it touched only, never a copy of the list.  Undoing a step replays the inverses while recording them
+    again, which gives the redo step.  Tasks are found by id, which deleted tasks get back when restored.
+    Replacing the whole store (loading a file) cannot be inverted cheaply and clears the history.
+    """
+    def __init__(self, store: TaskStore, limit: int = 100):
+        """
+        Subscribes to changes of the store.
+
+        :param store: The store to record.
+        :param limit: The maximum number of undo steps kept; older steps are dropped.
+        """
+        if not isinstance(limit, int):
+            raise TypeError("Limit must be an integer.")
+        if limit < 1:
+            raise ValueError("Limit must be positive.")
+        self._store = store
+        self._undo: Deque[List[Record]] = deque(maxlen=limit)
+        self._redo: Deque[List[Record]] = deque(maxlen=limit)
+        self._group: Optional[List[Record]] = None  # the step being recorded by step()
+        self._depth = 0
+        self._replaying = False
+        store.subscribe(self)
+
+    def close(self) -> None:
+        """
+        Stops recording and drops the history.
+        """
+        self._store.unsubscribe(self)
+        self._undo.clear()
+        self._redo.clear()
+
+    @property
+    def can_undo(self) -> bool:
+        return bool(self._undo)
+
+    @property
+    def can_redo(self) -> bool:
+        return bool(self._redo)
+
+    @contextlib.contextmanager
+    def step(self) -> Iterator[None]:
+        """
+        Records every change made inside the with block as one undo step.
+        """
+        with self._store._lock:
+            if self._depth == 0:
+                self._group = []
+            self._depth += 1
+            try:
+                yield
+            finally:
+                self._depth -= 1
+                if self._depth == 0:
+                    group, self._group = self._group, None
+                    if group:
+                        self._undo.append(group)
+
+    def _record(self, record: Record) -> None:
+        if self._group is not None:
+            self._group.append(record)
+        else:
+            self._undo.append([record])
+        if not self._replaying:
+            self._redo.clear()
+
+    def task_added(self, store: TaskStore, slot: int) -> None:
+        self._record(("added", store._ids[slot]))
+
+    def task_updated(self, store: TaskStore, slot: int, old: Task) -> None:
+        self._record(("updated", store._ids[slot], old))
+
+    def task_deleting(self, store: TaskStore, slot: int) -> None:
+        self._record(("deleted", slot, store._ids[slot], store.task_at(slot)))
+
+    def tasks_reset(self, store: TaskStore) -> None:
+        if not self._replaying:
+            self._undo.clear()
+            self._redo.clear()
+
+    def _invert(self, record: Record) -> None:
+        store = self._store
+        if record[0] == "added":
+            del store[store.slot_of(record[1])]
+        elif record[0] == "updated":
+            store[store.slot_of(record[1])] = record[2]
+        else:
+            store.insert(record[1], record[3], task_id=record[2])
+
+    def _replay(self, source: Deque[List[Record]], target: Deque[List[Record]]) -> bool:
+        with self._store._lock:
+            if not source:
+                return False
+            group = source.pop()
+            undo = self._undo
+            self._replaying = True
+            self._undo = target  # the inverses are recorded onto the other stack
+            try:
+                with self.step():
+                    for record in reversed(group):
+                        self._invert(record)
+            finally:
+                self._undo = undo
+                self._replaying = False
+            return True
+
+    def undo(self) -> bool:
+        """
+        Reverts the most recent step.
+
+        :return: False if there was nothing to undo.
+        """
+        return self._replay(self._undo, self._redo)
+
+    def redo(self) -> bool:
+        """
+        Repeats the most recently undone step.
+
+        :return: False if there was nothing to redo.
+        """
+        return self._replay(self._redo, self._undo)
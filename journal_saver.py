@@ -0,0 +1,300 @@
+#This module defines the JournalTaskSaver class, which appends changes to a journal instead of rewriting the whole file.
+
+import datetime
+import json
+import os
+import shutil
+import threading
+import zlib
+from typing import List, Optional, Tuple
+from task import Task
+from task_loader import file_stamp, iter_tasks
+from task_store import TaskStore, TaskStoreListener
+from todo_list_manager import TaskSaver, CSVSaver
+
+JOURNAL_SUFFIX = ".journal"
+DEFAULT_COMPACT_THRESHOLD = 4 * 2 ** 20
+
+
+def _fingerprint(filename: str) -> List[int]:
+    """
+    Returns the size and CRC-32 of a file.
+    """
+    size = crc = 0
+    with open(filename, "rb") as f:
+        for block in iter(lambda: f.read(2 ** 20), b""):
+            size += len(block)
+            crc = zlib.crc32(block, crc)
+    return [size, crc]
+
+
+class JournalTaskSaver(TaskSaver, TaskStoreListener):
+    """
+    Saves tasks as a CSV snapshot plus an append-only journal of changes.
+
+    Each save appends one record per add, update or delete made since the previous save, so its cost
+    depends on the number of changes rather than on the number of tasks.  Once the journal grows past
+    compact_threshold bytes it is folded into a new snapshot on a background thread.  The first line of
+    the journal holds the size and CRC of the snapshot it applies to, so a journal is never replayed on
+    top of the wrong snapshot after an interrupted compaction.  A compaction is dropped if the snapshot or
+    journal changed since this saver last wrote them, so it never replaces another process's save.
+    """
+    incremental = True
+
+    def __init__(self, compact_threshold: int = DEFAULT_COMPACT_THRESHOLD):
+        """
+        Initializes the saver.
+
+        :param compact_threshold: The journal size in bytes that triggers a compaction.
+        """
+        if not isinstance(compact_threshold, int):
+            raise TypeError("Compaction threshold must be an integer.")
+        if compact_threshold < 1:
+            raise ValueError("Compaction threshold must be positive.")
+        self.compact_threshold = compact_threshold
+        self._store: Optional[TaskStore] = None
+        self._filename: Optional[str] = None  # the file whose journal matches the bound store
+        self._adopt: Optional[Tuple[str, int]] = None  # set by load until the manager installs the loaded tasks
+        self._pending: List[str] = []
+        # Journal data taken by take_changes: the data, its number of records and a copy of the tasks to compact into.
+        self._queued: List[Tuple[bytes, int, Optional[TaskStore]]] = []
+        self._journal_bytes = 0  # bytes of records appended or queued since the snapshot
+        self._lock = threading.Lock()  # guards the pending and queued records; never held while writing
+        self._write_lock = threading.Lock()  # held while writing the snapshot or journal
+        self._compactor: Optional[threading.Thread] = None
+        self._snapshots = 0  # number of snapshots written, so a compaction can tell it was overtaken by one
+        self._written: Optional[tuple] = None  # the version of _filename after this saver last wrote it
+        self._error: Optional[Exception] = None
+
+    def version(self, filename: str) -> tuple:
+        return file_stamp(filename), file_stamp(filename + JOURNAL_SUFFIX)
+
+    def bind(self, tasks: TaskStore) -> None:
+        if self._store is not None:
+            self._store.unsubscribe(self)
+        self._store = tasks
+        self._filename = None
+        with self._lock:
+            self._pending, self._queued = [], []
+        tasks.subscribe(self)
+
+    def _record(self, op: str, slot: int, task: Optional[Task] = None) -> None:
+        if self._filename is None:
+            return
+        record = [op, slot]
+        if task is not None:
+            record += [task.description, task.is_done, task.priority, task.deadline.toordinal() if task.deadline else 0]
+        self._pending.append(json.dumps(record, separators=(",", ":")))
+
+    def task_added(self, store: TaskStore, slot: int) -> None:
+        self._record("A", slot, store[slot])
+
+    def task_updated(self, store: TaskStore, slot: int, old: Task) -> None:
+        self._record("U", slot, store[slot])
+
+    def task_deleting(self, store: TaskStore, slot: int) -> None:
+        self._record("D", slot)
+
+    def tasks_reset(self, store: TaskStore) -> None:
+        adopt, self._adopt = self._adopt, None
+        self._filename, journal_bytes = adopt if adopt is not None else (None, 0)
+        with self._lock:
+            self._pending, self._queued = [], []
+            self._journal_bytes = journal_bytes
+
+    def save(self, tasks: List[Task], filename: str) -> Optional[Tuple[int, int]]:
+        """
+        Appends the pending changes to the journal, or writes a full snapshot when the journal
+        does not belong to the given file and tasks.
+
+        :return: The number of records and bytes appended, or None after writing a snapshot.
+        """
+        if not isinstance(filename, str):
+            raise TypeError("Filename must be a string.")
+        self._raise_error()
+        if self.take_changes(tasks, filename):
+            return self._append_queued(filename)
+        try:
+            self.wait()
+            with self._write_lock:
+                self._write_snapshot(tasks, filename + ".tmp")
+                self._install(filename, filename + ".tmp", None)
+                self._snapshots += 1
+                if tasks is self._store:
+                    self._filename = filename
+                    with self._lock:
+                        self._pending, self._queued = [], []
+                        self._journal_bytes = 0
+                    self._written = self.version(filename)
+            return None
+        except Exception as e:
+            raise Exception(f"Error saving to journal: {e}")
+
+    def take_changes(self, tasks: TaskStore, filename: str) -> bool:
+        """
+        Queues the pending changes for write_changes.  Called while the lock of tasks is held, so a copy
+        taken for a compaction matches the records queued so far.
+
+        :return: False if the journal does not belong to the given file and tasks, which need a snapshot.
+        """
+        if tasks is not self._store or filename != self._filename or not os.path.exists(filename + JOURNAL_SUFFIX):
+            return False
+        with self._lock:
+            pending, self._pending = self._pending, []
+            data = ("\n".join(pending) + "\n").encode("utf-8") if pending else b""
+            self._journal_bytes += len(data)
+            compact = None
+            if (self._journal_bytes >= self.compact_threshold and self._compactor is None
+                    and all(queued[2] is None for queued in self._queued)):
+                compact = tasks.copy()
+            self._queued.append((data, len(pending), compact))
+        return True
+
+    def write_changes(self, filename: str) -> Tuple[int, int]:
+        """
+        Appends the changes queued by take_changes to the journal in the order they were taken, and starts
+        a compaction once the journal has grown past compact_threshold.
+
+        :return: The number of records and bytes appended.
+        """
+        self._raise_error()
+        return self._append_queued(filename)
+
+    def _append_queued(self, filename: str) -> Tuple[int, int]:
+        try:
+            with self._write_lock:
+                with self._lock:
+                    queued, self._queued = self._queued, []
+                rows = written = 0
+                compact = offset = None
+                if any(data or copy is not None for data, _, copy in queued):
+                    with open(filename + JOURNAL_SUFFIX, "ab") as f:
+                        for data, count, copy in queued:
+                            f.write(data)
+                            rows += count
+                            written += len(data)
+                            if copy is not None:
+                                compact, offset = copy, f.tell()
+                        f.flush()
+                        os.fsync(f.fileno())
+                    self._written = self.version(filename)
+                if compact is not None:
+                    self._compactor = threading.Thread(target=self._compact,
+                                                       args=(compact, filename, offset, self._snapshots))
+                    self._compactor.start()
+                return rows, written
+        except Exception as e:
+            self._filename = None  # the journal may lack the taken records, so the next save writes a snapshot
+            raise Exception(f"Error saving to journal: {e}")
+
+    def _raise_error(self) -> None:
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise Exception(f"Error compacting journal: {error}")
+
+    def wait(self) -> None:
+        """
+        Blocks until a running background compaction has finished.
+        """
+        compactor = self._compactor
+        if compactor is not None:
+            compactor.join()
+
+    @staticmethod
+    def _write_snapshot(tasks: List[Task], tmp: str) -> None:
+        CSVSaver().save(tasks, tmp)  # fsynced by CSVSaver
+
+    def _install(self, filename: str, tmp: str, journal_offset: Optional[int]) -> None:
+        """
+        Moves a written snapshot into place together with a fresh journal.  The caller holds the write lock.
+
+        :param journal_offset: The position in the old journal up to which the snapshot includes the changes;
+            later records are carried over.  None starts an empty journal.
+        """
+        journal = filename + JOURNAL_SUFFIX
+        with open(journal + ".tmp", "wb") as f:
+            f.write(json.dumps(["S"] + _fingerprint(tmp)).encode() + b"\n")
+            if journal_offset is not None:
+                with open(journal, "rb") as old:
+                    old.seek(journal_offset)
+                    shutil.copyfileobj(old, f)
+            f.flush()
+            os.fsync(f.fileno())
+        # A crash between these two steps is recovered by load, which accepts the new journal from its .tmp file.
+        os.replace(tmp, filename)
+        os.replace(journal + ".tmp", journal)
+
+    def _compact(self, tasks: TaskStore, filename: str, journal_offset: int, snapshots: int) -> None:
+        tmp = filename + ".compact"
+        try:
+            self._write_snapshot(tasks, tmp)
+            with self._write_lock:
+                # Another process may have saved the file meanwhile, or this saver a newer snapshot; they are kept.
+                if (self._filename == filename and self._snapshots == snapshots
+                        and self.version(filename) == self._written):
+                    self._install(filename, tmp, journal_offset)
+                    self._snapshots += 1
+                    self._written = self.version(filename)
+                    with self._lock:
+                        self._journal_bytes = max(self._journal_bytes - journal_offset, 0)
+                else:
+                    os.remove(tmp)
+        except Exception as e:
+            self._error = e
+        finally:
+            self._compactor = None
+
+    def load(self, filename: str) -> TaskStore:
+        """
+        Loads the snapshot and replays the journal written for it.
+
+        :param filename: The name of the snapshot file.
+        :return: The loaded tasks.
+        """
+        self.wait()
+        tasks = TaskStore(iter_tasks(filename))
+        journal = filename + JOURNAL_SUFFIX
+        header = json.dumps(["S"] + _fingerprint(filename)).encode() + b"\n"
+        for candidate in (journal, journal + ".tmp"):
+            try:
+                with open(candidate, "rb") as f:
+                    matches = f.readline() == header
+            except FileNotFoundError:
+                continue
+            if matches:
+                if candidate != journal:
+                    os.replace(candidate, journal)
+                self._replay(tasks, journal, len(header))
+                self._adopt = filename, os.path.getsize(journal) - len(header)
+                break
+        return tasks
+
+    @staticmethod
+    def _replay(tasks: TaskStore, journal: str, offset: int) -> None:
+        """
+        Applies the journal records to tasks.  A torn record left by a crash ends the replay and is cut off.
+        """
+        with open(journal, "rb+") as f:
+            f.seek(offset)
+            for line in iter(f.readline, b""):
+                try:
+                    if not line.endswith(b"\n"):
+                        raise ValueError("Incomplete record.")
+                    op, slot, *fields = json.loads(line)
+                    if op == "D":
+                        del tasks[slot]
+                        offset += len(line)
+                        continue
+                    description, is_done, priority, deadline = fields
+                    task = Task(description, is_done, priority, datetime.date.fromordinal(deadline) if deadline else None)
+                    if op == "A":
+                        tasks.insert(slot, task)
+                    elif op == "U":
+                        tasks[slot] = task
+                    else:
+                        raise ValueError(f"Unknown journal record: {op}")
+                except (TypeError, ValueError, IndexError):
+                    print(f"Ignoring journal from byte {offset}: invalid record")
+                    f.truncate(offset)
+                    return
+                offset += len(line)
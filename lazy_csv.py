@@ -0,0 +1,183 @@
+#This module defines the LazyTaskFile class, which reads the rows of a huge task file only when they are accessed.
+
+import csv
+import io
+import itertools
+import mmap
+import operator
+import os
+import struct
+import sys
+from array import array
+from collections.abc import Sequence
+from typing import List, Optional, Union
+from task import Task
+from task_loader import HEADER as CSV_HEADER, parse_row, split_line
+
+SUFFIX = ".offsets"  # the row index of a task file is cached in filename + SUFFIX
+MAGIC = b"TODOOFS1"
+# File layout: header, then the start offset of every row as uint64.
+HEADER = struct.Struct("<8sQqQ?")  # magic, size and mtime_ns of the task file, number of rows, whether it has a CSV header
+BLOCK_SIZE = 1 << 22  # bytes scanned at a time while building the index
+_NOT_QUOTE_OR_NEWLINE = bytes(byte for byte in range(256) if byte not in b'"\n')
+
+
+def scan_rows(data: Union[bytes, mmap.mmap], start: int = 0, quoted: bool = True) -> array:
+    """
+    Returns the start offset of every non-blank row of CSV data, in one pass.
+
+    With quoted, rows continue over line breaks inside quoted fields: as CSVSaver quotes whole fields and
+    doubles the quotes inside them, a line with an odd number of quote characters opens or closes such a
+    field.  Blocks in which no field spans lines are split without a loop per line.
+
+    :param data: The file contents.
+    :param start: The offset of the first row.
+    :param quoted: False for text written by TextTaskSaver, whose descriptions are not quoted, so a quote
+        never spans lines and every line is a row.
+    """
+    offsets = array("Q")
+    size = len(data)
+    inside = False  # inside a quoted field that continues on the next line
+    position = start
+    while position < size:
+        end = min(position + BLOCK_SIZE, size)
+        if end < size:
+            newline = data.rfind(b"\n", position, end)
+            if newline == -1:
+                newline = data.find(b"\n", end)
+            end = size if newline == -1 else newline + 1
+        block = data[position:end]
+        lines = block.split(b"\n")
+        if not lines[-1]:
+            lines.pop()  # the block ends with a line break
+        starts = itertools.accumulate(map(operator.add, map(len, lines), itertools.repeat(1)), initial=position)
+        # Dropping every byte but quotes and line breaks, then pairs of quotes, leaves a quote only on lines
+        # with an odd number of them, which open or close a field that spans lines.
+        if not quoted or not inside and b'"' not in block.translate(None, _NOT_QUOTE_OR_NEWLINE).replace(b'""', b""):
+            if (block.startswith((b"\n", b"\r\n")) or b"\n\n" in block or b"\n\r\n" in block
+                    or (lines and not lines[-1].strip(b"\r"))):  # blank lines are skipped
+                offsets.extend(itertools.compress(starts, map(bytes.strip, lines, itertools.repeat(b"\r"))))
+            else:
+                offsets.extend(itertools.islice(starts, len(lines)))
+        else:
+            for line_start, line in zip(starts, lines):
+                if not inside and line.strip(b"\r"):
+                    offsets.append(line_start)
+                if line.count(b'"') & 1:
+                    inside = not inside
+        position = end
+    return offsets
+
+
+class LazyTaskFile(Sequence):
+    """
+    A read-only sequence of the tasks in a file written by CSVSaver or TextTaskSaver.
+
+    Opening the file memory-maps it and finds where each row starts; tasks[i] then parses only the i-th
+    row.  The row offsets are cached in filename + SUFFIX together with the size and modification time of
+    the file, so opening the same file again does not scan it.  A row that cannot be parsed raises
+    ValueError when it is accessed.
+    """
+    def __init__(self, filename: str, cache: bool = True):
+        """
+        Maps the file and loads or builds its row index.
+
+        :param filename: The name of the file to open.
+        :param cache: Whether to read and write the row index cache.
+        """
+        if not isinstance(filename, str):
+            raise TypeError("Filename must be a string.")
+        self.filename = filename
+        self._map: Optional[mmap.mmap] = None
+        with open(filename, "rb") as f:
+            stat = os.fstat(f.fileno())
+            if stat.st_size:
+                self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._size = stat.st_size
+        offsets = self._read_cache(stat) if cache else None
+        if offsets is None:
+            first_line = self._data[:self._data.find(b"\n") + 1 or self._size]
+            self._has_header = next(csv.reader([first_line.decode("utf-8")]), None) == CSV_HEADER
+            offsets = scan_rows(self._data, len(first_line) if self._has_header else 0, quoted=self._has_header)
+            if cache:
+                self._write_cache(stat, offsets)
+        self._offsets = offsets
+
+    @property
+    def _data(self) -> Union[bytes, mmap.mmap]:
+        return self._map if self._map is not None else b""
+
+    def _read_cache(self, stat: os.stat_result) -> Optional[array]:
+        try:
+            with open(self.filename + SUFFIX, "rb") as f:
+                header = f.read(HEADER.size)
+                data = f.read()
+        except OSError:
+            return None
+        if len(header) < HEADER.size:
+            return None
+        magic, size, mtime_ns, count, self._has_header = HEADER.unpack(header)
+        if magic != MAGIC or (size, mtime_ns) != (stat.st_size, stat.st_mtime_ns) or len(data) != 8 * count:
+            return None
+        offsets = array("Q", data)
+        if sys.byteorder == "big":
+            offsets.byteswap()
+        return offsets
+
+    def _write_cache(self, stat: os.stat_result, offsets: array) -> None:
+        from todo_list_manager import atomic_write  # todo_list_manager imports this module
+        try:
+            with atomic_write(self.filename + SUFFIX, mode="wb") as f:
+                f.write(HEADER.pack(MAGIC, stat.st_size, stat.st_mtime_ns, len(offsets), self._has_header))
+                if sys.byteorder == "big":
+                    offsets = array("Q", offsets)
+                    offsets.byteswap()
+                f.write(offsets.tobytes())
+        except OSError:
+            pass  # the cache only saves time; a read-only directory is not an error
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def row(self, index: int) -> List[str]:
+        """
+        Returns the fields of the i-th row as written in the file.
+
+        :param index: The position of the task.
+        """
+        if not isinstance(index, int):
+            raise TypeError("Index must be an integer.")
+        if index < 0:
+            index += len(self._offsets)
+        if not 0 <= index < len(self._offsets):
+            raise IndexError("Task index out of range.")
+        start = self._offsets[index]
+        end = self._offsets[index + 1] if index + 1 < len(self._offsets) else self._size
+        text = self._data[start:end].decode("utf-8")
+        if not self._has_header:
+            return split_line(text.rstrip("\r\n"))
+        return next(csv.reader(io.StringIO(text, newline="")), [])
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Task, List[Task]]:
+        if isinstance(index, slice):
+            return [self[position] for position in range(*index.indices(len(self._offsets)))]
+        row = self.row(index)
+        if len(row) != 4:
+            raise ValueError(f"Invalid row {index + 1}: {','.join(row)}")
+        return parse_row(row)
+
+    def close(self) -> None:
+        """
+        Unmaps the file.
+        """
+        if self._map is not None:
+            self._map.close()
+
+    def __enter__(self) -> "LazyTaskFile":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __reduce__(self):
+        return LazyTaskFile, (self.filename,)
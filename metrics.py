@@ -0,0 +1,323 @@
+#This module defines the Metrics class, which records latency, counts, rows and bytes of TodoListManager and TaskSaver operations.
+
+import bisect
+import cProfile
+import functools
+import io
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Tuple
+
+# Upper bounds of the latency buckets in seconds: 1, 2.5 and 5 per decade from 1 microsecond to 10 seconds.
+BUCKETS: Tuple[float, ...] = tuple(scale * 10.0 ** exponent for exponent in range(-6, 1) for scale in (1, 2.5, 5)) + (10.0,)
+
+# How the rows, bytes read and bytes written of a call are counted, by operation.
+Counter = Callable[[Any, tuple, dict, Any], Tuple[int, int, int]]
+
+
+def _file_size(filename) -> int:
+    try:
+        return os.path.getsize(filename)
+    except (OSError, TypeError):
+        return 0
+
+
+def _argument(args: tuple, kwargs: dict, position: int, name: str, default=None):
+    return args[position] if len(args) > position else kwargs.get(name, default)
+
+
+def _count_listed(manager, args, kwargs, result) -> Tuple[int, int, int]:
+    return (result.count("\n") - 1 if manager.tasks else 0), 0, 0
+
+
+def _count_saved(saver, args, kwargs, result) -> Tuple[int, int, int]:
+    if result is not None:
+        rows, written = result  # an incremental save reports the rows and bytes it actually wrote
+        return rows, 0, written
+    return len(_argument(args, kwargs, 0, "tasks")), 0, _file_size(_argument(args, kwargs, 1, "filename"))
+
+
+def _count_loaded(manager, args, kwargs, result) -> Tuple[int, int, int]:
+    if getattr(manager.task_saver, "load", None) is not None:
+        return len(manager.tasks), 0, 0  # the saver's own load records the bytes
+    filename = _argument(args, kwargs, 0, "filename", "todo_list.txt")
+    if isinstance(filename, str):
+        filename = manager._source_file(filename)
+    return len(manager.tasks), _file_size(filename), 0
+
+
+MANAGER_OPERATIONS: Dict[str, Counter] = {
+    "add_task": lambda manager, args, kwargs, result: (1, 0, 0),
+    "add_tasks": lambda manager, args, kwargs, result: (len(result), 0, 0),
+    "mark_task_as_done": lambda manager, args, kwargs, result: (1, 0, 0),
+    "delete_task": lambda manager, args, kwargs, result: (1, 0, 0),
+    "mark_done_many": lambda manager, args, kwargs, result: (len(_argument(args, kwargs, 0, "task_ids")), 0, 0),
+    "delete_many": lambda manager, args, kwargs, result: (len(_argument(args, kwargs, 0, "task_ids")), 0, 0),
+    "list_tasks": _count_listed,
+    "search": lambda manager, args, kwargs, result: (len(result), 0, 0),
+    "next_tasks": lambda manager, args, kwargs, result: (len(result), 0, 0),
+    "save_to_file": lambda manager, args, kwargs, result: (len(manager.tasks), 0, 0),
+    "load_from_file": _count_loaded,
+}
+
+ID_OPERATIONS = {"mark_done_many", "delete_many"}  # take an iterable of task ids as their first argument
+
+SAVER_OPERATIONS: Dict[str, Counter] = {
+    "save": _count_saved,
+    "write_changes": lambda saver, args, kwargs, result: (result[0], 0, result[1]),
+    "load": lambda saver, args, kwargs, result: (len(result), _file_size(_argument(args, kwargs, 0, "filename")), 0),
+}
+
+
+class ProfilingHook:
+    """
+    Called around every instrumented operation while it is added to a Metrics object.
+    """
+    def start(self, operation: str) -> Any:
+        """
+        Called before the operation runs.
+
+        :return: A token that is passed to stop.
+        """
+
+    def stop(self, operation: str, token: Any) -> None:
+        """
+        Called after the operation has finished, also when it raised.
+        """
+
+
+class CProfileHook(ProfilingHook):
+    """
+    Profiles instrumented operations with cProfile.  Nested operations are profiled as part of the outer one.
+    """
+    def __init__(self):
+        self.profile = cProfile.Profile()
+        self._depth = 0
+        self._lock = threading.Lock()
+
+    def start(self, operation: str) -> Any:
+        with self._lock:
+            self._depth += 1
+            if self._depth == 1:
+                self.profile.enable()
+
+    def stop(self, operation: str, token: Any) -> None:
+        with self._lock:
+            self._depth -= 1
+            if self._depth == 0:
+                self.profile.disable()
+
+    def report(self, sort: str = "cumulative", limit: int = 20) -> str:
+        """
+        Returns the profile as text, like pstats.Stats.print_stats.
+
+        :param sort: The pstats sort key.
+        :param limit: The number of functions listed.
+        """
+        output = io.StringIO()
+        pstats.Stats(self.profile, stream=output).sort_stats(sort).print_stats(limit)
+        return output.getvalue()
+
+
+class TracemallocHook(ProfilingHook):
+    """
+    Records the peak memory allocated during each instrumented operation with tracemalloc.
+
+    Tracing starts when the first operation runs and stops again in close, unless it was already running.
+    Nested operations are attributed to the outer one.
+    """
+    def __init__(self):
+        self.peaks: Dict[str, int] = {}  # highest peak in bytes, by operation
+        self._depth = 0
+        self._started = False
+        self._lock = threading.Lock()
+
+    def start(self, operation: str) -> Any:
+        with self._lock:
+            self._depth += 1
+            if self._depth > 1:
+                return None
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._started = True
+            tracemalloc.reset_peak()
+            return tracemalloc.get_traced_memory()[0]
+
+    def stop(self, operation: str, token: Any) -> None:
+        with self._lock:
+            self._depth -= 1
+            if token is not None:
+                peak = tracemalloc.get_traced_memory()[1] - token
+                self.peaks[operation] = max(peak, self.peaks.get(operation, 0))
+
+    def close(self) -> None:
+        """
+        Stops tracing if this hook started it.
+        """
+        if self._started:
+            tracemalloc.stop()
+            self._started = False
+
+
+class OperationStats:
+    """
+    The counters of one operation: calls, errors, rows, bytes and a latency histogram.
+    """
+    __slots__ = ("calls", "errors", "rows", "bytes_read", "bytes_written", "seconds", "buckets")
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.rows = 0
+        self.bytes_read = 0
+        self.bytes_written = 0
+        self.seconds = 0.0
+        self.buckets = [0] * (len(BUCKETS) + 1)  # the last bucket counts calls slower than BUCKETS[-1]
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "rows": self.rows,
+            "bytes_read": self.bytes_read,
+            "bytes_written": self.bytes_written,
+            "seconds": self.seconds,
+            "buckets": dict(zip(BUCKETS + (float("inf"),), self.buckets)),
+        }
+
+
+class Metrics:
+    """
+    Collects operation metrics from instrumented TodoListManager and TaskSaver objects.
+
+    Instrumenting an object shadows its methods with timing wrappers on that instance only, so objects
+    that are not instrumented run the plain methods without any overhead.  Use
+    TodoListManager.enable_metrics rather than instrument directly; it also follows changes of the saver.
+    """
+    def __init__(self):
+        self._operations: Dict[str, OperationStats] = {}
+        self._hooks: List[ProfilingHook] = []
+        self._lock = threading.Lock()
+
+    def add_hook(self, hook: ProfilingHook) -> None:
+        """
+        Calls the hook around every operation from now on.
+        """
+        with self._lock:
+            self._hooks = self._hooks + [hook]
+
+    def remove_hook(self, hook: ProfilingHook) -> None:
+        """
+        Stops calling the hook.
+        """
+        with self._lock:
+            self._hooks = [other for other in self._hooks if other is not hook]
+
+    def record(self, operation: str, seconds: float, rows: int = 0, bytes_read: int = 0, bytes_written: int = 0,
+               error: bool = False) -> None:
+        """
+        Adds one call of an operation.
+
+        :param operation: The name of the operation, e.g. "add_task" or "CSVSaver.save".
+        :param seconds: The wall time of the call.
+        """
+        with self._lock:
+            stats = self._operations.get(operation)
+            if stats is None:
+                stats = self._operations[operation] = OperationStats()
+            stats.calls += 1
+            stats.errors += error
+            stats.rows += rows
+            stats.bytes_read += bytes_read
+            stats.bytes_written += bytes_written
+            stats.seconds += seconds
+            stats.buckets[bisect.bisect_left(BUCKETS, seconds)] += 1
+
+    def _wrap(self, name: str, method: Callable, counter: Counter, owner: Any) -> Callable:
+        @functools.wraps(method)
+        def measured(*args, **kwargs):
+            if args and name in ID_OPERATIONS:
+                args = (list(args[0]),) + args[1:]  # the ids may be an iterator, and are counted afterwards
+            elif "task_ids" in kwargs:
+                kwargs["task_ids"] = list(kwargs["task_ids"])
+            hooks = self._hooks
+            tokens = [hook.start(name) for hook in hooks]
+            start = time.perf_counter()
+            try:
+                result = method(*args, **kwargs)
+            except BaseException:
+                self.record(name, time.perf_counter() - start, error=True)
+                raise
+            finally:
+                for hook, token in zip(hooks, tokens):
+                    hook.stop(name, token)
+            elapsed = time.perf_counter() - start
+            self.record(name, elapsed, *counter(owner, args, kwargs, result))
+            return result
+        measured.__wrapped_by_metrics__ = self
+        return measured
+
+    def instrument(self, obj: Any, operations: Dict[str, Counter], prefix: str = "") -> None:
+        """
+        Wraps the given methods of one object.  Methods the object does not have are skipped.
+
+        :param obj: The object, e.g. a TodoListManager or a TaskSaver.
+        :param operations: The names of the methods and how their rows and bytes are counted.
+        :param prefix: Put before the method names in the metrics, e.g. "CSVSaver.".
+        """
+        for name, counter in operations.items():
+            method = getattr(obj, name, None)
+            if method is not None and getattr(method, "__wrapped_by_metrics__", None) is None:
+                setattr(obj, name, self._wrap(prefix + name, method, counter, obj))
+
+    def uninstrument(self, obj: Any, operations: Dict[str, Counter]) -> None:
+        """
+        Removes the wrappers installed by instrument.
+        """
+        for name in operations:
+            if getattr(obj.__dict__.get(name), "__wrapped_by_metrics__", None) is self:
+                delattr(obj, name)
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Returns a copy of all counters, keyed by operation.  Histogram buckets are keyed by their upper bound.
+        """
+        with self._lock:
+            return {operation: stats.as_dict() for operation, stats in sorted(self._operations.items())}
+
+    def reset(self) -> None:
+        """
+        Clears all counters.
+        """
+        with self._lock:
+            self._operations = {}
+
+    def prometheus(self, namespace: str = "todo") -> str:
+        """
+        Returns the counters in the Prometheus text exposition format.
+
+        :param namespace: The prefix of the metric names.
+        """
+        lines = [
+            f"# HELP {namespace}_operation_seconds Latency of to-do list operations.",
+            f"# TYPE {namespace}_operation_seconds histogram",
+        ]
+        snapshot = self.snapshot()
+        for operation, stats in snapshot.items():
+            cumulative = 0
+            for bound, count in stats["buckets"].items():
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f'{namespace}_operation_seconds_bucket{{operation="{operation}",le="{le}"}} {cumulative}')
+            lines.append(f'{namespace}_operation_seconds_sum{{operation="{operation}"}} {stats["seconds"]!r}')
+            lines.append(f'{namespace}_operation_seconds_count{{operation="{operation}"}} {stats["calls"]}')
+        for counter, help_text in (("errors", "Failed operations."), ("rows", "Tasks processed."),
+                                   ("bytes_read", "Bytes read from files."), ("bytes_written", "Bytes written to files.")):
+            lines.append(f"# HELP {namespace}_operation_{counter}_total {help_text}")
+            lines.append(f"# TYPE {namespace}_operation_{counter}_total counter")
+            for operation, stats in snapshot.items():
+                lines.append(f'{namespace}_operation_{counter}_total{{operation="{operation}"}} {stats[counter]}')
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,150 @@
+#This module defines the TaskScheduler class, which keeps the open tasks of a TaskStore in an indexed binary heap.
+
+import datetime
+import heapq
+from typing import Any, Callable, Dict, List, Tuple
+from task import Task
+from task_store import DONE_FLAG, TaskStore, TaskStoreListener, TaskView
+
+
+def urgency_key(task: Task) -> Tuple[datetime.date, int]:
+    """
+    The default scheduling key: the earliest deadline first, then the highest priority.
+
+    Tasks without a deadline come after all tasks with one, and tasks without a priority after priority 3.
+    """
+    return task.deadline or datetime.date.max, task.priority or 4
+
+
+class TaskScheduler(TaskStoreListener):
+    """
+    Orders the tasks of a TaskStore that are not done by a key, smallest first.
+
+    The heap holds (key, id) entries, so equal keys come out in the order the tasks were added, and a
+    dictionary maps each id to its position in the heap.  Adding, completing, changing or deleting a task
+    moves one entry in O(log n), and next(k) reads the k smallest entries in O(k log k) without changing
+    the heap.
+    """
+    def __init__(self, store: TaskStore, key: Callable[[Task], Any] = urgency_key):
+        """
+        Builds the heap and subscribes to changes of the store.
+
+        :param store: The store to schedule.
+        :param key: Computes the sort key of a task; smaller keys are scheduled first.
+        """
+        if not callable(key):
+            raise TypeError("Key must be callable.")
+        self._store = store
+        self.key = key
+        self._heap: List[Tuple[Any, int]] = []
+        self._positions: Dict[int, int] = {}  # task id -> position in _heap
+        self.tasks_reset(store)
+        store.subscribe(self)
+
+    def close(self) -> None:
+        """
+        Stops following the store.
+        """
+        self._store.unsubscribe(self)
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def _move(self, position: int, entry: Tuple[Any, int]) -> None:
+        self._heap[position] = entry
+        self._positions[entry[1]] = position
+
+    def _sift_up(self, position: int) -> None:
+        heap = self._heap
+        entry = heap[position]
+        while position:
+            parent = (position - 1) >> 1
+            if not entry < heap[parent]:
+                break
+            self._move(position, heap[parent])
+            position = parent
+        self._move(position, entry)
+
+    def _sift_down(self, position: int) -> None:
+        heap = self._heap
+        size = len(heap)
+        entry = heap[position]
+        while True:
+            child = 2 * position + 1
+            if child >= size:
+                break
+            if child + 1 < size and heap[child + 1] < heap[child]:
+                child += 1
+            if not heap[child] < entry:
+                break
+            self._move(position, heap[child])
+            position = child
+        self._move(position, entry)
+
+    def _push(self, task_id: int, key: Any) -> None:
+        self._heap.append((key, task_id))
+        self._sift_up(len(self._heap) - 1)
+
+    def _remove(self, task_id: int) -> None:
+        position = self._positions.pop(task_id, None)
+        if position is None:
+            return
+        last = self._heap.pop()
+        if position < len(self._heap):
+            self._heap[position] = last
+            self._positions[last[1]] = position
+            self._sift_up(position)
+            self._sift_down(self._positions[last[1]])
+
+    def _update(self, task_id: int, key: Any) -> None:
+        position = self._positions.get(task_id)
+        if position is None:
+            self._push(task_id, key)
+            return
+        old = self._heap[position]
+        self._heap[position] = (key, task_id)
+        if (key, task_id) < old:
+            self._sift_up(position)
+        else:
+            self._sift_down(position)
+
+    def task_added(self, store: TaskStore, slot: int) -> None:
+        if not store._flags[slot] & DONE_FLAG:
+            self._push(store._ids[slot], self.key(TaskView(store, slot)))
+
+    def task_updated(self, store: TaskStore, slot: int, old: Task) -> None:
+        if store._flags[slot] & DONE_FLAG:
+            self._remove(store._ids[slot])
+        else:
+            self._update(store._ids[slot], self.key(TaskView(store, slot)))
+
+    def task_deleting(self, store: TaskStore, slot: int) -> None:
+        self._remove(store._ids[slot])
+
+    def tasks_reset(self, store: TaskStore) -> None:
+        key = self.key
+        self._heap = [(key(TaskView(store, slot)), store._ids[slot])
+                      for slot in range(len(store)) if not store._flags[slot] & DONE_FLAG]
+        heapq.heapify(self._heap)
+        self._positions = {task_id: position for position, (_, task_id) in enumerate(self._heap)}
+
+    def next(self, k: int = 1) -> List[TaskView]:
+        """
+        Returns the k open tasks with the smallest keys, in order.
+
+        :param k: The number of tasks.
+        """
+        if not isinstance(k, int):
+            raise TypeError("k must be an integer.")
+        if k < 0:
+            raise ValueError("k cannot be negative.")
+        heap = self._heap
+        result = []
+        frontier = [(heap[0], 0)] if heap and k else []
+        while frontier and len(result) < k:
+            entry, position = heapq.heappop(frontier)
+            result.append(TaskView(self._store, self._store.slot_of(entry[1])))
+            for child in (2 * position + 1, 2 * position + 2):
+                if child < len(heap):
+                    heapq.heappush(frontier, (heap[child], child))
+        return result
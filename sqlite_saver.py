@@ -0,0 +1,350 @@
+#This module defines the SQLiteTaskSaver class, which keeps tasks in a local SQLite database.
+
+import contextlib
+import datetime
+import os
+import queue
+import sqlite3
+import threading
+from array import array
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+from task import Task
+from task_store import TaskStore, TaskStoreListener
+from task_loader import file_stamp
+from todo_list_manager import TaskSaver
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id INTEGER PRIMARY KEY,
+    description TEXT NOT NULL,
+    is_done INTEGER NOT NULL,
+    priority INTEGER,
+    deadline TEXT,
+    position REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS tasks_priority ON tasks (priority);
+CREATE INDEX IF NOT EXISTS tasks_deadline ON tasks (deadline);
+CREATE INDEX IF NOT EXISTS tasks_position ON tasks (position);
+"""
+UPSERT = "INSERT OR REPLACE INTO tasks (id, description, is_done, priority, deadline, position) VALUES (?, ?, ?, ?, ?, ?)"
+
+
+class ConnectionPool:
+    """
+    Hands out SQLite connections to one database and keeps up to size idle connections for reuse.
+
+    Connections use WAL mode, so readers do not block the writer.
+    """
+    def __init__(self, database: str, size: int = 4):
+        """
+        Initializes the pool.  Connections are opened on demand.
+
+        :param database: The path of the database file.
+        :param size: The maximum number of idle connections kept open.
+        """
+        self.database = database
+        self.size = size
+        self._idle: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.database, isolation_level=None, check_same_thread=False)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        return connection
+
+    @contextlib.contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """
+        Borrows a connection for the duration of a with block.
+        """
+        try:
+            connection = self._idle.get_nowait()
+        except queue.Empty:
+            connection = self._connect()
+        try:
+            yield connection
+        finally:
+            if self._idle.qsize() < self.size:
+                self._idle.put(connection)
+            else:
+                connection.close()
+
+    @contextlib.contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """
+        Borrows a connection and runs the with block in one write transaction.
+        """
+        with self.connection() as connection:
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                yield connection
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+            connection.execute("COMMIT")
+
+    def close(self) -> None:
+        """
+        Closes the idle connections.
+        """
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+class SQLiteTaskSaver(TaskSaver, TaskStoreListener):
+    """
+    Saves tasks to a SQLite database with indexes on priority and deadline.
+
+    Once the tasks of a manager have been saved to or loaded from a database, the saver tracks every change
+    and writes only the affected rows: changes are merged per task and applied with executemany in one
+    transaction on the next save, or on a background thread whenever batch_size of them are pending, so
+    changes never wait for the database.  Rows keep the task ids
+    of the TaskStore and are ordered by a position column.
+    """
+    incremental = True
+    keeps_ids = True
+
+    def __init__(self, batch_size: int = 1000, pool_size: int = 4):
+        """
+        Initializes the saver.
+
+        :param batch_size: The number of pending changed tasks that triggers a write.
+        :param pool_size: The number of idle connections kept per database.
+        """
+        if not isinstance(batch_size, int) or not isinstance(pool_size, int):
+            raise TypeError("Batch size and pool size must be integers.")
+        if batch_size < 1 or pool_size < 1:
+            raise ValueError("Batch size and pool size must be positive.")
+        self.batch_size = batch_size
+        self.pool_size = pool_size
+        self._pools: Dict[str, ConnectionPool] = {}
+        self._store: Optional[TaskStore] = None
+        self._database: Optional[str] = None  # the database that matches the bound store apart from pending changes
+        self._adopt: Optional[Tuple[str, array]] = None  # set by load until the manager installs the loaded tasks
+        self._positions = array("d")  # position column of each slot of the bound store
+        self._upserts: Dict[int, tuple] = {}
+        self._deletes: Set[int] = set()
+        self._queued: List[Tuple[Dict[int, tuple], Set[int]]] = []  # changes taken for writing, oldest first
+        self._lock = threading.Lock()  # guards the pools and the queued changes; never held while writing
+        self._write_lock = threading.Lock()  # held while writing, so changes are written in the order taken
+        self._flusher: Optional[threading.Thread] = None
+        self._error: Optional[Exception] = None
+
+    def pool(self, database: str) -> ConnectionPool:
+        """
+        Returns the connection pool for a database.
+
+        :param database: The path of the database file.
+        """
+        with self._lock:
+            if database not in self._pools:
+                self._pools[database] = ConnectionPool(database, self.pool_size)
+            return self._pools[database]
+
+    def close(self) -> None:
+        """
+        Writes pending changes and closes all pooled connections.
+        """
+        self.flush()
+        self.wait()
+        for pool in self._pools.values():
+            pool.close()
+
+    def version(self, filename: str) -> tuple:
+        # Committed changes stay in the write-ahead log until a checkpoint copies them into the database.
+        return file_stamp(filename), file_stamp(filename + "-wal")
+
+    def bind(self, tasks: TaskStore) -> None:
+        if self._store is not None:
+            self._store.unsubscribe(self)
+        self._store = tasks
+        self._database = None
+        tasks.subscribe(self)
+
+    @staticmethod
+    def _row(task_id: int, task: Task, position: float) -> tuple:
+        return (task_id, task.description, int(task.is_done), task.priority,
+                task.deadline.strftime("%Y-%m-%d") if task.deadline else None, position)
+
+    def _changed(self, store: TaskStore, slot: int) -> None:
+        task_id = store.id_at(slot)
+        self._upserts[task_id] = self._row(task_id, store[slot], self._positions[slot])
+        if len(self._upserts) + len(self._deletes) >= self.batch_size:
+            self._flush_in_background()
+
+    def task_added(self, store: TaskStore, slot: int) -> None:
+        if self._database is None:
+            return
+        positions = self._positions
+        if slot == len(positions):
+            position = positions[-1] + 1 if positions else 1.0
+        elif slot == 0:
+            position = positions[0] - 1
+        else:
+            position = (positions[slot - 1] + positions[slot]) / 2
+            if not positions[slot - 1] < position < positions[slot]:
+                self._database = None  # out of precision; the next save renumbers every row
+                return
+        positions.insert(slot, position)
+        self._changed(store, slot)
+
+    def task_updated(self, store: TaskStore, slot: int, old: Task) -> None:
+        if self._database is not None:
+            self._changed(store, slot)
+
+    def task_deleting(self, store: TaskStore, slot: int) -> None:
+        if self._database is None:
+            return
+        task_id = store.id_at(slot)
+        self._upserts.pop(task_id, None)
+        self._deletes.add(task_id)
+        del self._positions[slot]
+        if len(self._upserts) + len(self._deletes) >= self.batch_size:
+            self._flush_in_background()
+
+    def tasks_reset(self, store: TaskStore) -> None:
+        adopt, self._adopt = self._adopt, None
+        self._database, self._positions = adopt if adopt is not None else (None, array("d"))
+        with self._lock:
+            self._upserts, self._deletes = {}, set()
+            self._queued = []
+
+    def _take(self) -> None:
+        with self._lock:
+            if self._upserts or self._deletes:
+                self._queued.append((self._upserts, self._deletes))
+                self._upserts, self._deletes = {}, set()
+
+    def _write_queued(self) -> int:
+        """
+        Writes the changes taken so far in one transaction.
+
+        :return: The number of rows written or deleted.
+        """
+        with self._write_lock:
+            with self._lock:
+                queued, self._queued = self._queued, []
+            if self._database is None or not queued:
+                return 0
+            try:
+                with self.pool(self._database).transaction() as connection:
+                    for upserts, deletes in queued:
+                        connection.executemany("DELETE FROM tasks WHERE id = ?", ((task_id,) for task_id in deletes))
+                        connection.executemany(UPSERT, upserts.values())
+            except sqlite3.Error as e:
+                self._database = None  # the next save rewrites the whole table
+                raise Exception(f"Error saving to database: {e}")
+            return sum(len(upserts) + len(deletes) for upserts, deletes in queued)
+
+    def _flush_in_background(self) -> None:
+        # Called by a change, while the store is locked: only the write is left to the flusher thread.
+        self._take()
+        if self._flusher is None:
+            self._flusher = threading.Thread(target=self._flush_queued, name="sqlite-flush", daemon=True)
+            self._flusher.start()
+
+    def _flush_queued(self) -> None:
+        try:
+            while True:
+                with self._lock:
+                    if not self._queued:
+                        self._flusher = None
+                        return
+                self._write_queued()
+        except Exception as e:
+            self._error = e
+            self._flusher = None
+
+    def wait(self) -> None:
+        """
+        Blocks until a running background write has finished.
+        """
+        flusher = self._flusher
+        if flusher is not None:
+            flusher.join()
+
+    def _raise_error(self) -> None:
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise Exception(f"Error writing in the background: {error}")
+
+    def flush(self) -> None:
+        """
+        Writes the pending changes in one transaction.
+        """
+        self._raise_error()
+        self._take()
+        self._write_queued()
+
+    def take_changes(self, tasks: TaskStore, filename: str) -> bool:
+        """
+        Queues the pending changes for write_changes.  Called while the lock of tasks is held.
+
+        :return: False if the database does not match the given tasks, which need a full save.
+        """
+        if tasks is not self._store or filename != self._database:
+            return False
+        self._take()
+        return True
+
+    def write_changes(self, filename: str) -> Tuple[int, int]:
+        """
+        Writes the changes queued by take_changes, and those of earlier changes, in one transaction.
+
+        :return: The number of rows written or deleted, and 0 bytes, because SQLite does not report them.
+        """
+        self._raise_error()
+        return self._write_queued(), 0
+
+    def save(self, tasks: List[Task], filename: str) -> Tuple[int, int]:
+        """
+        Writes pending changes, or rewrites the whole table when the database does not match the tasks.
+
+        :return: The number of rows written or deleted, and 0 bytes, because SQLite does not report them.
+        """
+        if not isinstance(filename, str):
+            raise TypeError("Filename must be a string.")
+        if self.take_changes(tasks, filename):
+            self._raise_error()
+            return self._write_queued(), 0
+        try:
+            bound = tasks is self._store
+            with self._write_lock:
+                with self.pool(filename).transaction() as connection:
+                    for statement in SCHEMA.split(";"):
+                        if statement.strip():
+                            connection.execute(statement)
+                    connection.execute("DELETE FROM tasks")
+                    connection.executemany(UPSERT, (self._row(tasks.id_at(slot) if bound else slot + 1, task, slot + 1.0)
+                                                    for slot, task in enumerate(tasks)))
+                if bound:
+                    self._database = filename
+                    self._positions = array("d", range(1, len(tasks) + 1))
+                    with self._lock:
+                        self._upserts, self._deletes = {}, set()
+                        self._queued = []
+            return len(tasks), 0
+        except sqlite3.Error as e:
+            raise Exception(f"Error saving to database: {e}")
+
+    def load(self, filename: str) -> TaskStore:
+        """
+        Loads the tasks of a database in position order, keeping their ids.
+
+        :param filename: The path of the database file.
+        """
+        if not os.path.exists(filename):
+            raise FileNotFoundError(filename)
+        tasks = TaskStore()
+        positions = array("d")
+        with self.pool(filename).connection() as connection:
+            rows = connection.execute("SELECT id, description, is_done, priority, deadline, position FROM tasks ORDER BY position")
+            for task_id, description, is_done, priority, deadline, position in rows:
+                tasks.append(Task(description, bool(is_done), priority,
+                                  datetime.date.fromisoformat(deadline) if deadline else None), task_id)
+                positions.append(position)
+        self._adopt = (filename, positions)
+        return tasks
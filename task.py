@@ -1,12 +1,26 @@
 #This module defines the Task class.
 
 import datetime
+import functools
 from typing import Optional
 
+PRIORITY_NAMES = {1: "High", 2: "Medium", 3: "Low"}
+
+
+@functools.lru_cache(maxsize=4096)
+def format_deadline(deadline: datetime.date) -> str:
+    """
+    Formats a deadline as YYYY-MM-DD.  Cached, because strftime is slow and saving repeats the same dates.
+    """
+    return deadline.strftime("%Y-%m-%d")
+
+
 class Task:
     """
     Represents a task in the to-do list.
     """
+    __slots__ = ("description", "is_done", "priority", "deadline")
+
     def __init__(self, description: str, is_done: bool = False, priority: Optional[int] = None, deadline: Optional[datetime.date] = None):
         """
         Initializes a Task object.
@@ -42,8 +56,8 @@ class Task:
         """
         Returns a string representation of the task.
         """
-        priority_str = "High" if self.priority == 1 else "Medium" if self.priority == 2 else "Low" if self.priority == 3 else "None"
-        deadline_str = self.deadline.strftime("%Y-%m-%d") if self.deadline else "None"
+        priority_str = PRIORITY_NAMES.get(self.priority, "None")
+        deadline_str = format_deadline(self.deadline) if self.deadline else "None"
         return f"[{'X' if self.is_done else ' '}] {self.description} | Priority: {priority_str} | Deadline: {deadline_str}"
 
     def __eq__(self, other: object) -> bool:
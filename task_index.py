@@ -0,0 +1,160 @@
+#This module defines the TaskIndex class, which keeps secondary indexes over a TaskStore for fast queries.
+
+import bisect
+import datetime
+import itertools
+from array import array
+from typing import Dict, Iterable, Iterator, Optional, Set
+from task import Task
+from task_store import DONE_FLAG, PRIORITY_MASK, TaskStore, TaskStoreListener, TaskView
+
+ANY = object()  # matches every value in TaskIndex.find
+ID_BITS = 40  # deadline keys are (ordinal << ID_BITS) | task id
+
+
+class TaskIndex(TaskStoreListener):
+    """
+    Indexes the tasks of a TaskStore by deadline, priority and completion state.
+
+    The deadline index is a sorted array of (ordinal, id) keys, so date ranges are found with bisect.
+    Priorities and completion states map to sets of task ids.  The indexes are updated on every change
+    to the store.  New deadline keys are collected in a set and merged into the array by the next
+    deadline query, so adding many tasks costs one sort instead of one array insertion per task.
+    """
+    def __init__(self, store: TaskStore):
+        """
+        Builds the indexes and subscribes to changes of the store.
+
+        :param store: The store to index.
+        """
+        self._store = store
+        self._deadlines = array("q")
+        self._pending: Set[int] = set()  # deadline keys not yet merged into _deadlines
+        self._priorities: Dict[Optional[int], Set[int]] = {}
+        self._done: Dict[bool, Set[int]] = {}
+        self.tasks_reset(store)
+        store.subscribe(self)
+
+    def close(self) -> None:
+        """
+        Stops updating the indexes.
+        """
+        self._store.unsubscribe(self)
+
+    @staticmethod
+    def _deadline_key(ordinal: int, task_id: int) -> int:
+        return ordinal << ID_BITS | task_id
+
+    def _add(self, task_id: int, flags: int, ordinal: int) -> None:
+        self._priorities[flags & PRIORITY_MASK or None].add(task_id)
+        self._done[bool(flags & DONE_FLAG)].add(task_id)
+        if ordinal:
+            self._pending.add(self._deadline_key(ordinal, task_id))
+
+    def _remove(self, task_id: int, priority: Optional[int], is_done: bool, ordinal: int) -> None:
+        self._priorities[priority].discard(task_id)
+        self._done[is_done].discard(task_id)
+        if ordinal:
+            key = self._deadline_key(ordinal, task_id)
+            if key in self._pending:
+                self._pending.discard(key)
+                return
+            position = bisect.bisect_left(self._deadlines, key)
+            if position < len(self._deadlines) and self._deadlines[position] == key:
+                del self._deadlines[position]
+
+    def task_added(self, store: TaskStore, slot: int) -> None:
+        self._add(store._ids[slot], store._flags[slot], store._deadlines[slot])
+
+    def task_updated(self, store: TaskStore, slot: int, old: Task) -> None:
+        task_id = store._ids[slot]
+        self._remove(task_id, old.priority, old.is_done, old.deadline.toordinal() if old.deadline else 0)
+        self._add(task_id, store._flags[slot], store._deadlines[slot])
+
+    def task_deleting(self, store: TaskStore, slot: int) -> None:
+        flags = store._flags[slot]
+        self._remove(store._ids[slot], flags & PRIORITY_MASK or None, bool(flags & DONE_FLAG), store._deadlines[slot])
+
+    def tasks_reset(self, store: TaskStore) -> None:
+        self._priorities = {None: set(), 1: set(), 2: set(), 3: set()}
+        self._done = {False: set(), True: set()}
+        for task_id, flags in zip(store._ids, store._flags):
+            self._priorities[flags & PRIORITY_MASK or None].add(task_id)
+            self._done[bool(flags & DONE_FLAG)].add(task_id)
+        self._deadlines = array("q", sorted(self._deadline_key(ordinal, task_id)
+                                            for task_id, ordinal in zip(store._ids, store._deadlines) if ordinal))
+        self._pending = set()
+
+    def _merge_pending(self) -> None:
+        if len(self._pending) < 64:
+            for key in self._pending:
+                bisect.insort(self._deadlines, key)
+        else:  # the sort finds the existing array as one sorted run and merges the new keys into it
+            self._deadlines = array("q", sorted(itertools.chain(self._deadlines, self._pending)))
+        self._pending = set()
+
+    def _deadline_range(self, due_after: Optional[datetime.date], due_before: Optional[datetime.date]) -> range:
+        if self._pending:
+            self._merge_pending()
+        low = 0 if due_after is None else bisect.bisect_left(self._deadlines, self._deadline_key(due_after.toordinal() + 1, 0))
+        high = len(self._deadlines) if due_before is None else bisect.bisect_left(self._deadlines, self._deadline_key(due_before.toordinal(), 0))
+        return range(low, max(low, high))
+
+    def find(self, priority=ANY, due_before: Optional[datetime.date] = None, due_after: Optional[datetime.date] = None,
+             done: Optional[bool] = None) -> Iterator[TaskView]:
+        """
+        Lazily yields the tasks matching all given conditions.
+
+        The smallest matching index drives the search and the other conditions are checked per candidate.
+        Results come in deadline order when a deadline condition is the most selective, otherwise in no
+        particular order.  The store must not be changed while the iterator is in use.
+
+        :param priority: The priority (1-3, or None for tasks without one).  ANY matches every priority.
+        :param due_before: Only tasks with a deadline strictly before this date.
+        :param due_after: Only tasks with a deadline strictly after this date.
+        :param done: The completion state.  None matches both.
+        """
+        if priority is not ANY and priority is not None and not isinstance(priority, int):
+            raise TypeError("Priority must be an integer or None.")
+        if priority is not ANY and priority is not None and not 1 <= priority <= 3:
+            raise ValueError("Priority must be between 1 and 3.")
+        for name, value in (("due_before", due_before), ("due_after", due_after)):
+            if value is not None and not isinstance(value, datetime.date):
+                raise TypeError(f"{name} must be a datetime.date object or None.")
+        if done is not None and not isinstance(done, bool):
+            raise TypeError("done must be a boolean or None.")
+        return self._find(priority, due_before, due_after, done)
+
+    def _find(self, priority, due_before, due_after, done) -> Iterator[TaskView]:
+        candidates: Optional[Iterable[int]] = None  # None means every task
+        size = len(self._store)
+        if priority is not ANY and len(self._priorities[priority]) < size:
+            candidates, size = self._priorities[priority], len(self._priorities[priority])
+        if done is not None and len(self._done[done]) < size:
+            candidates, size = self._done[done], len(self._done[done])
+        by_deadline = due_before is not None or due_after is not None
+        if by_deadline:
+            deadline_range = self._deadline_range(due_after, due_before)
+            if len(deadline_range) <= size:
+                candidates = (self._deadlines[position] & ((1 << ID_BITS) - 1) for position in deadline_range)
+                by_deadline = False
+        low = due_after.toordinal() if due_after is not None else 0
+        high = due_before.toordinal() if due_before is not None else None
+        priorities = self._priorities[priority] if priority is not ANY else None
+        states = self._done[done] if done is not None else None
+        if candidates is None:
+            pairs = zip(self._store._ids, range(len(self._store)))
+        else:
+            pairs = ((task_id, None) for task_id in candidates)
+        for task_id, slot in pairs:
+            if priorities is not None and task_id not in priorities:
+                continue
+            if states is not None and task_id not in states:
+                continue
+            if slot is None:
+                slot = self._store.slot_of(task_id)
+            if by_deadline:
+                ordinal = self._store._deadlines[slot]
+                if not ordinal or ordinal <= low or (high is not None and ordinal >= high):
+                    continue
+            yield TaskView(self._store, slot)
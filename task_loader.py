@@ -0,0 +1,131 @@
+#This module defines streaming loaders for the task files written by the TaskSaver strategies.
+
+import csv
+import datetime
+import functools
+import itertools
+import os
+from typing import Iterator, List, Optional, Sequence, Tuple
+from task import Task
+from task_store import TaskStore
+
+HEADER = ["is_done", "description", "priority", "deadline"]
+DEFAULT_CHUNK_SIZE = 10000
+
+
+def file_stamp(filename: str) -> Optional[Tuple[int, int, int]]:
+    """
+    Returns the size, modification time in nanoseconds and inode number of a file, or None if it does not exist.
+
+    Savers replace files with a new inode, so a rewrite is noticed even within the resolution of the clock.
+    """
+    try:
+        stat = os.stat(filename)
+    except FileNotFoundError:
+        return None
+    return stat.st_size, stat.st_mtime_ns, stat.st_ino
+
+
+@functools.lru_cache(maxsize=4096)
+def parse_deadline(value: str) -> Optional[datetime.date]:
+    """
+    Parses a deadline field.  Results are cached because large lists share few distinct dates.
+
+    :param value: The deadline as written by a saver ("YYYY-MM-DD" or "None").
+    :return: The parsed date, or None.
+    """
+    if value == "None":
+        return None
+    if len(value) == 10 and value[4] == "-" and value[7] == "-":
+        return datetime.date.fromisoformat(value)
+    return datetime.datetime.strptime(value, "%Y-%m-%d").date()
+
+
+def parse_row(row: Sequence[str]) -> Task:
+    """
+    Builds a Task from the four fields of a saved row.
+
+    :param row: The is_done, description, priority and deadline fields.
+    :return: The parsed task.
+    """
+    is_done, description, priority, deadline = row
+    return Task(description,
+                is_done == "X",
+                int(priority) if priority != "None" else None,
+                parse_deadline(deadline))
+
+
+def split_line(line: str) -> List[str]:
+    """
+    Splits a line written by TextTaskSaver into its fields.  Descriptions are written unquoted, so fields
+    between the first and the last two are rejoined into the description.
+
+    :param line: The line without its line break.
+    """
+    row = line.split(",")
+    if len(row) > 4:
+        row = [row[0], ",".join(row[1:-2]), row[-2], row[-1]]
+    return row
+
+
+def iter_tasks(filename: str) -> Iterator[Task]:
+    """
+    Lazily yields the tasks stored in a file, one row at a time.
+
+    Understands the quoting written by CSVSaver.  Rows without a header (TextTaskSaver output) are
+    read one line at a time with split_line.  Invalid rows are reported and skipped.
+
+    :param filename: The name of the file to read.
+    """
+    with open(filename, "r", newline="") as f:
+        first_line = f.readline()
+        if next(csv.reader([first_line]), None) == HEADER:
+            reader = csv.reader(f)
+            rows = ((reader.line_num + 1, row) for row in reader)
+        else:
+            rows = ((number, split_line(line.rstrip("\r\n")) if line.strip() else [])
+                    for number, line in enumerate(itertools.chain([first_line], f), 1))
+        for number, row in rows:
+            if not row:
+                continue
+            if len(row) != 4:
+                print(f"Skipping invalid line {number}: {','.join(row)}")
+                continue
+            try:
+                yield parse_row(row)
+            except (TypeError, ValueError) as e:
+                print(f"Skipping invalid line {number}: {e}")
+
+
+def iter_task_chunks(filename: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[List[Task]]:
+    """
+    Yields the tasks stored in a file in lists of at most chunk_size tasks.
+
+    :param filename: The name of the file to read.
+    :param chunk_size: The maximum number of tasks per chunk.
+    """
+    if not isinstance(chunk_size, int):
+        raise TypeError("Chunk size must be an integer.")
+    if chunk_size < 1:
+        raise ValueError("Chunk size must be positive.")
+    tasks = iter_tasks(filename)
+    while True:
+        chunk = list(itertools.islice(tasks, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def load_store(filename: str) -> TaskStore:
+    """
+    Reads a whole file into a TaskStore.  A missing file gives an empty store.
+
+    Used as the worker of TodoListManager.load_many: the store is sent back to the parent process as
+    compact columns rather than as Task objects.
+
+    :param filename: The name of the file to read.
+    """
+    try:
+        return TaskStore(iter_tasks(filename))
+    except FileNotFoundError:
+        return TaskStore()
@@ -0,0 +1,66 @@
+#This module defines the TaskRenderer class, which renders the lines of the to-do list with a per-task cache.
+
+from typing import Dict, Iterator, Optional
+from task import Task
+from task_store import TaskStore, TaskStoreListener, TaskView
+
+
+class TaskRenderer(TaskStoreListener):
+    """
+    Renders tasks of a TaskStore as numbered lines, caching the text of each task by its id.
+
+    A cached entry is dropped only when its task changes or is deleted, so re-rendering after a single
+    change formats a single task.  The numbers are added per call because they shift on deletion.
+    """
+    def __init__(self, store: TaskStore):
+        """
+        Subscribes to changes of the store.
+
+        :param store: The store to render.
+        """
+        self._store = store
+        self._cache: Dict[int, str] = {}
+        store.subscribe(self)
+
+    def close(self) -> None:
+        """
+        Stops tracking the store and drops the cache.
+        """
+        self._store.unsubscribe(self)
+        self._cache = {}
+
+    def task_updated(self, store: TaskStore, slot: int, old: Task) -> None:
+        self._cache.pop(store.id_at(slot), None)
+
+    def task_deleting(self, store: TaskStore, slot: int) -> None:
+        self._cache.pop(store.id_at(slot), None)
+
+    def tasks_reset(self, store: TaskStore) -> None:
+        self._cache = {}
+
+    def render(self, slot: int) -> str:
+        """
+        Returns the text of the task at a position, without its number.
+
+        :param slot: The position of the task.
+        """
+        task_id = self._store.id_at(slot)
+        text = self._cache.get(task_id)
+        if text is None:
+            text = self._cache[task_id] = str(TaskView(self._store, slot))
+        return text
+
+    def lines(self, offset: int = 0, limit: Optional[int] = None) -> Iterator[str]:
+        """
+        Yields numbered lines ("1. [ ] ...") for the tasks in a page of the list.
+
+        :param offset: The position of the first task.
+        :param limit: The maximum number of tasks; by default all remaining tasks.
+        """
+        stop = len(self._store) if limit is None else min(len(self._store), offset + limit)
+        cache = self._cache
+        for slot in range(offset, stop):
+            text = cache.get(self._store._ids[slot])
+            if text is None:
+                text = self.render(slot)
+            yield f"{slot + 1}. {text}"
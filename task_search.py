@@ -0,0 +1,314 @@
+#This module defines the TaskSearchIndex class, an inverted index for full-text and prefix search on task descriptions.
+
+import bisect
+import functools
+import hashlib
+import heapq
+import itertools
+import math
+import re
+import struct
+import sys
+from array import array
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from task import Task
+from task_store import TaskStore, TaskStoreListener, TaskView
+
+SUFFIX = ".search"  # the index of a saved list is kept in filename + SUFFIX
+MAGIC = b"TODOIDX2"
+# File layout: header, then per term its header, its UTF-8 text and its posting list as uint32 positions.
+HEADER = struct.Struct("<8s16sQI")  # magic, digest of the saver's version of the list, number of tasks, number of terms
+TERM = struct.Struct("<HI")  # length of the term in bytes, number of positions
+
+MAX_SUBSET_WORDS = 6  # longer queries with a limit score every match instead of visiting word subsets
+
+_WORD = re.compile(r"\w+")
+
+
+@functools.lru_cache(maxsize=65536)
+def tokenize(text: str) -> Tuple[str, ...]:
+    """
+    Splits text into lowercase words, each listed once, in order of first appearance.
+    """
+    return tuple(dict.fromkeys(_WORD.findall(text.casefold())))
+
+
+class TaskSearchIndex(TaskStoreListener):
+    """
+    Maps every word of the task descriptions in a TaskStore to the sorted ids of the tasks using it.
+
+    A sorted vocabulary makes prefix lookups a bisection.  Multi-word queries return tasks matching any
+    word, tasks matching more words first, then by the summed inverse document frequency of the matched
+    words, so rare words count more than common ones.  The index is updated on every change to the store.
+    """
+    def __init__(self, store: TaskStore, build: bool = True):
+        """
+        Subscribes to changes of the store.
+
+        :param store: The store to index.
+        :param build: Whether to index the current contents.  load passes False and fills the index itself.
+        """
+        self._store = store
+        self._postings: Dict[str, array] = {}
+        self._vocabulary: List[str] = []
+        if build:
+            self.tasks_reset(store)
+        store.subscribe(self)
+
+    def close(self) -> None:
+        """
+        Stops updating the index.
+        """
+        self._store.unsubscribe(self)
+
+    def _add(self, task_id: int, description: str) -> None:
+        for term in tokenize(description):
+            postings = self._postings.get(term)
+            if postings is None:
+                self._postings[term] = array("q", [task_id])
+                bisect.insort(self._vocabulary, term)
+            elif postings[-1] < task_id:
+                postings.append(task_id)
+            else:
+                postings.insert(bisect.bisect_left(postings, task_id), task_id)
+
+    def _remove(self, task_id: int, description: str) -> None:
+        for term in tokenize(description):
+            postings = self._postings[term]
+            position = bisect.bisect_left(postings, task_id)
+            if position < len(postings) and postings[position] == task_id:
+                del postings[position]
+            if not postings:
+                del self._postings[term]
+                del self._vocabulary[bisect.bisect_left(self._vocabulary, term)]
+
+    def task_added(self, store: TaskStore, slot: int) -> None:
+        self._add(store._ids[slot], store._descriptions[slot])
+
+    def task_updated(self, store: TaskStore, slot: int, old: Task) -> None:
+        if old.description != store._descriptions[slot]:
+            self._remove(store._ids[slot], old.description)
+            self._add(store._ids[slot], store._descriptions[slot])
+
+    def task_deleting(self, store: TaskStore, slot: int) -> None:
+        self._remove(store._ids[slot], store._descriptions[slot])
+
+    def tasks_reset(self, store: TaskStore) -> None:
+        lists: Dict[str, List[int]] = {}
+        for task_id, description in zip(store._ids, store._descriptions):
+            for term in tokenize(description):
+                ids = lists.get(term)
+                if ids is None:
+                    lists[term] = [task_id]
+                else:
+                    ids.append(task_id)
+        ordered = all(a < b for a, b in zip(store._ids, store._ids[1:]))
+        self._postings = {term: array("q", ids if ordered else sorted(ids)) for term, ids in lists.items()}
+        self._vocabulary = sorted(self._postings)
+
+    def _expand(self, prefix: str) -> List[str]:
+        start = bisect.bisect_left(self._vocabulary, prefix)
+        stop = bisect.bisect_left(self._vocabulary, prefix + "\U0010ffff")
+        return self._vocabulary[start:stop]
+
+    def complete(self, prefix: str, limit: int = 10) -> List[str]:
+        """
+        Returns the indexed words starting with prefix, the most used first.
+
+        :param prefix: The beginning of a word; it is lowercased like the descriptions.
+        :param limit: The maximum number of words.
+        """
+        if not isinstance(prefix, str):
+            raise TypeError("Prefix must be a string.")
+        terms = self._expand(prefix.casefold())
+        return heapq.nsmallest(limit, terms, key=lambda term: (-len(self._postings[term]), term))
+
+    def search_ids(self, query: str, limit: Optional[int] = None, prefix: bool = False) -> List[int]:
+        """
+        Returns the ids of the tasks matching any word of a query, best matches first.
+
+        :param query: The words to look for.
+        :param limit: The maximum number of results; by default all.
+        :param prefix: Whether the last word of the query also matches longer words starting with it,
+                       as needed while the user is still typing.
+        """
+        if not isinstance(query, str):
+            raise TypeError("Query must be a string.")
+        if limit is not None and not isinstance(limit, int):
+            raise TypeError("Limit must be an integer or None.")
+        if limit is not None and limit < 0:
+            raise ValueError("Limit cannot be negative.")
+        terms = tokenize(query)
+        groups: List[List[array]] = []  # the posting lists matching each query word
+        for position, term in enumerate(terms):
+            if prefix and position == len(terms) - 1:
+                groups.append([self._postings[word] for word in self._expand(term)])
+            elif term in self._postings:
+                groups.append([self._postings[term]])
+        groups = [group for group in groups if group]
+        if not groups:
+            return []
+        if len(groups) == 1:
+            # One word: every match scores the same, so the matches come in id order without scoring.
+            return list(itertools.islice(_iterate(groups[0]), limit))
+        total = max(len(self._store), 1)
+        # A prefix counts as one word used as often as all the words it expands to together.
+        weights = [math.log(1 + total / sum(len(postings) for postings in group)) for group in groups]
+        if limit is None or len(groups) > MAX_SUBSET_WORDS:
+            return self._score_all(groups, weights, limit)
+        return self._best_by_subset(groups, weights, limit)
+
+    @staticmethod
+    def _score_all(groups: List[List[array]], weights: List[float], limit: Optional[int]) -> List[int]:
+        matched: Dict[int, int] = {}
+        scores: Dict[int, float] = {}
+        for group, weight in zip(groups, weights):
+            for task_id in (set().union(*group) if len(group) > 1 else group[0]):
+                matched[task_id] = matched.get(task_id, 0) + 1
+                scores[task_id] = scores.get(task_id, 0.0) + weight
+        key = lambda task_id: (-matched[task_id], -scores[task_id], task_id)
+        if limit is None:
+            return sorted(scores, key=key)
+        return heapq.nsmallest(limit, scores, key=key)
+
+    @staticmethod
+    def _best_by_subset(groups: List[List[array]], weights: List[float], limit: int) -> List[int]:
+        # The score of a task only depends on which query words it matches, so the subsets of words are
+        # visited from the best score down and each yields its tasks in id order, until limit are found.
+        def key(mask: int) -> Tuple[int, float]:
+            members = [position for position in range(len(groups)) if mask >> position & 1]
+            return -len(members), -sum(weights[position] for position in members)
+
+        def exactly(mask: int) -> Iterator[int]:
+            inside = [groups[position] for position in range(len(groups)) if mask >> position & 1]
+            outside = [groups[position] for position in range(len(groups)) if not mask >> position & 1]
+            driver = min(inside, key=lambda group: sum(len(postings) for postings in group))
+            others = [group for group in inside if group is not driver]
+            for task_id in _iterate(driver):
+                if all(_contains(group, task_id) for group in others) and not any(_contains(group, task_id) for group in outside):
+                    yield task_id
+
+        result: List[int] = []
+        masks = sorted(range(1, 1 << len(groups)), key=key)
+        for _, tied in itertools.groupby(masks, key=key):
+            result.extend(itertools.islice(heapq.merge(*(exactly(mask) for mask in tied)), limit - len(result)))
+            if len(result) >= limit:
+                break
+        return result
+
+    def search(self, query: str, limit: Optional[int] = None, prefix: bool = False) -> List[TaskView]:
+        """
+        Returns the tasks matching any word of a query, best matches first.  See search_ids.
+        """
+        return [TaskView(self._store, self._store.slot_of(task_id)) for task_id in self.search_ids(query, limit, prefix)]
+
+    def save(self, filename: str, version: tuple) -> None:
+        """
+        Writes the index next to the list file it was saved with, as filename + SUFFIX.
+
+        Tasks are stored by position, and the file records a digest of the list's version, so load can
+        tell whether the list was changed since.
+
+        :param filename: The name of the list file, which must already be written.
+        :param version: The version of the list as reported by TaskSaver.version after writing it.
+        """
+        from todo_list_manager import atomic_write  # todo_list_manager imports this module
+        try:
+            ids = self._store._ids
+            base = ids[0] if _contiguous(ids) else None
+            with atomic_write(filename + SUFFIX, mode="wb") as f:
+                f.write(HEADER.pack(MAGIC, _digest(version), len(self._store), len(self._vocabulary)))
+                for term in self._vocabulary:
+                    if base is not None:  # the usual case after loading or only appending: slot = id - base
+                        positions = array("I", [task_id - base for task_id in self._postings[term]])
+                    else:
+                        positions = array("I", sorted(self._store.slot_of(task_id) for task_id in self._postings[term]))
+                    if sys.byteorder == "big":
+                        positions.byteswap()
+                    encoded = term.encode("utf-8")
+                    f.write(TERM.pack(len(encoded), len(positions)))
+                    f.write(encoded)
+                    f.write(positions.tobytes())
+        except Exception as e:
+            raise Exception(f"Error saving search index: {e}")
+
+    @classmethod
+    def load(cls, store: TaskStore, filename: str, version: tuple) -> Optional["TaskSearchIndex"]:
+        """
+        Reads the index saved next to a list file that has just been loaded into store.
+
+        :param store: The store holding the tasks of the list file.
+        :param filename: The name of the list file.
+        :param version: The version of the list as reported by TaskSaver.version.
+        :return: The index, or None if there is no index or the list changed since it was saved.
+        """
+        try:
+            with open(filename + SUFFIX, "rb") as f:
+                data = f.read()
+        except OSError:
+            return None
+        if len(data) < HEADER.size:
+            return None
+        magic, digest, count, term_count = HEADER.unpack_from(data)
+        if magic != MAGIC or (digest, count) != (_digest(version), len(store)):
+            return None
+        index = cls(store, build=False)
+        ids = store._ids
+        base = ids[0] if _contiguous(ids) else None
+        offset = HEADER.size
+        try:
+            for _ in range(term_count):
+                length, positions_count = TERM.unpack_from(data, offset)
+                offset += TERM.size
+                term = data[offset:offset + length].decode("utf-8")
+                offset += length
+                positions = array("I", data[offset:offset + 4 * positions_count])
+                offset += 4 * positions_count
+                if sys.byteorder == "big":
+                    positions.byteswap()
+                if base is not None:
+                    index._postings[term] = array("q", [base + slot for slot in positions])
+                else:
+                    index._postings[term] = array("q", sorted(ids[slot] for slot in positions))
+        except (struct.error, UnicodeDecodeError, ValueError, IndexError):
+            index.close()
+            return None
+        index._vocabulary = sorted(index._postings)
+        return index
+
+
+def _digest(version: tuple) -> bytes:
+    """
+    Condenses a list version into the 16 bytes stored in the index header.
+    """
+    return hashlib.blake2b(repr(version).encode("utf-8"), digest_size=16).digest()
+
+
+def _contiguous(ids: array) -> bool:
+    """
+    Tells whether ids are consecutive integers, as after loading a file or only appending tasks.
+    """
+    return not ids or (ids[-1] - ids[0] == len(ids) - 1 and all(a < b for a, b in zip(ids, ids[1:])))
+
+
+def _iterate(group: List[array]) -> Iterable[int]:
+    """
+    Yields the ids in the union of sorted posting lists, in order.
+    """
+    if len(group) == 1:
+        yield from group[0]
+        return
+    previous = None
+    for task_id in heapq.merge(*group):
+        if task_id != previous:
+            yield task_id
+            previous = task_id
+
+
+def _contains(group: List[array], task_id: int) -> bool:
+    for postings in group:
+        position = bisect.bisect_left(postings, task_id)
+        if position < len(postings) and postings[position] == task_id:
+            return True
+    return False
+
@@ -0,0 +1,407 @@
+#This module defines the TaskServer class, which serves a TodoListManager to local clients, and the TaskClient class.
+#
+#Usage:
+#    python -m task_server tasks.csv --socket /tmp/todo.sock
+#    python -m task_server tasks.csv --port 8765
+
+import argparse
+import asyncio
+import datetime
+import itertools
+import json
+import sys
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from journal_saver import JournalTaskSaver
+from task import Task
+from task_store import TaskStore
+from todo_list_manager import CSVSaver, TextTaskSaver, TodoListManager
+
+# Protocol: one JSON object per line in each direction.
+#   request:  {"id": 7, "op": "add", "args": {"description": "Buy milk", "priority": 1, "deadline": "2025-12-24"}}
+#   response: {"id": 7, "result": 42}  or  {"id": 7, "error": "ValueError: Description cannot be empty."}
+# Reads are answered in order as they arrive.  Mutations are answered once their batch has been saved, so
+# a client may see the answer to a later read before the answer to an earlier mutation.
+MUTATIONS = ("add", "done", "delete", "undo", "redo")
+READS = ("get", "list", "search", "next", "count", "stats")
+DEFAULT_MAX_BATCH = 1024
+STREAM_LIMIT = 2 ** 20  # the longest request line accepted, in bytes
+
+Pending = Tuple[str, Dict[str, Any], asyncio.Future]
+
+
+def _describe(error: Exception) -> str:
+    message = error.args[0] if len(error.args) == 1 else str(error)  # KeyError would quote its message
+    return f"{type(error).__name__}: {message}"
+
+
+def _task_json(store: TaskStore, slot: int) -> Dict[str, Any]:
+    task = store[slot]
+    return {"id": store.id_at(slot), "description": task.description, "is_done": task.is_done,
+            "priority": task.priority, "deadline": task.deadline.isoformat() if task.deadline else None}
+
+
+def _deadline(value: Optional[str]) -> Optional[datetime.date]:
+    if value is None:
+        return None
+    if not isinstance(value, str):
+        raise TypeError("Deadline must be a YYYY-MM-DD string or null.")
+    return datetime.date.fromisoformat(value)
+
+
+class TaskServer:
+    """
+    Serves a TodoListManager over a Unix socket or loopback TCP with a JSON-lines protocol.
+
+    Everything runs on one event loop, so requests never race each other.  Mutations are queued and
+    applied in batches: a batch takes every mutation that arrived while the previous batch was being
+    saved, applies consecutive requests of the same kind with one bulk call (add_tasks, mark_done_many,
+    delete_many) and then saves the list once, on a worker thread, with the manager's TaskSaver.  A
+    mutation is answered after the save, so an acknowledged change is on disk, and the number of writes
+    grows with the number of batches rather than the number of requests.  Reads keep being served
+    during a save, because nothing changes the list until it finishes.  With JournalTaskSaver each
+    save appends only the batch's changes.
+    """
+    def __init__(self, manager: TodoListManager, filename: Optional[str] = None, max_batch: int = DEFAULT_MAX_BATCH):
+        """
+        Initializes the server.  The manager must not be changed by anything else while it is served.
+
+        :param manager: The manager to serve.
+        :param filename: The file every batch is saved to; None keeps the changes in memory only.
+        :param max_batch: The maximum number of mutations applied in one batch.
+        """
+        if not isinstance(manager, TodoListManager):
+            raise TypeError("Manager must be a TodoListManager.")
+        if filename is not None and not isinstance(filename, str):
+            raise TypeError("Filename must be a string or None.")
+        if not isinstance(max_batch, int):
+            raise TypeError("Maximum batch size must be an integer.")
+        if max_batch < 1:
+            raise ValueError("Maximum batch size must be positive.")
+        self.manager = manager
+        self.filename = filename
+        self.max_batch = max_batch
+        self._queue: Optional[asyncio.Queue] = None
+        self._batcher: Optional[asyncio.Task] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._connections: set = set()
+        self.stats = {"requests": 0, "mutations": 0, "batches": 0, "saves": 0}
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0, path: Optional[str] = None) -> None:
+        """
+        Starts listening.  The address is available as self.address afterwards.
+
+        :param host: The loopback address to listen on, when path is not given.
+        :param port: The TCP port; 0 picks a free one.
+        :param path: The path of a Unix socket to listen on instead of TCP.
+        """
+        self._queue = asyncio.Queue()
+        self._batcher = asyncio.ensure_future(self._run_batches())
+        if path is not None:
+            self._server = await asyncio.start_unix_server(self._serve, path, limit=STREAM_LIMIT)
+        else:
+            self._server = await asyncio.start_server(self._serve, host, port, limit=STREAM_LIMIT)
+
+    @property
+    def address(self):
+        """
+        The socket path, or the (host, port) pair, the server listens on.
+        """
+        return self._server.sockets[0].getsockname()
+
+    async def close(self) -> None:
+        """
+        Stops accepting connections, applies and saves the mutations already received, then stops.
+        """
+        if self._server is not None:
+            self._server.close()
+            for writer in list(self._connections):
+                writer.close()
+            await self._server.wait_closed()
+        if self._batcher is not None:
+            await self._queue.put(None)
+            await self._batcher
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self._connections.add(writer)
+        replies: List[asyncio.Task] = []
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except (ConnectionError, ValueError):  # reset, or a line longer than STREAM_LIMIT
+                    break
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                self.stats["requests"] += 1
+                request_id = None
+                try:
+                    request = json.loads(line)
+                    if not isinstance(request, dict):
+                        raise ValueError("Request must be a JSON object.")
+                    request_id, op, args = request.get("id"), request.get("op"), request.get("args") or {}
+                    if not isinstance(args, dict):
+                        raise TypeError("Args must be a JSON object.")
+                except (ValueError, TypeError) as e:
+                    self._reply(writer, request_id, error=e)
+                    await writer.drain()
+                    continue
+                if op in MUTATIONS:
+                    future = asyncio.get_running_loop().create_future()
+                    self._queue.put_nowait((op, args, future))
+                    reply = asyncio.ensure_future(self._reply_later(writer, request_id, future))
+                    replies.append(reply)
+                    reply.add_done_callback(replies.remove)
+                else:
+                    try:
+                        self._reply(writer, request_id, result=self._read(op, args))
+                    except Exception as e:
+                        self._reply(writer, request_id, error=e)
+                await writer.drain()
+            if replies:
+                await asyncio.wait(list(replies))
+        except ConnectionError:
+            pass
+        finally:
+            self._connections.discard(writer)
+            writer.close()
+
+    def _reply(self, writer: asyncio.StreamWriter, request_id, result=None, error: Optional[Exception] = None) -> None:
+        response = {"id": request_id, "error": _describe(error)} if error is not None else {"id": request_id, "result": result}
+        writer.write(json.dumps(response, separators=(",", ":")).encode("utf-8") + b"\n")
+
+    async def _reply_later(self, writer: asyncio.StreamWriter, request_id, future: asyncio.Future) -> None:
+        try:
+            result = await future
+        except Exception as e:
+            self._reply(writer, request_id, error=e)
+        else:
+            self._reply(writer, request_id, result=result)
+        try:
+            await writer.drain()
+        except ConnectionError:
+            pass
+
+    def _read(self, op: str, args: Dict[str, Any]):
+        manager = self.manager
+        store = manager.tasks
+        if op == "get":
+            return _task_json(store, store.slot_of(self._task_id(args)))
+        if op == "list":
+            return list(manager.iter_task_lines(args.get("offset", 0), args.get("limit")))
+        if op == "search":
+            views = manager.search(args.get("query", ""), args.get("limit"), args.get("prefix", False))
+            return [_task_json(store, view._slot) for view in views]
+        if op == "next":
+            return [_task_json(store, view._slot) for view in manager.next_tasks(args.get("k", 1))]
+        if op == "count":
+            return len(store)
+        if op == "stats":
+            return dict(self.stats)
+        raise ValueError(f"Unknown operation: {op}")
+
+    @staticmethod
+    def _task_id(args: Dict[str, Any]) -> int:
+        task_id = args.get("id")
+        if not isinstance(task_id, int) or isinstance(task_id, bool):
+            raise TypeError("Task id must be an integer.")
+        return task_id
+
+    async def _run_batches(self) -> None:
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            batch: List[Pending] = []
+            item = await self._queue.get()
+            while item is not None:
+                batch.append(item)
+                if len(batch) >= self.max_batch or self._queue.empty():
+                    break
+                item = self._queue.get_nowait()
+            stopping = item is None
+            if not batch:
+                continue
+            self.stats["batches"] += 1
+            self.stats["mutations"] += len(batch)
+            applied = self._apply(batch)
+            if applied and self.filename is not None:
+                try:
+                    await loop.run_in_executor(None, self.manager.save_to_file, self.filename)
+                    self.stats["saves"] += 1
+                except Exception as e:
+                    # The changes stay applied in memory; the clients learn that they were not saved.
+                    applied = [(future, Exception(f"Error saving batch: {e}")) for future, _ in applied]
+            for future, result in applied:
+                if future.cancelled():
+                    continue
+                if isinstance(result, Exception):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
+
+    def _apply(self, batch: List[Pending]) -> List[Tuple[asyncio.Future, Any]]:
+        """
+        Applies a batch, answering invalid requests at once, and returns the futures of the applied ones with their results.
+        """
+        applied: List[Tuple[asyncio.Future, Any]] = []
+        for op, run in itertools.groupby(batch, key=lambda pending: pending[0]):
+            checked: List[Tuple[Pending, Any]] = []
+            deleted = set()
+            for pending in run:
+                try:
+                    checked.append((pending, self._check(op, pending[1], deleted)))
+                except Exception as e:
+                    pending[2].set_exception(e)
+            if not checked:
+                continue
+            values = [value for _, value in checked]
+            try:
+                results = self._apply_run(op, values)
+            except Exception as e:  # checked above, so only an unexpected failure gets here
+                for pending, _ in checked:
+                    pending[2].set_exception(e)
+                continue
+            applied.extend((pending[2], result) for (pending, _), result in zip(checked, results))
+        return applied
+
+    def _check(self, op: str, args: Dict[str, Any], deleted: set):
+        if op == "add":
+            description = args.get("description")
+            task = Task(description, priority=args.get("priority"), deadline=_deadline(args.get("deadline")))
+            if not description:
+                raise ValueError("Description cannot be empty.")
+            return task
+        if op in ("done", "delete"):
+            task_id = self._task_id(args)
+            if task_id in deleted:
+                raise KeyError(f"Unknown task id: {task_id}")
+            self.manager.tasks.slot_of(task_id)
+            if op == "delete":
+                deleted.add(task_id)
+            return task_id
+        return None
+
+    def _apply_run(self, op: str, values: List[Any]) -> List[Any]:
+        manager = self.manager
+        if op == "add":
+            return manager.add_tasks(values)
+        if op == "done":
+            manager.mark_done_many(values)
+            return [None] * len(values)
+        if op == "delete":
+            manager.delete_many(values)
+            return [None] * len(values)
+        undo = manager.undo if op == "undo" else manager.redo
+        return [undo() for _ in values]
+
+
+class TaskClient:
+    """
+    A client for TaskServer.  Requests may be pipelined: several can be awaited at once on one connection.
+    """
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self._reader = reader
+        self._writer = writer
+        self._ids = itertools.count()
+        self._waiting: Dict[int, asyncio.Future] = {}
+        self._receiver = asyncio.ensure_future(self._receive())
+
+    @classmethod
+    async def connect(cls, host: str = "127.0.0.1", port: int = 0, path: Optional[str] = None) -> "TaskClient":
+        """
+        Connects to a server on a Unix socket if path is given, otherwise over TCP.
+        """
+        if path is not None:
+            reader, writer = await asyncio.open_unix_connection(path, limit=STREAM_LIMIT)
+        else:
+            reader, writer = await asyncio.open_connection(host, port, limit=STREAM_LIMIT)
+        return cls(reader, writer)
+
+    async def _receive(self) -> None:
+        error: Exception = ConnectionError("Connection closed by the server.")
+        try:
+            while True:
+                line = await self._reader.readline()
+                if not line:
+                    break
+                response = json.loads(line)
+                future = self._waiting.pop(response.get("id"), None)
+                if future is None or future.done():
+                    continue
+                if "error" in response:
+                    future.set_exception(Exception(f"Error from task server: {response['error']}"))
+                else:
+                    future.set_result(response.get("result"))
+        except Exception as e:
+            error = e
+        for future in self._waiting.values():
+            if not future.done():
+                future.set_exception(error)
+        self._waiting.clear()
+
+    async def request(self, op: str, **args):
+        """
+        Sends one request and returns its result.  A server-side error is raised as an Exception.
+
+        :param op: The operation, one of MUTATIONS or READS.
+        :param args: The arguments of the operation.
+        """
+        if self._receiver.done():
+            raise ConnectionError("Connection closed by the server.")
+        request_id = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        self._waiting[request_id] = future
+        self._writer.write(json.dumps({"id": request_id, "op": op, "args": args}, separators=(",", ":")).encode("utf-8") + b"\n")
+        await self._writer.drain()
+        return await future
+
+    async def close(self) -> None:
+        """
+        Closes the connection.
+        """
+        self._writer.close()
+        try:
+            await self._writer.wait_closed()
+        except ConnectionError:
+            pass
+        self._receiver.cancel()
+
+
+SAVERS: Dict[str, Callable[[], Any]] = {"csv": CSVSaver, "text": TextTaskSaver, "journal": JournalTaskSaver}
+
+
+async def serve(filename: str, saver: str = "csv", host: str = "127.0.0.1", port: int = 0,
+                path: Optional[str] = None, max_batch: int = DEFAULT_MAX_BATCH) -> None:
+    """
+    Loads a task file and serves it until cancelled.
+    """
+    manager = TodoListManager(SAVERS[saver]())
+    manager.load_from_file(filename)
+    server = TaskServer(manager, filename, max_batch)
+    await server.start(host, port, path)
+    print(f"Serving {len(manager.tasks)} tasks from {filename} on {server.address}", flush=True)
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.close()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Serve a to-do list to local clients.")
+    parser.add_argument("filename", help="the task file, loaded at start and saved after every batch")
+    parser.add_argument("--saver", choices=list(SAVERS), default="csv")
+    parser.add_argument("--socket", help="listen on this Unix socket instead of TCP")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--max-batch", type=int, default=DEFAULT_MAX_BATCH)
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.filename, args.saver, args.host, args.port, args.socket, args.max_batch))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,488 @@
+#This module defines the TaskStore class, a compact column-oriented container for tasks.
+
+import bisect
+import datetime
+import functools
+import itertools
+import sys
+import threading
+from array import array
+from collections.abc import MutableSequence, Sequence
+from typing import Dict, Iterable, Iterator, List, Optional, Union
+from task import Task
+
+DONE_FLAG = 0b100
+PRIORITY_MASK = 0b011
+
+
+def _locked(method):
+    """
+    Runs a TaskStore method while holding the store's lock.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
+class TaskStoreListener:
+    """
+    Receives notifications about changes to a TaskStore.  Subclasses override the methods they need.
+    """
+    def task_added(self, store: "TaskStore", slot: int) -> None:
+        """Called after a task was inserted at slot."""
+
+    def task_updated(self, store: "TaskStore", slot: int, old: Task) -> None:
+        """Called after the task at slot changed; old holds its previous values."""
+
+    def task_deleting(self, store: "TaskStore", slot: int) -> None:
+        """Called before the task at slot is removed."""
+
+    def tasks_reset(self, store: "TaskStore") -> None:
+        """Called after the whole contents of the store were replaced."""
+
+
+class TaskView(Task):
+    """
+    A lightweight Task that reads and writes one row of a TaskStore.
+
+    Views refer to a position in the store, so they should not be kept across deletions.
+    """
+    __slots__ = ("_store", "_slot")
+
+    def __init__(self, store: "TaskStore", slot: int):
+        """
+        Initializes a view of one row.
+
+        :param store: The store holding the task.
+        :param slot: The position of the task in the store.
+        """
+        self._store = store
+        self._slot = slot
+
+    @property
+    def description(self) -> str:
+        return self._store._descriptions[self._slot]
+
+    @description.setter
+    def description(self, value: str) -> None:
+        self._store[self._slot] = Task(value, self.is_done, self.priority, self.deadline)
+
+    @property
+    def is_done(self) -> bool:
+        return bool(self._store._flags[self._slot] & DONE_FLAG)
+
+    @is_done.setter
+    def is_done(self, value: bool) -> None:
+        self._store[self._slot] = Task(self.description, value, self.priority, self.deadline)
+
+    @property
+    def priority(self) -> Optional[int]:
+        return self._store._flags[self._slot] & PRIORITY_MASK or None
+
+    @priority.setter
+    def priority(self, value: Optional[int]) -> None:
+        self._store[self._slot] = Task(self.description, self.is_done, value, self.deadline)
+
+    @property
+    def deadline(self) -> Optional[datetime.date]:
+        ordinal = self._store._deadlines[self._slot]
+        return datetime.date.fromordinal(ordinal) if ordinal else None
+
+    @deadline.setter
+    def deadline(self, value: Optional[datetime.date]) -> None:
+        self._store[self._slot] = Task(self.description, self.is_done, self.priority, value)
+
+    def mark_as_done(self) -> None:
+        """
+        Marks the task as done in the store.
+        """
+        self._store.mark_done(self._slot)
+
+
+class TaskStore(MutableSequence):
+    """
+    Stores tasks column by column instead of as a list of Task objects.
+
+    Descriptions are interned, priority and completion share one byte per task and
+    deadlines are kept as date ordinals (0 means no deadline).  Items are handed out as TaskView objects.
+
+    Every row also gets an id that stays the same while other rows are inserted or deleted.  New ids grow,
+    so while rows are only appended and deleted the id column stays sorted and ids are found by bisection
+    without any extra memory.  Inserting a row out of order switches to an id-to-slot dict, which is
+    repaired lazily: a deletion only records the lowest slot whose entries may be stale.
+
+    Changes and copies hold a reentrant lock, so another thread can take a consistent copy at any time.
+    Listeners are called while the lock is held.
+    """
+    def __init__(self, tasks: Iterable[Task] = ()):
+        """
+        Initializes the store.
+
+        :param tasks: The tasks to store initially.
+        """
+        self._descriptions: List[str] = []
+        self._flags = bytearray()
+        self._deadlines = array("i")
+        self._ids = array("q")
+        self._next_id = 1
+        self._slot_of: Optional[Dict[int, int]] = None  # only used once the ids are out of order
+        self._stale_from = 0  # map entries for slots from here on may be out of date
+        self._listeners: List[TaskStoreListener] = []
+        self._lock = threading.RLock()
+        self.extend(tasks)
+
+    @_locked
+    def subscribe(self, listener: TaskStoreListener) -> None:
+        """
+        Registers a listener for changes to the store.
+
+        :param listener: The listener to notify.
+        """
+        if not isinstance(listener, TaskStoreListener):
+            raise TypeError("Listener must be a TaskStoreListener.")
+        self._listeners.append(listener)
+
+    @_locked
+    def unsubscribe(self, listener: TaskStoreListener) -> None:
+        """
+        Removes a listener registered with subscribe.
+
+        :param listener: The listener to remove.
+        """
+        self._listeners.remove(listener)
+
+    @staticmethod
+    def _encode(task: Task) -> tuple:
+        if not isinstance(task, Task):
+            raise TypeError("Only Task objects can be stored.")
+        flags = (task.priority or 0) | (DONE_FLAG if task.is_done else 0)
+        deadline = task.deadline.toordinal() if task.deadline else 0
+        return sys.intern(task.description), flags, deadline
+
+    def _slot(self, index: int) -> int:
+        if not isinstance(index, int):
+            raise TypeError("Index must be an integer.")
+        if index < 0:
+            index += len(self._flags)
+        if not 0 <= index < len(self._flags):
+            raise IndexError("Task index out of range.")
+        return index
+
+    def _add_id(self, slot: int, task_id: Optional[int] = None) -> None:
+        if task_id is None:
+            task_id = self._next_id
+        self._next_id = max(self._next_id, task_id + 1)
+        ids = self._ids
+        ids.insert(slot, task_id)
+        if self._slot_of is None:
+            if (slot == 0 or ids[slot - 1] < task_id) and (slot == len(ids) - 1 or task_id < ids[slot + 1]):
+                return
+            self._slot_of = dict(zip(ids, range(len(ids))))
+            self._stale_from = len(ids)
+            return
+        self._slot_of[task_id] = slot
+        if slot < len(self._ids) - 1:
+            self._stale_from = min(self._stale_from, slot)
+        elif self._stale_from == slot:
+            self._stale_from += 1
+
+    def _has_id(self, task_id: int) -> bool:
+        try:
+            self.slot_of(task_id)
+        except KeyError:
+            return False
+        return True
+
+    def id_at(self, index: int) -> int:
+        """
+        Returns the id of the task at the given position.
+
+        :param index: The position of the task.
+        """
+        return self._ids[self._slot(index)]
+
+    def ids(self, start: int = 0, stop: Optional[int] = None) -> List[int]:
+        """
+        Returns the ids of the tasks between two positions.
+
+        :param start: The first position.
+        :param stop: The position after the last one; by default the end of the store.
+        """
+        return self._ids[start:stop].tolist()
+
+    @_locked
+    def slot_of(self, task_id: int) -> int:
+        """
+        Returns the current position of the task with the given id.
+
+        :param task_id: The id of the task.
+        """
+        if self._slot_of is None:
+            slot = bisect.bisect_left(self._ids, task_id)
+            if slot < len(self._ids) and self._ids[slot] == task_id:
+                return slot
+            raise KeyError(f"Unknown task id: {task_id}")
+        slot = self._slot_of.get(task_id)
+        if slot is None:
+            raise KeyError(f"Unknown task id: {task_id}")
+        if slot < len(self._ids) and self._ids[slot] == task_id:
+            return slot
+        for slot in range(self._stale_from, len(self._ids)):
+            self._slot_of[self._ids[slot]] = slot
+        self._stale_from = len(self._ids)
+        return self._slot_of[task_id]
+
+    def __len__(self) -> int:
+        return len(self._flags)
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[TaskView, List[TaskView]]:
+        if isinstance(index, slice):
+            return [TaskView(self, slot) for slot in range(*index.indices(len(self._flags)))]
+        return TaskView(self, self._slot(index))
+
+    def __iter__(self) -> Iterator[TaskView]:
+        for slot in range(len(self._flags)):
+            yield TaskView(self, slot)
+
+    @_locked
+    def __setitem__(self, index: int, task: Task) -> None:
+        slot = self._slot(index)
+        old = self.task_at(slot) if self._listeners else None
+        self._descriptions[slot], self._flags[slot], self._deadlines[slot] = self._encode(task)
+        for listener in self._listeners:
+            listener.task_updated(self, slot, old)
+
+    @_locked
+    def __delitem__(self, index: Union[int, slice]) -> None:
+        if isinstance(index, slice):
+            for slot in sorted(range(*index.indices(len(self._flags))), reverse=True):
+                del self[slot]
+            return
+        slot = self._slot(index)
+        for listener in self._listeners:
+            listener.task_deleting(self, slot)
+        del self._descriptions[slot]
+        del self._flags[slot]
+        del self._deadlines[slot]
+        if self._slot_of is not None:
+            del self._slot_of[self._ids[slot]]
+            self._stale_from = min(self._stale_from, slot)
+        del self._ids[slot]
+
+    def _check_new_id(self, task_id: int) -> None:
+        if not isinstance(task_id, int):
+            raise TypeError("Task id must be an integer.")
+        # While the ids are in order the last one is the largest, so larger ids need no lookup.
+        in_order = self._slot_of is None
+        if task_id < 1 or (self._ids and not (in_order and task_id > self._ids[-1]) and self._has_id(task_id)):
+            raise ValueError(f"Task id {task_id} is invalid or already in use.")
+
+    @_locked
+    def insert(self, index: int, task: Task, task_id: Optional[int] = None) -> None:
+        """
+        Inserts a task before the given position.
+
+        :param index: The position.
+        :param task: The task to insert.
+        :param task_id: The id to give the task, e.g. when restoring a deleted task.  By default the next free id.
+        """
+        if task_id is not None:
+            self._check_new_id(task_id)
+        description, flags, deadline = self._encode(task)
+        slot = min(max(index + len(self._flags) if index < 0 else index, 0), len(self._flags))
+        self._descriptions.insert(slot, description)
+        self._flags.insert(slot, flags)
+        self._deadlines.insert(slot, deadline)
+        self._add_id(slot, task_id)
+        for listener in self._listeners:
+            listener.task_added(self, slot)
+
+    @_locked
+    def append(self, task: Task, task_id: Optional[int] = None) -> None:
+        """
+        Adds a task at the end of the store.
+
+        :param task: The task to add.
+        :param task_id: The id to give the task, e.g. when restoring saved ids.  By default the next free id.
+        """
+        if task_id is not None:
+            self._check_new_id(task_id)
+        description, flags, deadline = self._encode(task)
+        self._descriptions.append(description)
+        self._flags.append(flags)
+        self._deadlines.append(deadline)
+        self._add_id(len(self._flags) - 1, task_id)
+        for listener in self._listeners:
+            listener.task_added(self, len(self._flags) - 1)
+
+    @_locked
+    def extend(self, tasks: Iterable[Task]) -> None:
+        """
+        Adds tasks at the end of the store, encoding them a chunk at a time.
+
+        :param tasks: The tasks to add.
+        """
+        if isinstance(tasks, TaskStore):
+            with tasks._lock:  # columns are copied as they are, without decoding any task
+                descriptions, flags, deadlines = list(tasks._descriptions), bytes(tasks._flags), tasks._deadlines[:]
+            start = len(self._flags)
+            self._descriptions += descriptions
+            self._flags += flags
+            self._deadlines += deadlines
+            self._added(start, len(flags))
+            return
+        tasks = iter(tasks)
+        intern = sys.intern
+        while True:
+            chunk = list(itertools.islice(tasks, 4096))
+            if not chunk:
+                break
+            if not all(isinstance(task, Task) for task in chunk):
+                raise TypeError("Only Task objects can be stored.")
+            start = len(self._flags)
+            self._descriptions += [intern(task.description) for task in chunk]
+            self._flags += bytes([(task.priority or 0) | (DONE_FLAG if task.is_done else 0) for task in chunk])
+            self._deadlines.fromlist([task.deadline.toordinal() if task.deadline else 0 for task in chunk])
+            self._added(start, len(chunk))
+
+    def _added(self, start: int, count: int) -> None:
+        """
+        Gives new ids to the count rows appended at start and tells the listeners about them.
+        """
+        ids = range(self._next_id, self._next_id + count)
+        self._ids.extend(ids)
+        self._next_id += count
+        if self._slot_of is not None:
+            self._slot_of.update(zip(ids, range(start, start + count)))
+            if self._stale_from == start:
+                self._stale_from = start + count
+        for slot in range(start, start + count):
+            for listener in self._listeners:
+                listener.task_added(self, slot)
+
+    @_locked
+    def delete_slots(self, slots: Iterable[int]) -> None:
+        """
+        Deletes the tasks at the given positions in one pass over the store.
+
+        Listeners are told about the deletions from the highest position down, so each position is
+        valid at the time it is reported.
+
+        :param slots: The positions to delete.  Duplicates are ignored.
+        """
+        slots = sorted({self._slot(slot) for slot in slots})
+        if not slots:
+            return
+        for slot in reversed(slots):
+            for listener in self._listeners:
+                listener.task_deleting(self, slot)
+        if self._slot_of is not None:
+            for slot in slots:
+                del self._slot_of[self._ids[slot]]
+            self._stale_from = min(self._stale_from, slots[0])
+        keep = [(previous + 1, slot) for previous, slot in zip([-1] + slots, slots + [len(self._flags)])]
+        self._descriptions = list(itertools.chain.from_iterable(self._descriptions[a:b] for a, b in keep))
+        self._flags = bytearray().join(self._flags[a:b] for a, b in keep)
+        self._deadlines = array("i", b"".join(self._deadlines[a:b].tobytes() for a, b in keep))
+        self._ids = array("q", b"".join(self._ids[a:b].tobytes() for a, b in keep))
+
+    def clear(self) -> None:
+        self.replace(())
+
+    @_locked
+    def replace(self, tasks: Iterable[Task]) -> None:
+        """
+        Replaces the contents of the store.  The new rows are encoded before the old ones are dropped,
+        so views of this store may be passed in.
+
+        :param tasks: The new tasks.  The ids of tasks given as a TaskStore are kept.
+        """
+        if isinstance(tasks, TaskStore):
+            new = tasks.copy()
+            new._next_id = max(new._next_id, self._next_id)
+        else:
+            new = TaskStore()
+            new._next_id = self._next_id
+            new.extend(tasks)
+        self._adopt_columns(new)
+        for listener in self._listeners:
+            listener.tasks_reset(self)
+
+    @_locked
+    def copy(self) -> "TaskStore":
+        """
+        Returns an independent copy of the store without its listeners.
+        """
+        copy = TaskStore()
+        copy._adopt_columns(self)
+        copy._descriptions, copy._flags, copy._deadlines = list(self._descriptions), self._flags[:], self._deadlines[:]
+        copy._ids = self._ids[:]
+        copy._slot_of = dict(self._slot_of) if self._slot_of is not None else None
+        return copy
+
+    def _adopt_columns(self, other: "TaskStore") -> None:
+        self._descriptions, self._flags, self._deadlines = other._descriptions, other._flags, other._deadlines
+        self._ids, self._next_id = other._ids, other._next_id
+        self._slot_of, self._stale_from = other._slot_of, other._stale_from
+
+    @_locked
+    def mark_done(self, index: int) -> None:
+        """
+        Marks the task at the given position as done.
+
+        :param index: The position of the task.
+        """
+        slot = self._slot(index)
+        if self._flags[slot] & DONE_FLAG:
+            return
+        old = self.task_at(slot) if self._listeners else None
+        self._flags[slot] |= DONE_FLAG
+        for listener in self._listeners:
+            listener.task_updated(self, slot, old)
+
+    def task_at(self, index: int) -> Task:
+        """
+        Returns a standalone Task copy of the task at the given position.
+
+        :param index: The position of the task.
+        """
+        view = self[index]
+        return Task(view.description, view.is_done, view.priority, view.deadline)
+
+    def detach(self) -> List[Task]:
+        """
+        Returns standalone Task copies of every stored task.
+        """
+        return [Task(view.description, view.is_done, view.priority, view.deadline) for view in self]
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Sequence) or isinstance(other, str):
+            return NotImplemented
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+    def __repr__(self) -> str:
+        return f"TaskStore({len(self)} tasks)"
+
+    @_locked
+    def __reduce__(self):
+        # Pickled as its columns, e.g. to pass results between processes; listeners are not included.
+        return _restore, (self._descriptions, bytes(self._flags), self._deadlines.tobytes(), self._ids.tobytes(),
+                          self._next_id)
+
+
+def _restore(descriptions: List[str], flags: bytes, deadlines: bytes, ids: bytes, next_id: int) -> TaskStore:
+    """
+    Rebuilds a pickled TaskStore.
+    """
+    store = TaskStore()
+    store._descriptions = [sys.intern(description) for description in descriptions]
+    store._flags = bytearray(flags)
+    store._deadlines.frombytes(deadlines)
+    store._ids.frombytes(ids)
+    store._next_id = next_id
+    if any(a >= b for a, b in zip(store._ids, store._ids[1:])):
+        store._slot_of = {task_id: slot for slot, task_id in enumerate(store._ids)}
+        store._stale_from = len(store._ids)
+    return store
@@ -0,0 +1,121 @@
+import unittest
+import datetime
+import glob
+import os
+import threading
+import time
+from sqlite_saver import SQLiteTaskSaver
+from task import Task
+from todo_list_manager import TodoListManager, CSVSaver, atomic_write
+
+class TestAutosave(unittest.TestCase):
+    def setUp(self):
+        """
+        Set up a manager that autosaves to a CSV file.
+        """
+        self.filename = "test_autosave.csv"
+        self.manager = TodoListManager(CSVSaver())
+
+    def tearDown(self):
+        self.manager.disable_autosave()
+        for filename in [self.filename, "test_autosave.db", "test_autosave.db-wal", "test_autosave.db-shm"] + glob.glob(self.filename + ".*.tmp"):
+            if os.path.exists(filename):
+                os.remove(filename)
+
+    def load(self) -> TodoListManager:
+        manager = TodoListManager(CSVSaver())
+        manager.load_from_file(self.filename)
+        return manager
+
+    def test_burst_is_saved_after_quiet_period(self):
+        self.manager.enable_autosave(self.filename, delay=0.2)
+        for i in range(50):
+            self.manager.add_task(f"Task {i}", 1, datetime.date(2025, 12, 25))
+        self.assertFalse(os.path.exists(self.filename))
+        deadline = time.monotonic() + 5
+        while not os.path.exists(self.filename) and time.monotonic() < deadline:
+            time.sleep(0.05)
+        self.assertTrue(self.manager.flush_autosave(timeout=5))
+        self.assertEqual(self.load().tasks, self.manager.tasks)
+
+    def test_flush_writes_immediately(self):
+        self.manager.enable_autosave(self.filename, delay=60)
+        self.manager.add_task("Buy groceries")
+        self.manager.mark_task_as_done(1)
+        self.assertTrue(self.manager.flush_autosave(timeout=5))
+        self.assertEqual(self.load().tasks, self.manager.tasks)
+        self.assertEqual(glob.glob(self.filename + ".*.tmp"), [])
+
+    def test_disable_writes_pending_changes(self):
+        self.manager.enable_autosave(self.filename, delay=60)
+        self.manager.add_task("Buy groceries")
+        self.manager.disable_autosave()
+        self.assertEqual(len(self.load().tasks), 1)
+        self.manager.add_task("Write report")
+        self.assertTrue(self.manager.flush_autosave())
+        self.assertEqual(len(self.load().tasks), 1)
+
+    def test_concurrent_atomic_writes(self):
+        contents = ["a" * 2 ** 20, "b" * 2 ** 20]
+
+        def write(text):
+            with atomic_write(self.filename) as f:
+                for start in range(0, len(text), 4096):
+                    f.write(text[start:start + 4096])
+
+        threads = [threading.Thread(target=write, args=(text,)) for text in contents]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        with open(self.filename) as f:
+            self.assertIn(f.read(), contents)
+        self.assertEqual(glob.glob(self.filename + ".*.tmp"), [])
+
+    def test_incremental_saver_keeps_ids(self):
+        saver = SQLiteTaskSaver()
+        self.manager.task_saver = saver
+        ids = self.manager.add_tasks([Task("Buy groceries"), Task("Write report"), Task("Call John")])
+        self.manager.save_to_file("test_autosave.db")
+        self.manager.enable_autosave("test_autosave.db", delay=60)
+        self.manager.delete_many([ids[0]])
+        self.manager.mark_done_many([ids[2]])
+        self.assertTrue(self.manager.flush_autosave(timeout=5))
+        saver.close()
+        reader = SQLiteTaskSaver()
+        loaded = reader.load("test_autosave.db")
+        reader.close()
+        self.assertEqual(loaded.ids(), ids[1:])
+        self.assertEqual(loaded, self.manager.tasks)
+
+    def test_changes_do_not_wait_for_incremental_write(self):
+        saver = SQLiteTaskSaver()
+        self.manager.task_saver = saver
+        self.manager.add_task("Buy groceries")
+        self.manager.save_to_file("test_autosave.db")
+        writing = threading.Event()
+        write = saver._write_queued
+
+        def slow_write():
+            writing.set()
+            time.sleep(0.5)
+            return write()
+
+        saver._write_queued = slow_write
+        self.manager.enable_autosave("test_autosave.db", delay=0)
+        self.manager.add_task("Write report")
+        self.assertTrue(writing.wait(5))
+        start = time.monotonic()
+        self.manager.add_task("Call John")
+        self.assertLess(time.monotonic() - start, 0.25)
+        self.assertTrue(self.manager.flush_autosave(timeout=5))
+        saver.close()
+        reader = SQLiteTaskSaver()
+        self.assertEqual(reader.load("test_autosave.db"), self.manager.tasks)
+        reader.close()
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(TypeError):
+            self.manager.enable_autosave(123)
+        with self.assertRaises(ValueError):
+            self.manager.enable_autosave(self.filename, delay=-1)
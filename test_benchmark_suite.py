@@ -0,0 +1,32 @@
+import unittest
+from benchmarks.data import generate_rows, generate_tasks
+from benchmarks.suite import BENCHMARKS, find_regressions, measure
+
+class TestBenchmarkSuite(unittest.TestCase):
+    def test_generators_are_seeded(self):
+        self.assertEqual(list(generate_rows(50, seed=3)), list(generate_rows(50, seed=3)))
+        self.assertNotEqual(list(generate_rows(50, seed=3)), list(generate_rows(50, seed=4)))
+
+    def test_unique_descriptions(self):
+        descriptions = [row[0] for row in generate_rows(5000, unique=True)]
+        self.assertEqual(len(set(descriptions)), 5000)
+        self.assertLess(len({row[0] for row in generate_rows(5000)}), 5000)
+
+    def test_every_benchmark_runs(self):
+        tasks = generate_tasks(200)
+        for name, benchmark in BENCHMARKS.items():
+            result = measure(benchmark, tasks, repeat=1, memory=True)
+            self.assertGreater(result["seconds"], 0, name)
+            self.assertGreater(result["throughput"], 0, name)
+            self.assertIn("peak_bytes", result)
+
+    def test_find_regressions(self):
+        baseline = {"add_task@10k": {"seconds": 1.0, "peak_bytes": 1000}}
+        self.assertEqual(find_regressions({"add_task@10k": {"seconds": 1.1, "peak_bytes": 1000}}, baseline, 0.2), [])
+        regressions = find_regressions({"add_task@10k": {"seconds": 1.5, "peak_bytes": 1300},
+                                        "add_task@100k": {"seconds": 9.0}}, baseline, 0.2)
+        self.assertEqual(len(regressions), 2)
+        self.assertTrue(regressions[0].startswith("add_task@10k seconds"))
+
+if __name__ == '__main__':
+    unittest.main()
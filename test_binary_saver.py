@@ -0,0 +1,63 @@
+import unittest
+import datetime
+import os
+import pickle
+from task import Task
+from binary_saver import BinaryTaskSaver, MappedTaskFile
+from todo_list_manager import TodoListManager
+
+class TestBinaryTaskSaver(unittest.TestCase):
+    def setUp(self):
+        """
+        Set up tasks and a binary saver.
+        """
+        self.filename = "test_todo_list.bin"
+        self.saver = BinaryTaskSaver()
+        self.tasks = [
+            Task("Buy milk, eggs", False, 1, datetime.date(2025, 12, 25)),
+            Task("Write report", True, 2, datetime.date(2025, 12, 26)),
+            Task("Call Zoë", False, None, None),
+            Task("Write report", False, 3, None),
+        ]
+
+    def tearDown(self):
+        if os.path.exists(self.filename):
+            os.remove(self.filename)
+
+    def test_random_access(self):
+        self.saver.save(self.tasks, self.filename)
+        with self.saver.open(self.filename) as mapped:
+            self.assertEqual(len(mapped), 4)
+            self.assertEqual(mapped[2], self.tasks[2])
+            self.assertEqual(mapped[-1], self.tasks[3])
+            self.assertEqual(list(mapped), self.tasks)
+            with self.assertRaises(IndexError):
+                mapped[4]
+
+    def test_manager_round_trip(self):
+        manager = TodoListManager(self.saver)
+        manager.tasks = self.tasks
+        manager.save_to_file(self.filename)
+        loaded = TodoListManager(BinaryTaskSaver())
+        loaded.load_from_file(self.filename)
+        self.assertEqual(loaded.tasks, self.tasks)
+
+        old_id = manager.tasks.id_at(0)
+        manager.load_from_file(self.filename)
+        with self.assertRaises(KeyError):  # ids handed out before the load do not name loaded tasks
+            manager.get_task(old_id)
+        self.assertEqual(len(manager.tasks), 4)
+
+    def test_pickle_reopens_file(self):
+        self.saver.save(self.tasks, self.filename)
+        with MappedTaskFile(self.filename) as mapped:
+            with pickle.loads(pickle.dumps(mapped)) as copy:
+                self.assertEqual(copy[1], self.tasks[1])
+
+    def test_invalid_file(self):
+        with open(self.filename, "w") as f:
+            f.write("is_done,description,priority,deadline\n")
+        with self.assertRaises(ValueError):
+            MappedTaskFile(self.filename)
+        with self.assertRaises(TypeError):
+            self.saver.save(self.tasks, 123)
@@ -0,0 +1,180 @@
+import unittest
+import os
+import tempfile
+import threading
+import time
+from concurrency import ConcurrentTodoListManager, RWLock, merge_tasks
+from journal_saver import JournalTaskSaver
+from sqlite_saver import SQLiteTaskSaver
+from task import Task
+from task_loader import iter_tasks
+from task_store import TaskStore
+from todo_list_manager import CSVSaver
+from benchmarks.concurrency import run_threads
+
+class TestRWLock(unittest.TestCase):
+    def test_readers_share_and_writers_exclude(self):
+        lock = RWLock()
+        inside = []
+        most = [0]
+        guard = threading.Lock()
+
+        def enter(kind):
+            with (lock.read() if kind == "r" else lock.write()):
+                with guard:
+                    inside.append(kind)
+                    most[0] = max(most[0], inside.count("r"))
+                    self.assertTrue(inside.count("w") == 0 or inside == ["w"])
+                time.sleep(0.02)
+                with guard:
+                    inside.remove(kind)
+
+        threads = [threading.Thread(target=enter, args=(kind,)) for kind in "rrrrwrrw"]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertGreater(most[0], 1)
+
+    def test_reentrant(self):
+        lock = RWLock()
+        with lock.write():
+            with lock.write(), lock.read():
+                pass
+        with lock.read():
+            with lock.read():
+                with self.assertRaises(RuntimeError):
+                    with lock.write():
+                        pass
+        with lock.write():  # released completely
+            pass
+
+class TestConcurrentTodoListManager(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.directory.name, "tasks.csv")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_threads_adding_and_reading(self):
+        manager = ConcurrentTodoListManager()
+        ids = []
+
+        def add(worker):
+            for number in range(200):
+                ids.append(manager.add_task(f"Task {worker} {number}", number % 3 + 1))
+                manager.search("task", limit=5)
+                manager.next_tasks(3)
+
+        threads = [threading.Thread(target=add, args=(worker,)) for worker in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(manager.tasks), 800)
+        self.assertEqual(len(set(ids)), 800)
+        self.assertEqual(len(manager.search("task")), 800)
+
+    def test_queries_return_copies(self):
+        manager = ConcurrentTodoListManager()
+        task_id = manager.add_task("Buy groceries", 1)
+        task = manager.get_task(task_id)
+        manager.delete_task(1)
+        self.assertEqual(task.description, "Buy groceries")
+
+    def test_merge_on_save(self):
+        first = ConcurrentTodoListManager(CSVSaver())
+        first.add_task("Buy groceries", 1)
+        first.add_task("Write report", 2)
+        first.add_task("Call John")
+        first.save_to_file(self.filename)
+        second = ConcurrentTodoListManager(CSVSaver())
+        second.load_from_file(self.filename)
+
+        first.mark_task_as_done(1)
+        first.add_task("Pay bills")
+        first.save_to_file(self.filename)
+        second.delete_task(3)
+        second.add_task("Read a book", 3)
+        second.save_to_file(self.filename)
+
+        expected = [("Buy groceries", True), ("Write report", False), ("Pay bills", False), ("Read a book", False)]
+        self.assertEqual([(task.description, task.is_done) for task in iter_tasks(self.filename)], expected)
+        self.assertEqual([(task.description, task.is_done) for task in second.tasks], expected)
+        second.add_task("Water plants")  # ids stay unique after the merge
+        self.assertEqual(len(set(second.tasks.ids())), 5)
+
+    def merge_incremental(self, saver_class, filename):
+        first = ConcurrentTodoListManager(saver_class())
+        first.add_task("Buy groceries", 1)
+        first.add_task("Write report", 2)
+        first.save_to_file(filename)
+        second = ConcurrentTodoListManager(saver_class())
+        second.load_from_file(filename)
+
+        first.add_task("Pay bills")
+        first.save_to_file(filename)  # written incrementally, leaving the main file as it was
+        second.mark_task_as_done(1)
+        second.add_task("Read a book", 3)
+        second.save_to_file(filename)
+
+        expected = [("Buy groceries", True), ("Write report", False), ("Pay bills", False), ("Read a book", False)]
+        self.assertEqual([(task.description, task.is_done) for task in second.tasks], expected)
+        self.assertEqual(len(set(second.tasks.ids())), 4)
+        reader = ConcurrentTodoListManager(saver_class())
+        reader.load_from_file(filename)
+        self.assertEqual([(task.description, task.is_done) for task in reader.tasks], expected)
+        for manager in (first, second, reader):
+            close = getattr(manager.task_saver, "close", None)
+            if close is not None:
+                close()
+        return reader
+
+    def test_merge_on_save_with_journal(self):
+        self.merge_incremental(JournalTaskSaver, self.filename)
+
+    def test_merge_on_save_with_sqlite(self):
+        reader = self.merge_incremental(SQLiteTaskSaver, os.path.join(self.directory.name, "tasks.db"))
+        self.assertEqual(len(set(reader.tasks.ids())), 4)  # no row was overwritten by a task with the same id
+
+    def test_compaction_keeps_other_save(self):
+        base = ConcurrentTodoListManager(JournalTaskSaver())
+        base.add_task("base")
+        base.save_to_file(self.filename)
+        first = ConcurrentTodoListManager(JournalTaskSaver(compact_threshold=100))
+        first.load_from_file(self.filename)
+        second = ConcurrentTodoListManager(JournalTaskSaver())
+        second.load_from_file(self.filename)
+
+        def slow_snapshot(tasks, tmp):
+            time.sleep(0.5)
+            JournalTaskSaver._write_snapshot(tasks, tmp)
+
+        first.task_saver._write_snapshot = slow_snapshot
+        for number in range(5):
+            first.add_task(f"A task {number}")
+        first.save_to_file(self.filename)  # starts a compaction
+        second.add_task("B task")
+        second.save_to_file(self.filename)
+        first.task_saver.wait()
+        reader = ConcurrentTodoListManager(JournalTaskSaver())
+        reader.load_from_file(self.filename)
+        self.assertEqual([task.description for task in reader.tasks],
+                         ["base"] + [f"A task {number}" for number in range(5)] + ["B task"])
+
+    def test_merge_keeps_conflicting_updates(self):
+        base = TaskStore([Task("Buy groceries"), Task("Write report")])
+        ours = base.copy()
+        ours[0] = Task("Buy groceries", priority=1)
+        theirs = [Task("Buy groceries", True), Task("Write report")]
+        merged = [(task.description, task.is_done, task.priority) for task, _ in merge_tasks(base, ours, theirs)]
+        self.assertEqual(merged, [("Buy groceries", True, None), ("Write report", False, None), ("Buy groceries", False, 1)])
+
+    def test_stress_benchmark_runs(self):
+        result = run_threads(200, readers=2, writers=1, seconds=0.05)
+        self.assertGreater(result["reads_per_second"], 0)
+        self.assertGreater(result["writes_per_second"], 0)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+import unittest
+import datetime
+import random
+from task import Task
+from todo_list_manager import TodoListManager
+
+class TestHistory(unittest.TestCase):
+    def setUp(self):
+        """
+        Set up a manager with undo enabled.
+        """
+        self.manager = TodoListManager()
+        self.manager.add_task("Buy groceries", 1, datetime.date(2025, 12, 25))
+        self.manager.add_task("Write report", 2)
+        self.manager.enable_undo(limit=10)
+
+    def snapshot(self):
+        return list(zip(self.manager.tasks.ids(), self.manager.tasks.detach()))
+
+    def test_undo_and_redo(self):
+        start = self.snapshot()
+        task_id = self.manager.add_task("Call John")
+        self.manager.mark_task_as_done(1)
+        self.manager.delete_task(2)
+        end = self.snapshot()
+        self.assertTrue(self.manager.undo())
+        self.assertEqual([task.description for task in self.manager.tasks], ["Buy groceries", "Write report", "Call John"])
+        self.assertTrue(self.manager.undo())
+        self.assertFalse(self.manager.tasks[0].is_done)
+        self.assertTrue(self.manager.undo())
+        self.assertEqual(self.snapshot(), start)
+        self.assertFalse(self.manager.undo())
+        while self.manager.redo():
+            pass
+        self.assertEqual(self.snapshot(), end)
+        self.assertEqual(self.manager.get_task(task_id).description, "Call John")
+
+        self.manager.undo()
+        self.manager.add_task("Pay bills")  # a new change drops the redo steps
+        self.assertFalse(self.manager.redo())
+
+    def test_bulk_operations_are_one_step(self):
+        start = self.snapshot()
+        ids = self.manager.add_tasks([Task(f"Task {n}") for n in range(50)])
+        self.manager.delete_many(ids[::2])
+        self.manager.undo()
+        self.assertEqual(len(self.manager.tasks), 52)
+        self.manager.undo()
+        self.assertEqual(self.snapshot(), start)
+
+    def test_limit_and_reset(self):
+        for n in range(15):
+            self.manager.add_task(f"Task {n}")
+        undone = 0
+        while self.manager.undo():
+            undone += 1
+        self.assertEqual(undone, 10)
+        self.manager.tasks = [Task("Pay bills")]
+        self.assertFalse(self.manager.undo())
+        self.manager.disable_undo()
+        self.manager.add_task("Call John")
+        self.assertFalse(self.manager.undo())
+
+    def test_random_changes(self):
+        rng = random.Random(3)
+        self.manager.enable_undo(limit=1000)
+        states = [self.snapshot()]
+        for step in range(300):
+            action = rng.random()
+            if action < 0.4 or not self.manager.tasks:
+                self.manager.add_task(f"Task {step}", rng.choice([None, 1, 2, 3]))
+            elif action < 0.6:
+                self.manager.mark_task_as_done(rng.randint(1, len(self.manager.tasks)))
+            elif action < 0.8:
+                self.manager.delete_task(rng.randint(1, len(self.manager.tasks)))
+            else:
+                self.manager.tasks[rng.randrange(len(self.manager.tasks))].description = f"Edited {step}"
+            if self.snapshot() != states[-1]:  # marking a done task again changes nothing and records nothing
+                states.append(self.snapshot())
+        for state in reversed(states[:-1]):
+            self.manager.undo()
+            self.assertEqual(self.snapshot(), state)
+        for state in states[1:]:
+            self.manager.redo()
+            self.assertEqual(self.snapshot(), state)
+
+if __name__ == '__main__':
+    unittest.main()
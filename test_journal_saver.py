@@ -0,0 +1,74 @@
+import unittest
+import datetime
+import os
+from task import Task
+from journal_saver import JournalTaskSaver, JOURNAL_SUFFIX
+from todo_list_manager import TodoListManager
+
+class TestJournalTaskSaver(unittest.TestCase):
+    def setUp(self):
+        """
+        Set up a manager that saves through a journal.
+        """
+        self.filename = "test_journal.csv"
+        self.manager = TodoListManager(JournalTaskSaver())
+        self.manager.add_task("Buy groceries", 1, datetime.date(2025, 12, 25))
+        self.manager.add_task("Write report", 2, None)
+
+    def tearDown(self):
+        for suffix in ("", ".tmp", ".compact", JOURNAL_SUFFIX, JOURNAL_SUFFIX + ".tmp"):
+            if os.path.exists(self.filename + suffix):
+                os.remove(self.filename + suffix)
+
+    def load(self) -> TodoListManager:
+        manager = TodoListManager(JournalTaskSaver())
+        manager.load_from_file(self.filename)
+        return manager
+
+    def test_changes_are_appended(self):
+        self.manager.save_to_file(self.filename)
+        snapshot_size = os.path.getsize(self.filename)
+        self.manager.add_task("Call John", 3, None)
+        self.manager.mark_task_as_done(1)
+        self.manager.delete_task(2)
+        self.manager.save_to_file(self.filename)
+        self.assertEqual(os.path.getsize(self.filename), snapshot_size)
+        with open(self.filename + JOURNAL_SUFFIX) as f:
+            self.assertEqual(len(f.readlines()), 4)
+        self.assertEqual(self.load().tasks, self.manager.tasks)
+
+    def test_loaded_manager_keeps_journaling(self):
+        self.manager.save_to_file(self.filename)
+        manager = self.load()
+        manager.add_task("Pay bills")
+        manager.save_to_file(self.filename)
+        self.assertEqual(self.load().tasks, [Task("Buy groceries", False, 1, datetime.date(2025, 12, 25)),
+                                             Task("Write report", False, 2, None), Task("Pay bills")])
+
+    def test_compaction(self):
+        self.manager.task_saver = JournalTaskSaver(compact_threshold=200)
+        self.manager.save_to_file(self.filename)
+        for i in range(20):
+            self.manager.add_task(f"Task {i}")
+            self.manager.save_to_file(self.filename)
+        self.manager.task_saver.wait()
+        self.assertLess(os.path.getsize(self.filename + JOURNAL_SUFFIX), 400)
+        self.assertEqual(self.load().tasks, self.manager.tasks)
+
+    def test_torn_record_is_ignored(self):
+        self.manager.save_to_file(self.filename)
+        self.manager.add_task("Call John")
+        self.manager.save_to_file(self.filename)
+        with open(self.filename + JOURNAL_SUFFIX, "a") as f:
+            f.write('["A",3,"Pay')
+        self.assertEqual(self.load().tasks, self.manager.tasks)
+
+    def test_interrupted_compaction_uses_new_journal(self):
+        self.manager.save_to_file(self.filename)
+        self.manager.add_task("Call John")
+        self.manager.save_to_file(self.filename)
+        # Simulate a crash after the snapshot was replaced but before the journal was.
+        os.rename(self.filename + JOURNAL_SUFFIX, self.filename + JOURNAL_SUFFIX + ".tmp")
+        with open(self.filename + JOURNAL_SUFFIX, "w") as f:
+            f.write('["S",0,0]\n["D",0]\n')
+        self.assertEqual(self.load().tasks, self.manager.tasks)
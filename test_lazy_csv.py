@@ -0,0 +1,78 @@
+import unittest
+import datetime
+import os
+import pickle
+from task import Task
+from lazy_csv import SUFFIX, LazyTaskFile, scan_rows
+from task_loader import iter_tasks
+from todo_list_manager import CSVSaver, TextTaskSaver
+
+class TestLazyTaskFile(unittest.TestCase):
+    def setUp(self):
+        """
+        Set up tasks whose descriptions need quoting.
+        """
+        self.filename = "test_lazy_csv.csv"
+        self.tasks = [
+            Task("Buy milk, eggs", False, 1, datetime.date(2025, 12, 25)),
+            Task('Read "Dune"\nand "Emma"', True, None, None),
+            Task("Call Zoë", False, 3, datetime.date(2025, 10, 30)),
+        ]
+
+    def tearDown(self):
+        for name in (self.filename, self.filename + SUFFIX):
+            if os.path.exists(name):
+                os.remove(name)
+
+    def test_random_access(self):
+        CSVSaver().save(self.tasks * 100, self.filename)
+        with CSVSaver().open(self.filename) as tasks:
+            self.assertEqual(len(tasks), 300)
+            self.assertEqual(tasks[1], self.tasks[1])
+            self.assertEqual(tasks[-1], self.tasks[2])
+            self.assertEqual(tasks[3:6], self.tasks)
+            self.assertEqual(list(tasks), list(iter_tasks(self.filename)))
+            with self.assertRaises(IndexError):
+                tasks[300]
+            self.assertEqual(pickle.loads(pickle.dumps(tasks))[0], self.tasks[0])
+
+    def test_cached_index(self):
+        CSVSaver().save(self.tasks, self.filename)
+        LazyTaskFile(self.filename).close()
+        self.assertTrue(os.path.exists(self.filename + SUFFIX))
+        with LazyTaskFile(self.filename) as tasks:
+            self.assertEqual(list(tasks), self.tasks)
+        CSVSaver().save(self.tasks[:1], self.filename)  # the cache no longer matches and is rebuilt
+        with LazyTaskFile(self.filename) as tasks:
+            self.assertEqual(list(tasks), self.tasks[:1])
+
+    def test_text_file(self):
+        tasks = [Task("Buy milk, eggs, bread", False, 1, None), Task("Call John", True, 2, None)]
+        TextTaskSaver().save(tasks, self.filename)
+        with open(self.filename, "a") as f:
+            f.write("\nnot a task\n")
+        with TextTaskSaver().open(self.filename) as lazy:
+            self.assertEqual(len(lazy), 3)
+            self.assertEqual(lazy[:2], tasks)
+            with self.assertRaises(ValueError):
+                lazy[2]
+
+    def test_text_file_with_quote(self):
+        tasks = [Task('Buy 5" screen', False, 1, None), Task('"Quoted" thing'), Task('"open, item', True, 1),
+                 Task("Call John", True, 2, None), Task("Pay bills")]
+        TextTaskSaver().save(tasks, self.filename)
+        with TextTaskSaver().open(self.filename) as lazy:
+            self.assertEqual(len(lazy), 5)
+            self.assertEqual(list(lazy), tasks)
+            self.assertEqual(list(lazy), list(iter_tasks(self.filename)))
+
+    def test_scan_rows(self):
+        data = b'a,b\r\n"x\ny",z\n\n"q""",r\nlast'
+        self.assertEqual(list(scan_rows(data)), [0, 5, 14, 22])
+        self.assertEqual(list(scan_rows(data, quoted=False)), [0, 5, 8, 14, 22])
+        open(self.filename, "w").close()
+        with LazyTaskFile(self.filename) as tasks:
+            self.assertEqual(len(tasks), 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+import unittest
+import os
+from task import Task
+from journal_saver import JOURNAL_SUFFIX, JournalTaskSaver
+from metrics import CProfileHook, TracemallocHook
+from todo_list_manager import TodoListManager, CSVSaver, TextTaskSaver
+
+class TestMetrics(unittest.TestCase):
+    def setUp(self):
+        """
+        Set up a manager with metrics enabled.
+        """
+        self.filename = "test_metrics.csv"
+        self.manager = TodoListManager(CSVSaver())
+        self.metrics = self.manager.enable_metrics()
+
+    def tearDown(self):
+        for filename in (self.filename, self.filename + JOURNAL_SUFFIX):
+            if os.path.exists(filename):
+                os.remove(filename)
+
+    def test_operations_are_recorded(self):
+        ids = self.manager.add_tasks([Task("Buy milk, eggs"), Task("Write report", priority=2)])
+        self.manager.add_task("Call Mom")
+        self.manager.mark_done_many(iter(ids))
+        self.manager.list_tasks(limit=2)
+        self.manager.save_to_file(self.filename)
+        self.manager.load_from_file(self.filename)
+        snapshot = self.metrics.snapshot()
+        self.assertEqual(snapshot["add_tasks"]["rows"], 2)
+        self.assertEqual(snapshot["add_task"]["calls"], 1)
+        self.assertEqual(snapshot["mark_done_many"]["rows"], 2)
+        self.assertEqual(snapshot["list_tasks"]["rows"], 2)
+        self.assertEqual(snapshot["CSVSaver.save"]["rows"], 3)
+        self.assertEqual(snapshot["CSVSaver.save"]["bytes_written"], os.path.getsize(self.filename))
+        self.assertEqual(snapshot["load_from_file"]["bytes_read"], os.path.getsize(self.filename))
+        self.assertEqual(sum(snapshot["add_task"]["buckets"].values()), 1)
+        self.assertTrue(all(task.is_done for task in self.manager.tasks[:2]))
+
+    def test_errors_and_disable(self):
+        with self.assertRaises(IndexError):
+            self.manager.delete_task(5)
+        self.assertEqual(self.metrics.snapshot()["delete_task"]["errors"], 1)
+        self.manager.disable_metrics()
+        self.assertNotIn("add_task", vars(self.manager))
+        self.assertNotIn("save", vars(self.manager.task_saver))
+        self.manager.add_task("Call Mom")
+        self.assertNotIn("add_task", self.metrics.snapshot())
+
+    def test_incremental_save_counts_what_was_written(self):
+        self.manager.task_saver = JournalTaskSaver()
+        self.manager.add_tasks([Task("Buy milk"), Task("Write report")])
+        self.manager.save_to_file(self.filename)  # a full snapshot
+        before = self.metrics.snapshot()["JournalTaskSaver.save"]
+        journal_size = os.path.getsize(self.filename + JOURNAL_SUFFIX)
+        self.manager.add_task("Call Mom")
+        self.manager.save_to_file(self.filename)  # appends one record
+        after = self.metrics.snapshot()["JournalTaskSaver.save"]
+        self.assertEqual(before["rows"], 2)
+        self.assertEqual(after["rows"] - before["rows"], 1)
+        self.assertEqual(after["bytes_written"] - before["bytes_written"],
+                         os.path.getsize(self.filename + JOURNAL_SUFFIX) - journal_size)
+
+    def test_saver_change_is_followed(self):
+        old = self.manager.task_saver
+        self.manager.task_saver = TextTaskSaver()
+        self.assertNotIn("save", vars(old))
+        self.manager.save_to_file(self.filename)
+        self.assertIn("TextTaskSaver.save", self.metrics.snapshot())
+
+    def test_prometheus_and_hooks(self):
+        profile, memory = CProfileHook(), TracemallocHook()
+        self.metrics.add_hook(profile)
+        self.metrics.add_hook(memory)
+        self.manager.add_tasks([Task("Buy milk") for _ in range(100)])
+        self.metrics.remove_hook(profile)
+        self.metrics.remove_hook(memory)
+        memory.close()
+        self.assertIn("add_tasks", profile.report())
+        self.assertGreater(memory.peaks["add_tasks"], 0)
+        text = self.metrics.prometheus()
+        self.assertIn('todo_operation_seconds_count{operation="add_tasks"} 1', text)
+        self.assertIn('todo_operation_seconds_bucket{operation="add_tasks",le="+Inf"} 1', text)
+        self.assertIn('todo_operation_rows_total{operation="add_tasks"} 100', text)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+import unittest
+import datetime
+import random
+from task import Task
+from scheduler import TaskScheduler, urgency_key
+from task_store import TaskStore
+from todo_list_manager import TodoListManager
+
+class TestScheduler(unittest.TestCase):
+    def setUp(self):
+        """
+        Set up a manager with tasks across priorities and deadlines.
+        """
+        self.manager = TodoListManager()
+        self.manager.add_task("Buy groceries", 1, datetime.date(2025, 12, 25))
+        self.manager.add_task("Write report", 2, datetime.date(2025, 12, 20))
+        self.manager.add_task("Call John", 3, None)
+        self.manager.add_task("Pay bills", None, datetime.date(2025, 12, 20))
+        self.manager.add_task("Plan trip", 1, None)
+
+    def descriptions(self, tasks):
+        return [task.description for task in tasks]
+
+    def test_next_tasks(self):
+        self.assertEqual(self.descriptions(self.manager.next_tasks(5)),
+                         ["Write report", "Pay bills", "Buy groceries", "Plan trip", "Call John"])
+        self.assertEqual(self.descriptions(self.manager.next_tasks(10)), self.descriptions(self.manager.next_tasks(5)))
+        self.assertEqual(self.manager.next_tasks(0), [])
+        with self.assertRaises(ValueError):
+            self.manager.next_tasks(-1)
+
+    def test_follows_changes(self):
+        self.manager.next_tasks()
+        self.manager.mark_task_as_done(2)
+        self.manager.delete_task(1)
+        self.manager.add_task("Renew passport", 3, datetime.date(2025, 1, 1))
+        self.manager.tasks[2].priority = 3
+        self.assertEqual(self.descriptions(self.manager.next_tasks(3)), ["Renew passport", "Pay bills", "Plan trip"])
+        self.manager.tasks = [Task("Call John", True, 3, None), Task("Plan trip")]
+        self.assertEqual(self.descriptions(self.manager.next_tasks(3)), ["Plan trip"])
+
+    def test_custom_key(self):
+        by_priority = lambda task: task.priority or 4
+        self.assertEqual(self.descriptions(self.manager.next_tasks(2, key=by_priority)), ["Buy groceries", "Plan trip"])
+
+    def test_matches_sorting(self):
+        rng = random.Random(7)
+        store = TaskStore()
+        scheduler = TaskScheduler(store)
+        for step in range(2000):
+            action = rng.random()
+            if action < 0.5 or not store:
+                deadline = datetime.date(2025, 1, 1) + datetime.timedelta(rng.randint(0, 60)) if rng.random() < 0.8 else None
+                store.append(Task(f"Task {step}", False, rng.choice([None, 1, 2, 3]), deadline))
+            elif action < 0.7:
+                store.mark_done(rng.randrange(len(store)))
+            elif action < 0.85:
+                store[rng.randrange(len(store))].priority = rng.choice([None, 1, 2, 3])
+            else:
+                del store[rng.randrange(len(store))]
+        expected = sorted((slot for slot in range(len(store)) if not store[slot].is_done),
+                          key=lambda slot: (urgency_key(store[slot]), store.id_at(slot)))
+        self.assertEqual([task.description for task in scheduler.next(50)],
+                         [store[slot].description for slot in expected[:50]])
+        self.assertEqual(len(scheduler), len(expected))
+
+if __name__ == '__main__':
+    unittest.main()
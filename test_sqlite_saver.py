@@ -0,0 +1,66 @@
+import unittest
+import datetime
+import os
+import sqlite3
+from task import Task
+from sqlite_saver import SQLiteTaskSaver
+from todo_list_manager import TodoListManager
+
+class TestSQLiteTaskSaver(unittest.TestCase):
+    def setUp(self):
+        """
+        Set up a manager that saves to a SQLite database.
+        """
+        self.filename = "test_todo_list.db"
+        self.saver = SQLiteTaskSaver(batch_size=3)
+        self.manager = TodoListManager(self.saver)
+        self.manager.add_task("Buy groceries", 1, datetime.date(2025, 12, 25))
+        self.manager.add_task("Write report", 2, None)
+        self.manager.add_task("Call John", None, datetime.date(2025, 10, 30))
+
+    def tearDown(self):
+        self.saver.close()
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(self.filename + suffix):
+                os.remove(self.filename + suffix)
+
+    def load(self) -> TodoListManager:
+        saver = SQLiteTaskSaver()
+        manager = TodoListManager(saver)
+        manager.load_from_file(self.filename)
+        saver.close()
+        return manager
+
+    def rows(self):
+        with sqlite3.connect(self.filename) as connection:
+            return connection.execute("SELECT description, is_done FROM tasks ORDER BY position").fetchall()
+
+    def test_round_trip(self):
+        self.manager.save_to_file(self.filename)
+        self.assertEqual(self.load().tasks, self.manager.tasks)
+
+    def test_changes_are_batched(self):
+        self.manager.save_to_file(self.filename)
+        self.manager.mark_task_as_done(1)
+        self.manager.delete_task(2)
+        self.assertEqual(self.rows(), [("Buy groceries", 0), ("Write report", 0), ("Call John", 0)])
+        self.manager.add_task("Pay bills")  # the third change starts a write in the background
+        self.manager.task_saver.wait()
+        self.assertEqual(self.rows(), [("Buy groceries", 1), ("Call John", 0), ("Pay bills", 0)])
+        self.manager.tasks.insert(1, Task("Plan trip"))
+        self.manager.save_to_file(self.filename)
+        self.assertEqual(self.load().tasks, self.manager.tasks)
+
+    def test_loaded_manager_writes_changes(self):
+        self.manager.save_to_file(self.filename)
+        manager = self.load()
+        manager.delete_task(1)
+        manager.save_to_file(self.filename)
+        manager.task_saver.close()
+        self.assertEqual(self.rows(), [("Write report", 0), ("Call John", 0)])
+        self.assertEqual(self.load().tasks.id_at(0), self.manager.tasks.id_at(1))
+
+    def test_missing_database(self):
+        manager = self.load()
+        self.assertEqual(len(manager.tasks), 0)
+        self.assertFalse(os.path.exists(self.filename))
@@ -0,0 +1,62 @@
+import unittest
+import datetime
+from task import Task
+from todo_list_manager import TodoListManager
+
+class TestTaskIndex(unittest.TestCase):
+    def setUp(self):
+        """
+        Set up a manager with tasks across priorities and deadlines.
+        """
+        self.manager = TodoListManager()
+        self.manager.add_task("Buy groceries", 1, datetime.date(2025, 12, 25))
+        self.manager.add_task("Write report", 2, datetime.date(2025, 12, 26))
+        self.manager.add_task("Call John", 3, None)
+        self.manager.add_task("Pay bills", None, datetime.date(2025, 10, 30))
+        self.manager.add_task("Write a very long report", 1, datetime.date(2025, 11, 15))
+
+    def descriptions(self, tasks):
+        return sorted(task.description for task in tasks)
+
+    def test_find(self):
+        self.assertEqual(self.descriptions(self.manager.find(priority=1)), ["Buy groceries", "Write a very long report"])
+        self.assertEqual(self.descriptions(self.manager.find(priority=None)), ["Pay bills"])
+        self.assertEqual([task.description for task in self.manager.find(due_before=datetime.date(2025, 12, 25))],
+                         ["Pay bills", "Write a very long report"])
+        self.assertEqual(self.descriptions(self.manager.find(due_after=datetime.date(2025, 12, 25))), ["Write report"])
+        self.assertEqual(len(list(self.manager.find())), 5)
+
+    def test_index_follows_changes(self):
+        self.assertEqual(len(list(self.manager.find(done=False))), 5)
+        self.manager.mark_task_as_done(1)
+        self.manager.delete_task(4)
+        self.manager.add_task("Plan trip", 1, datetime.date(2025, 9, 1))
+        self.assertEqual(self.descriptions(self.manager.find(priority=1, done=False)), ["Plan trip", "Write a very long report"])
+        self.assertEqual(self.descriptions(self.manager.find(done=True)), ["Buy groceries"])
+        overdue = self.manager.find(priority=1, due_before=datetime.date(2025, 12, 1), done=False)
+        self.assertEqual([task.description for task in overdue], ["Plan trip", "Write a very long report"])
+
+        self.manager.tasks[0].priority = 2
+        self.assertEqual(self.descriptions(self.manager.find(priority=2)), ["Buy groceries", "Write report"])
+        self.manager.tasks = [Task("Call John", False, 3, None)]
+        self.assertEqual(list(self.manager.find(priority=1)), [])
+
+    def test_bulk_add_after_query(self):
+        list(self.manager.find(due_before=datetime.date(2026, 1, 1)))  # builds the index
+        start = datetime.date(2025, 1, 1).toordinal()
+        tasks = [Task(f"Task {number}", deadline=datetime.date.fromordinal(start + number % 365)) for number in range(1000)]
+        ids = self.manager.add_tasks(tasks)
+        self.manager.delete_many(ids[:100])  # removed before they were merged into the deadline index
+        self.manager.tasks[-1].deadline = datetime.date(2024, 1, 1)
+        early = [task.description for task in self.manager.find(due_before=datetime.date(2025, 1, 3))]
+        self.assertEqual(early, ["Task 999", "Task 365", "Task 730", "Task 366", "Task 731"])
+        expected = sum(1 for task in self.manager.tasks if task.deadline and task.deadline < datetime.date(2025, 6, 1))
+        self.assertEqual(len(list(self.manager.find(due_before=datetime.date(2025, 6, 1)))), expected)
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            self.manager.find(priority=4)
+        with self.assertRaises(TypeError):
+            self.manager.find(due_before="2025-12-25")
+        with self.assertRaises(TypeError):
+            self.manager.find(done="yes")
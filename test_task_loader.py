@@ -0,0 +1,84 @@
+import unittest
+import datetime
+import os
+from task import Task
+from task_loader import iter_tasks, iter_task_chunks, parse_deadline
+from todo_list_manager import TodoListManager, CSVSaver, TextTaskSaver
+
+class TestTaskLoader(unittest.TestCase):
+    def setUp(self):
+        """
+        Set up tasks whose descriptions need quoting.
+        """
+        self.filename = "test_task_loader.csv"
+        self.tasks = [
+            Task("Buy milk, eggs, bread", False, 1, datetime.date(2025, 12, 25)),
+            Task('Read "Dune"', True, None, None),
+            Task("Call John", False, 3, datetime.date(2025, 10, 30)),
+        ]
+
+    def tearDown(self):
+        if os.path.exists(self.filename):
+            os.remove(self.filename)
+
+    def test_csv_round_trip_with_commas(self):
+        CSVSaver().save(self.tasks, self.filename)
+        self.assertEqual(list(iter_tasks(self.filename)), self.tasks)
+
+        manager = TodoListManager(CSVSaver())
+        manager.load_from_file(self.filename, chunk_size=2)
+        self.assertEqual(manager.tasks, self.tasks)
+
+    def test_text_file_with_commas(self):
+        TextTaskSaver().save(self.tasks[:1], self.filename)
+        self.assertEqual(list(iter_tasks(self.filename)), self.tasks[:1])
+
+    def test_text_file_with_leading_quotes(self):
+        tasks = [Task('"Quoted" thing'), Task('"open, item', True, 1), Task("Third")]
+        TextTaskSaver().save(tasks, self.filename)
+        self.assertEqual(list(iter_tasks(self.filename)), tasks)
+
+    def test_invalid_rows_are_skipped(self):
+        with open(self.filename, "w") as f:
+            f.write("is_done,description,priority,deadline\n")
+            f.write("X,Valid,1,2025-01-02\n")
+            f.write("False,Bad priority,high,None\n")
+            f.write("False,Bad date,2,2025-13-40\n")
+            f.write("too,few\n")
+        self.assertEqual(list(iter_tasks(self.filename)), [Task("Valid", True, 1, datetime.date(2025, 1, 2))])
+
+    def test_chunks(self):
+        CSVSaver().save(self.tasks, self.filename)
+        self.assertEqual([len(chunk) for chunk in iter_task_chunks(self.filename, 2)], [2, 1])
+        with self.assertRaises(ValueError):
+            list(iter_task_chunks(self.filename, 0))
+
+    def test_load_many(self):
+        other = "test_task_loader_2.csv"
+        self.addCleanup(os.remove, other)
+        CSVSaver().save(self.tasks, self.filename)
+        CSVSaver().save([self.tasks[2], Task("Plan trip")], other)
+        manager = TodoListManager(CSVSaver())
+        counts = []
+        for workers in (1, 2):
+            manager.load_many([self.filename, other, "missing.csv"], workers=workers, progress=counts.append)
+            self.assertEqual(manager.tasks, self.tasks + [self.tasks[2], Task("Plan trip")])
+        self.assertEqual(counts, [1, 2, 3, 1, 2, 3])
+        manager.load_many([self.filename, other], workers=2, dedupe=True)
+        self.assertEqual(manager.tasks, self.tasks + [Task("Plan trip")])
+        self.assertEqual(len(set(manager.tasks.ids())), 4)
+        old_id = manager.tasks.id_at(0)
+        manager.load_many([other], workers=1)
+        with self.assertRaises(KeyError):  # ids handed out before the load do not name loaded tasks
+            manager.get_task(old_id)
+        self.assertTrue(all(task_id > old_id for task_id in manager.tasks.ids()))
+        with self.assertRaises(TypeError):
+            manager.load_many(self.filename)
+        with self.assertRaises(ValueError):
+            manager.load_many([self.filename], workers=0)
+
+    def test_parse_deadline(self):
+        self.assertIsNone(parse_deadline("None"))
+        self.assertEqual(parse_deadline("2025-12-25"), datetime.date(2025, 12, 25))
+        with self.assertRaises(ValueError):
+            parse_deadline("25/12/2025")
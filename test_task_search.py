@@ -0,0 +1,86 @@
+import unittest
+import datetime
+import os
+from task import Task
+from journal_saver import JOURNAL_SUFFIX, JournalTaskSaver
+from task_search import SUFFIX, TaskSearchIndex, tokenize
+from todo_list_manager import TodoListManager, CSVSaver
+
+class TestTaskSearch(unittest.TestCase):
+    def setUp(self):
+        """
+        Set up a manager with a few tasks.
+        """
+        self.filename = "test_task_search.csv"
+        self.manager = TodoListManager(CSVSaver())
+        self.manager.add_task("Buy milk, eggs", 1, datetime.date(2025, 12, 25))
+        self.manager.add_task("Write report", 2)
+        self.manager.add_task("Buy groceries")
+        self.manager.add_task("Review milk report")
+        self.manager.add_task("Call Mom")
+
+    def tearDown(self):
+        for name in (self.filename, self.filename + SUFFIX, self.filename + JOURNAL_SUFFIX):
+            if os.path.exists(name):
+                os.remove(name)
+
+    def descriptions(self, tasks):
+        return [task.description for task in tasks]
+
+    def test_tokenize(self):
+        self.assertEqual(tokenize("Buy milk, MILK and eggs"), ("buy", "milk", "and", "eggs"))
+
+    def test_search(self):
+        self.assertEqual(self.descriptions(self.manager.search("milk")), ["Buy milk, eggs", "Review milk report"])
+        self.assertEqual(self.descriptions(self.manager.search("BUY")), ["Buy milk, eggs", "Buy groceries"])
+        self.assertEqual(self.descriptions(self.manager.search("milk report", limit=2)),
+                         ["Review milk report", "Buy milk, eggs"])
+        self.assertEqual(self.descriptions(self.manager.search("re", prefix=True)), ["Write report", "Review milk report"])
+        self.assertEqual(self.manager.search("re"), [])
+        self.assertEqual(self.manager.search_lines("gro"), ["3. [ ] Buy groceries | Priority: None | Deadline: None"])
+        self.assertEqual(self.manager._search.complete("r"), ["report", "review"])
+
+    def test_index_follows_changes(self):
+        self.manager.search("milk")
+        self.manager.delete_task(1)
+        self.manager.tasks[0].description = "Write milk report"
+        self.manager.add_task("Drink milk")
+        self.assertEqual(self.descriptions(self.manager.search("milk")),
+                         ["Write milk report", "Review milk report", "Drink milk"])
+        self.assertEqual(self.manager.search("eggs"), [])
+        self.manager.tasks = [Task("Pay bills")]
+        self.assertEqual(self.descriptions(self.manager.search("bills")), ["Pay bills"])
+        self.assertEqual(self.manager._search.complete("w"), [])
+
+    def test_saved_index(self):
+        self.manager.save_to_file(self.filename, search_index=True)
+        self.assertTrue(os.path.exists(self.filename + SUFFIX))
+        manager = TodoListManager(CSVSaver())
+        manager.add_task("Old task")
+        manager.load_from_file(self.filename, search_index=True)
+        self.assertIsNotNone(manager._search)
+        self.assertEqual(self.descriptions(manager.search("milk")), ["Buy milk, eggs", "Review milk report"])
+        manager.add_task("Drink milk")
+        self.assertEqual(len(manager.search("milk")), 3)
+
+        CSVSaver().save([Task("Pay bills")], self.filename)  # the list changed, so the index is stale
+        self.assertIsNone(TaskSearchIndex.load(manager.tasks, self.filename, manager.task_saver.version(self.filename)))
+        manager.load_from_file(self.filename, search_index=True)
+        self.assertEqual(self.descriptions(manager.search("bills")), ["Pay bills"])
+
+    def test_saved_index_with_journal(self):
+        manager = TodoListManager(JournalTaskSaver())
+        manager.add_task("Pay alpha bill")
+        manager.add_task("Call Mom")
+        manager.save_to_file(self.filename, search_index=True)
+        manager.delete_task(manager.tasks.id_at(0))
+        manager.add_task("Read beta book")
+        manager.save_to_file(self.filename)  # only appends to the journal, leaving the list file as it was
+        self.assertTrue(os.path.exists(self.filename + JOURNAL_SUFFIX))
+        loaded = TodoListManager(JournalTaskSaver())
+        loaded.load_from_file(self.filename, search_index=True)
+        self.assertEqual(loaded.search("alpha"), [])
+        self.assertEqual(self.descriptions(loaded.search("beta")), ["Read beta book"])
+
+if __name__ == '__main__':
+    unittest.main()
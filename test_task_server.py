@@ -0,0 +1,89 @@
+import unittest
+import asyncio
+import json
+import os
+import tempfile
+from unittest import mock
+from task_loader import iter_tasks
+from task_server import TaskClient, TaskServer
+from todo_list_manager import CSVSaver, TodoListManager
+from benchmarks.load_client import percentile, run_load
+
+class TestTaskServer(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.directory.name, "tasks.csv")
+        self.manager = TodoListManager(CSVSaver())
+        self.manager.add_task("Buy groceries", 1)
+        self.manager.enable_undo()
+        self.server = TaskServer(self.manager, self.filename)
+        await self.server.start(path=os.path.join(self.directory.name, "todo.sock"))
+        self.client = await TaskClient.connect(path=self.server.address)
+
+    async def asyncTearDown(self):
+        await self.client.close()
+        await self.server.close()
+        self.directory.cleanup()
+
+    async def test_concurrent_mutations_are_batched(self):
+        clients = [await TaskClient.connect(path=self.server.address) for _ in range(10)]
+        with mock.patch.object(CSVSaver, "save", autospec=True, side_effect=CSVSaver.save) as save:
+            ids = await asyncio.gather(*(client.request("add", description=f"Task {number}", deadline="2025-12-24")
+                                         for number, client in enumerate(clients)))
+        self.assertEqual(len(set(ids)), 10)
+        self.assertEqual(save.call_count, 1)
+        self.assertEqual(len(list(iter_tasks(self.filename))), 11)
+        await asyncio.gather(*(client.request("done", id=task_id) for client, task_id in zip(clients, ids)))
+        task = await self.client.request("get", id=ids[0])
+        self.assertEqual(task, {"id": ids[0], "description": "Task 0", "is_done": True, "priority": None,
+                                "deadline": "2025-12-24"})
+        for client in clients:
+            await client.close()
+
+    async def test_invalid_requests_fail_alone(self):
+        results = await asyncio.gather(self.client.request("add", description=""),
+                                       self.client.request("add", description="Write report", priority=2),
+                                       self.client.request("delete", id=99),
+                                       self.client.request("add", description="Call John", priority=5),
+                                       return_exceptions=True)
+        self.assertIn("ValueError: Description cannot be empty.", str(results[0]))
+        self.assertIsInstance(results[1], int)
+        self.assertIn("KeyError: Unknown task id: 99", str(results[2]))
+        self.assertIn("ValueError", str(results[3]))
+        self.assertEqual(await self.client.request("count"), 2)
+        with self.assertRaises(Exception):
+            await self.client.request("fly")
+
+    async def test_reads(self):
+        task_id = await self.client.request("add", description="Write report", priority=2)
+        self.assertEqual([task["id"] for task in await self.client.request("search", query="report")], [task_id])
+        self.assertEqual(len(await self.client.request("next", k=5)), 2)
+        self.assertEqual(await self.client.request("list", offset=1),
+                         ["2. [ ] Write report | Priority: Medium | Deadline: None"])
+        self.assertTrue(await self.client.request("undo"))
+        self.assertEqual(await self.client.request("count"), 1)
+
+    async def test_malformed_line(self):
+        reader, writer = await asyncio.open_unix_connection(self.server.address)
+        writer.write(b"not json\n")
+        response = json.loads(await reader.readline())
+        self.assertIsNone(response["id"])
+        self.assertIn("error", response)
+        writer.close()
+
+    async def test_load_client(self):
+        result = await run_load(4, 10, float("inf"), 0.5, path=self.server.address)
+        self.assertEqual(result["requests"], 40)
+        self.assertEqual(result["errors"], 0)
+        self.assertGreater(result["requests_per_second"], 0)
+        self.assertLessEqual(result["p50"], result["p99"])
+
+class TestPercentile(unittest.TestCase):
+    def test_nearest_rank(self):
+        values = list(range(1, 101))
+        self.assertEqual(percentile(values, 0.99), 99)
+        self.assertEqual(percentile(values, 0.5), 50)
+        self.assertEqual(percentile([], 0.99), 0.0)
+
+if __name__ == "__main__":
+    unittest.main()
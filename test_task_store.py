@@ -0,0 +1,90 @@
+import unittest
+import datetime
+import pickle
+from task import Task
+from task_store import TaskStore, TaskView
+
+class TestTaskStore(unittest.TestCase):
+    def setUp(self):
+        """
+        Set up a store with a few tasks.
+        """
+        self.task1 = Task("Buy groceries", False, 1, datetime.date(2025, 12, 25))
+        self.task2 = Task("Write report", True, 2, datetime.date(2025, 12, 26))
+        self.task3 = Task("Call John", False, None, None)
+        self.store = TaskStore([self.task1, self.task2, self.task3])
+
+    def test_views(self):
+        self.assertEqual(len(self.store), 3)
+        self.assertIsInstance(self.store[0], TaskView)
+        self.assertEqual(self.store[0], self.task1)
+        self.assertEqual(self.store[-1], self.task3)
+        self.assertIsNone(self.store[2].priority)
+        self.assertIsNone(self.store[2].deadline)
+        self.assertEqual(self.store, [self.task1, self.task2, self.task3])
+        self.assertEqual(str(self.store[1]), str(self.task2))
+        with self.assertRaises(IndexError):
+            self.store[3]
+
+    def test_write_through(self):
+        self.store[0].mark_as_done()
+        self.assertTrue(self.store[0].is_done)
+        self.store[2].priority = 3
+        self.assertEqual(self.store[2].priority, 3)
+        with self.assertRaises(ValueError):
+            self.store[2].priority = 5
+        self.store[1] = self.task3
+        self.assertEqual(self.store[1], self.task3)
+
+    def test_mutations(self):
+        del self.store[1]
+        self.assertEqual(self.store, [self.task1, self.task3])
+        self.store.insert(0, self.task2)
+        self.assertEqual(self.store, [self.task2, self.task1, self.task3])
+        self.store.replace(self.store[1:])
+        self.assertEqual(self.store, [self.task1, self.task3])
+        self.assertEqual(self.store.detach(), [self.task1, self.task3])
+        with self.assertRaises(TypeError):
+            self.store.append("Buy groceries")
+
+    def test_descriptions_are_shared(self):
+        store = TaskStore(Task("".join(["Pay", " bills"])) for _ in range(3))
+        self.assertIs(store[0].description, store[2].description)
+
+    def test_ids_are_stable(self):
+        ids = [self.store.id_at(slot) for slot in range(3)]
+        del self.store[0]
+        self.store.insert(1, self.task1)
+        self.assertEqual(self.store.slot_of(ids[1]), 0)
+        self.assertEqual(self.store.slot_of(ids[2]), 2)
+        self.assertNotIn(self.store.id_at(1), ids)
+        with self.assertRaises(KeyError):
+            self.store.slot_of(ids[0])
+
+    def test_duplicate_id_out_of_order(self):
+        store = TaskStore()
+        store.append(Task("a"), task_id=5)
+        store.append(Task("b"), task_id=3)
+        with self.assertRaises(ValueError):
+            store.insert(0, Task("dup"), task_id=5)
+        self.assertEqual(store.ids(), [5, 3])
+
+    def test_pickle_and_extend_from_store(self):
+        self.store.insert(0, self.task3)  # ids out of order
+        copy = pickle.loads(pickle.dumps(self.store))
+        self.assertEqual(copy, self.store)
+        self.assertEqual(copy.ids(), self.store.ids())
+        self.assertEqual(copy.slot_of(self.store.id_at(0)), 0)
+        copy.extend(copy)
+        self.assertEqual(copy, list(self.store) * 2)
+        self.assertEqual(len(set(copy.ids())), 8)
+
+    def test_delete_slots(self):
+        ids = self.store.ids()
+        self.store.extend([self.task1, self.task2])
+        self.store.delete_slots([4, 0, 2, 0])
+        self.assertEqual(self.store, [self.task2, self.task1])
+        self.assertEqual(self.store.slot_of(ids[1]), 0)
+        self.assertEqual(self.store.ids(), [ids[1], self.store.id_at(1)])
+        with self.assertRaises(IndexError):
+            self.store.delete_slots([2])
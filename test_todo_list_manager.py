@@ -84,4 +84,38 @@ class TestTodoListManager(unittest.TestCase):
         with self.assertRaises(TypeError):
             self.manager.load_from_file(123)
         if os.path.exists("test_todo_list.csv"):
-            os.remove("test_todo_list.csv")
\ No newline at end of file
+            os.remove("test_todo_list.csv")
+
+    def test_bulk_operations(self):
+        ids = self.manager.add_tasks([self.task1, self.task2, self.task3, self.task4])
+        self.assertEqual(self.manager.tasks, [self.task1, self.task2, self.task3, self.task4])
+        self.manager.delete_many([ids[0], ids[2]])
+        self.assertEqual(self.manager.tasks, [self.task2, self.task4])
+        self.assertEqual(self.manager.get_task(ids[3]), self.task4)
+        self.manager.mark_done_many([ids[3]])
+        self.assertTrue(self.manager.get_task(ids[3]).is_done)
+        new_id = self.manager.add_task("Call John")
+        self.assertEqual(self.manager.get_task(new_id).description, "Call John")
+
+        with self.assertRaises(KeyError):
+            self.manager.delete_many([ids[1], ids[0]])
+        self.assertEqual(len(self.manager.tasks), 3)
+        with self.assertRaises(TypeError):
+            self.manager.mark_done_many(["invalid"])
+        with self.assertRaises(ValueError):
+            self.manager.add_tasks([Task("")])
+
+    def test_list_tasks_pages(self):
+        self.manager.tasks = [self.task1, self.task2, self.task3]
+        self.assertEqual(self.manager.list_tasks(1, 1), "To-Do List:\n2. [X] Write report | Priority: Medium | Deadline: 2025-12-26\n")
+        self.assertEqual(list(self.manager.iter_task_lines(2)), ["3. [ ] Call John | Priority: Low | Deadline: None"])
+        self.assertEqual(self.manager.list_tasks(5), "To-Do List:\n")
+        self.manager.mark_task_as_done(3)
+        self.manager.delete_task(1)
+        self.assertEqual(list(self.manager.iter_task_lines()), [
+            "1. [X] Write report | Priority: Medium | Deadline: 2025-12-26",
+            "2. [X] Call John | Priority: Low | Deadline: None"])
+        with self.assertRaises(ValueError):
+            self.manager.list_tasks(-1)
+        with self.assertRaises(TypeError):
+            self.manager.list_tasks(0, "10")
@@ -1,12 +1,93 @@
 #This module defines the TodoListApp class, which provides a GUI for the to-do list manager.
 
 import tkinter as tk
-from tkinter import messagebox, simpledialog, scrolledtext
+from tkinter import messagebox, simpledialog
 import datetime
+import queue
+import threading
+from typing import Callable, List, Optional
 from todo_list_manager import TodoListManager, CSVSaver # Import the classes from todo_list_manager.py file
 from task import Task # Import the Task class
 
 
+class VirtualTaskList(tk.Frame):
+    """
+    A scrolling view of the to-do list that only draws the visible rows.
+
+    After each change only the rows whose text differs from what is on screen are redrawn.
+    """
+    def __init__(self, master: tk.Widget, manager: TodoListManager, rows: int = 15, width: int = 60):
+        """
+        Creates the text area and its scrollbar.
+
+        :param master: The parent widget.
+        :param manager: The manager whose tasks are shown.
+        :param rows: The number of visible rows.
+        :param width: The width of the view in characters.
+        """
+        super().__init__(master)
+        self.manager = manager
+        self.rows = rows
+        self.first = 0  # index of the top visible task
+        self.query = ""  # when set, only the best matches of this search are shown
+        self.shown: List[str] = []  # the lines currently on screen
+        self.text = tk.Text(self, width=width, height=rows, wrap=tk.NONE)
+        self.scrollbar = tk.Scrollbar(self, command=self.yview)
+        self.text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.text.config(state=tk.DISABLED)
+        self.text.bind("<MouseWheel>", lambda event: self.scroll(-1 if event.delta > 0 else 1))
+        self.text.bind("<Button-4>", lambda event: self.scroll(-1))
+        self.text.bind("<Button-5>", lambda event: self.scroll(1))
+
+    def yview(self, action: str, amount: str, unit: Optional[str] = None) -> None:
+        """
+        Handles scrollbar commands ("moveto fraction" or "scroll n units|pages").
+        """
+        if action == tk.MOVETO:
+            self.first = int(float(amount) * len(self.manager.tasks))
+            self.refresh()
+        elif action == tk.SCROLL:
+            self.scroll(int(amount) * (self.rows if unit == tk.PAGES else 1))
+
+    def scroll(self, rows: int) -> str:
+        """
+        Scrolls the view by a number of rows.
+        """
+        self.first += rows
+        self.refresh()
+        return "break"
+
+    def refresh(self) -> None:
+        """
+        Redraws the rows that changed since the last refresh.
+        """
+        total = len(self.manager.tasks)
+        self.first = max(0, min(self.first, total - self.rows))
+        if self.query.strip():
+            lines = self.manager.search_lines(self.query, self.rows) or ["No matching tasks."]
+            total = 0  # the matches are not scrolled
+        elif total:
+            lines = list(self.manager.iter_task_lines(self.first, self.rows))
+        else:
+            lines = [self.manager.list_tasks()]
+        self.text.config(state=tk.NORMAL)
+        for row, line in enumerate(lines):
+            if row >= len(self.shown):
+                self.text.insert(tk.END, ("\n" if row else "") + line)
+            elif self.shown[row] != line:
+                self.text.delete(f"{row + 1}.0", f"{row + 1}.end")
+                self.text.insert(f"{row + 1}.0", line)
+        if len(lines) < len(self.shown):
+            self.text.delete(f"{len(lines)}.end", tk.END)
+        self.text.config(state=tk.DISABLED)
+        self.shown = lines
+        if total > self.rows:
+            self.scrollbar.set(self.first / total, (self.first + self.rows) / total)
+        else:
+            self.scrollbar.set(0, 1)
+
+
 class TodoListApp:
     """
     A GUI application for managing a to-do list.
@@ -21,14 +102,14 @@ class TodoListApp:
         self.root.title("To-Do List Manager")
         self.task_saver = CSVSaver()  # Use the CSV strategy
         self.manager = TodoListManager(self.task_saver)
+        self.manager.enable_undo()
         self.filename = "todo_list.csv"
-
-        try:
-            self.manager.load_from_file(self.filename)
-        except Exception as e:
-            messagebox.showerror("Error", f"Error loading from file: {e}")
+        self.results: "queue.Queue[Callable[[], None]]" = queue.Queue()  # UI callbacks posted by worker threads
+        self.busy = False
 
         self.create_widgets()
+        self.root.after(50, self.process_results)
+        self.run_load(self.filename, notify=False)
 
     def create_widgets(self) -> None:
         """
@@ -36,9 +117,14 @@ class TodoListApp:
         """
         self.task_list_label = tk.Label(self.root, text="To-Do List:")
         self.task_list_label.pack(pady=5)
-        self.task_list_text = scrolledtext.ScrolledText(self.root, width=60, height=15)
-        self.task_list_text.pack(pady=10)
-        self.task_list_text.config(state=tk.DISABLED)
+        self.search_entry = tk.Entry(self.root, width=40)
+        self.search_entry.pack()
+        self.search_entry.bind("<KeyRelease>", lambda event: self.search())
+        self.task_list_view = VirtualTaskList(self.root, self.manager)
+        self.task_list_view.pack(pady=10)
+
+        self.status_label = tk.Label(self.root, text="")
+        self.status_label.pack()
 
         self.add_task_button = tk.Button(self.root, text="Add Task", command=self.add_task)
         self.add_task_button.pack(pady=5)
@@ -49,6 +135,12 @@ class TodoListApp:
         self.delete_task_button = tk.Button(self.root, text="Delete Task", command=self.delete_task)
         self.delete_task_button.pack(pady=5)
 
+        self.undo_button = tk.Button(self.root, text="Undo", command=self.undo)
+        self.undo_button.pack(pady=5)
+
+        self.redo_button = tk.Button(self.root, text="Redo", command=self.redo)
+        self.redo_button.pack(pady=5)
+
         self.save_button = tk.Button(self.root, text="Save to File", command=self.save_to_file)
         self.save_button.pack(pady=5)
 
@@ -85,6 +177,7 @@ class TodoListApp:
 
         try:
             self.manager.add_task(description, priority, deadline)
+            self.task_list_view.first = len(self.manager.tasks)  # scroll to the new task
             self.update_task_list()
         except Exception as e:
             messagebox.showerror("Error", str(e))
@@ -94,9 +187,8 @@ class TodoListApp:
         Marks a task as done using a dialog box.
         """
         try:
-            task_list_string = self.manager.list_tasks()
-            if "No tasks" in task_list_string:
-                messagebox.showinfo("Info", task_list_string)
+            if not self.manager.tasks:
+                messagebox.showinfo("Info", self.manager.list_tasks())
                 return
 
             index = simpledialog.askinteger("Mark as Done", "Enter the index of the task to mark as done:")
@@ -113,9 +205,8 @@ class TodoListApp:
         Deletes a task using a dialog box.
         """
         try:
-            task_list_string = self.manager.list_tasks()
-            if "No tasks" in task_list_string:
-                messagebox.showinfo("Info", task_list_string)
+            if not self.manager.tasks:
+                messagebox.showinfo("Info", self.manager.list_tasks())
                 return
             index = simpledialog.askinteger("Delete Task", "Enter the index of the task to delete:")
             if index is not None:
@@ -126,19 +217,33 @@ class TodoListApp:
         except IndexError:
             messagebox.showerror("Error", "Invalid task index.")
 
+    def undo(self) -> None:
+        """
+        Reverts the last change.
+        """
+        if self.manager.undo():
+            self.update_task_list()
+
+    def redo(self) -> None:
+        """
+        Repeats the last undone change.
+        """
+        if self.manager.redo():
+            self.update_task_list()
+
     def save_to_file(self) -> None:
         """
-        Saves the to-do list to a file.
+        Saves the to-do list to a file on a worker thread.
         """
         filename = simpledialog.askstring("Save to File", "Enter filename:")
         if filename:
-            try:
-                if not filename.endswith(".csv"):
-                    filename += ".csv"
-                self.manager.save_to_file(filename)
-                messagebox.showinfo("Success", "To-do list saved successfully.")
-            except Exception as e:
-                messagebox.showerror("Error", str(e))
+            if not filename.endswith(".csv"):
+                filename += ".csv"
+            snapshot = self.manager.tasks.copy()  # the worker saves a copy, so editing can continue
+            saver = self.manager.task_saver
+            self.run_in_background(f"Saving {len(snapshot)} tasks...",
+                                   lambda progress: saver.save(snapshot, filename),
+                                   lambda result: messagebox.showinfo("Success", "To-do list saved successfully."))
 
     def load_from_file(self) -> None:
         """
@@ -146,23 +251,95 @@ class TodoListApp:
         """
         filename = simpledialog.askstring("Load from File", "Enter filename:")
         if filename:
-            try:
-                self.manager.load_from_file(filename)
-                self.update_task_list()
+            self.run_load(filename, notify=True)
+
+    def run_load(self, filename: str, notify: bool) -> None:
+        """
+        Loads a file into a new manager on a worker thread and shows it once loading has finished.
+
+        :param filename: The name of the file to load.
+        :param notify: Whether to confirm success with a message box.
+        """
+        def load(progress: Callable[[int], None]) -> TodoListManager:
+            manager = TodoListManager(CSVSaver())
+            manager.load_from_file(filename, progress=progress)
+            manager.enable_undo()
+            return manager
+
+        def show(manager: TodoListManager) -> None:
+            self.manager = self.task_list_view.manager = manager
+            self.task_saver = manager.task_saver
+            self.task_list_view.first = 0
+            self.update_task_list()
+            if notify:
                 messagebox.showinfo("Success", "To-do list loaded successfully.")
+
+        self.run_in_background(f"Loading {filename}...", load, show)
+
+    def run_in_background(self, status: str, work: Callable[[Callable[[int], None]], object],
+                          on_done: Callable[[object], None]) -> None:
+        """
+        Runs work on a worker thread while the buttons are disabled.  Progress and the result are
+        handed back to the Tk main thread through the results queue, which is polled with root.after.
+
+        :param status: The text shown while the work runs.
+        :param work: Called on the worker with a progress callback taking the number of tasks processed.
+        :param on_done: Called on the main thread with the result of work.
+        """
+        if self.busy:
+            messagebox.showinfo("Info", "Please wait for the current file operation to finish.")
+            return
+        self.set_busy(True, status)
+
+        def report(count: int) -> None:
+            self.results.put(lambda: self.status_label.config(text=f"{status} {count} tasks"))
+
+        def run() -> None:
+            try:
+                result = work(report)
             except Exception as e:
-                messagebox.showerror("Error", str(e))
+                error = str(e)
+                self.results.put(lambda: (self.set_busy(False), messagebox.showerror("Error", error)))
+            else:
+                self.results.put(lambda: (self.set_busy(False), on_done(result)))
+
+        threading.Thread(target=run, daemon=True).start()
+
+    def process_results(self) -> None:
+        """
+        Runs the callbacks posted by worker threads.
+        """
+        while True:
+            try:
+                callback = self.results.get_nowait()
+            except queue.Empty:
+                break
+            callback()
+        self.root.after(50, self.process_results)
+
+    def set_busy(self, busy: bool, status: str = "") -> None:
+        """
+        Enables or disables the buttons while a file operation runs.
+        """
+        self.busy = busy
+        self.status_label.config(text=status)
+        state = tk.DISABLED if busy else tk.NORMAL
+        for button in (self.add_task_button, self.mark_done_button, self.delete_task_button, self.undo_button,
+                       self.redo_button, self.save_button, self.load_button):
+            button.config(state=state)
+
+    def search(self) -> None:
+        """
+        Shows the tasks matching the search box as the user types; an empty box shows the whole list.
+        """
+        self.task_list_view.query = self.search_entry.get()
+        self.update_task_list()
 
     def update_task_list(self) -> None:
         """
         Updates the task list display.
         """
-        self.task_list_text.config(state=tk.NORMAL)
-        self.task_list_text.delete("1.0", tk.END)
-        task_list_string = self.manager.list_tasks()
-        if task_list_string:
-            self.task_list_text.insert(tk.END, task_list_string)
-        self.task_list_text.config(state=tk.DISABLED)
+        self.task_list_view.refresh()
 
     def exit_app(self) -> None:
         """
@@ -174,4 +351,4 @@ class TodoListApp:
 if __name__ == "__main__":
     root = tk.Tk()
     app = TodoListApp(root)
-    root.mainloop()
\ No newline at end of file
+    root.mainloop()
@@ -1,15 +1,87 @@
 #This module defines the TodoListManager class.
 
+import concurrent.futures
+import contextlib
 import datetime
-from typing import List, Optional
+import os
+import tempfile
+from typing import Callable, ContextManager, IO, Iterable, Iterator, List, Optional, Sequence, Tuple
 from task import Task  # Import the Task class from task.py
+from task_loader import DEFAULT_CHUNK_SIZE, file_stamp, iter_task_chunks, load_store
+from task_store import TaskStore
+from lazy_csv import LazyTaskFile
+from task_index import ANY, TaskIndex
+from task_render import TaskRenderer
+from autosave import Autosaver
+from task_search import TaskSearchIndex
+from history import History
+from scheduler import TaskScheduler, urgency_key
+from metrics import MANAGER_OPERATIONS, SAVER_OPERATIONS, Metrics
 import abc
 
+
+@contextlib.contextmanager
+def atomic_write(filename: str, newline: Optional[str] = None, mode: str = "w") -> Iterator[IO]:
+    """
+    Opens a temporary file for writing and moves it over filename once the with block succeeds.
+
+    The data is flushed and fsynced before os.replace, so a crash leaves either the old or the new file.
+    Every call writes its own temporary file, so concurrent saves of the same file (an explicit save
+    during an autosave) cannot truncate each other's data; the last one to finish wins.
+
+    :param mode: "w" for text or "wb" for binary data.
+    """
+    directory, name = os.path.split(os.path.abspath(filename))
+    fd, tmp = tempfile.mkstemp(prefix=name + ".", suffix=".tmp", dir=directory)
+    try:
+        try:
+            permissions = os.stat(filename).st_mode & 0o777
+        except FileNotFoundError:
+            permissions = 0o644  # mkstemp creates the file readable by its owner only
+        os.chmod(tmp, permissions)
+        with open(fd, mode, newline=newline) as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, filename)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
 # Define an interface for saving tasks
 class TaskSaver(abc.ABC):
     @abc.abstractmethod
-    def save(self, tasks: List[Task], filename: str) -> None:
-        pass
+    def save(self, tasks: List[Task], filename: str) -> Optional[Tuple[int, int]]:
+        """
+        Saves tasks to a file.  Savers that rewrite the whole file return None; savers that write only
+        changes return the number of rows and bytes they wrote, with 0 bytes when they cannot tell.
+        """
+
+    incremental = False  # True for savers that write only the changes of the store they are bound to
+    keeps_ids = False  # True for savers whose load returns a TaskStore with the task ids stored in the file
+
+    def bind(self, tasks: TaskStore) -> None:
+        """Called with the task store of the manager using this saver.  Savers that track changes subscribe here."""
+
+    def take_changes(self, tasks: TaskStore, filename: str) -> bool:
+        """
+        Called by incremental savers' callers while the lock of tasks is held: queues the changes a save
+        would write, so write_changes can write them once the lock is released.  Returns False when the
+        file needs a full save instead, which is always the case for savers that rewrite the whole file.
+        """
+        return False
+
+    def write_changes(self, filename: str) -> Tuple[int, int]:
+        """Writes the changes queued by take_changes and returns the number of rows and bytes written."""
+        return 0, 0
+
+    def version(self, filename: str) -> tuple:
+        """
+        Returns a token that changes whenever a save changes the saved list: by default the stamp of the file.
+        Savers that also write companion files include their stamps.
+        """
+        return (file_stamp(filename),)
 
 # Implement concrete strategies for saving tasks
 class TextTaskSaver(TaskSaver):
@@ -18,11 +90,16 @@ class TextTaskSaver(TaskSaver):
         if not isinstance(filename, str):
             raise TypeError("Filename must be a string.")
         try:
-            with open(filename, "w") as f:
+            with atomic_write(filename) as f:
                 for task in tasks:
                     f.write(f"{'X' if task.is_done else 'False'},{task.description},{task.priority if task.priority is not None else 'None'},{task.deadline.strftime('%Y-%m-%d') if task.deadline else 'None'}\n")
         except Exception as e:
             raise Exception(f"Error saving to file: {e}")
+
+    def open(self, filename: str) -> LazyTaskFile:
+        """Opens a saved file for paging without parsing it; each task is parsed when accessed."""
+        return LazyTaskFile(filename)
+
 class CSVSaver(TaskSaver):
     def save(self, tasks: List[Task], filename: str) -> None:
         """Saves tasks to a CSV file."""
@@ -30,7 +107,7 @@ class CSVSaver(TaskSaver):
         if not isinstance(filename, str):
             raise TypeError("Filename must be a string.")
         try:
-            with open(filename, "w", newline="") as f:
+            with atomic_write(filename, newline="") as f:
                 writer = csv.writer(f)
                 writer.writerow(["is_done", "description", "priority", "deadline"])  # header
                 for task in tasks:
@@ -43,6 +120,10 @@ class CSVSaver(TaskSaver):
         except Exception as e:
             raise Exception(f"Error saving to CSV file: {e}")
 
+    def open(self, filename: str) -> LazyTaskFile:
+        """Opens a saved file for paging without parsing it; each task is parsed when accessed."""
+        return LazyTaskFile(filename)
+
 class TodoListManager:
     """
     Manages a collection of tasks.  Implements the Strategy Pattern.
@@ -51,16 +132,50 @@ class TodoListManager:
         """
         Initializes the TodoListManager.
         """
-        self.tasks: List[Task] = []
+        self._tasks = TaskStore()
+        self._index: Optional[TaskIndex] = None  # built by the first call to find
+        self._renderer: Optional[TaskRenderer] = None  # built by the first call to list_tasks
+        self._scheduler: Optional[TaskScheduler] = None  # built by the first call to next_tasks
+        self._search: Optional[TaskSearchIndex] = None  # built by the first search, or loaded with the list
+        self._autosaver: Optional[Autosaver] = None
+        self._metrics: Optional[Metrics] = None  # set by enable_metrics
+        self._history: Optional[History] = None  # set by enable_undo
         self.task_saver = task_saver or TextTaskSaver() # Default strategy
 
-    def add_task(self, description: str, priority: Optional[int] = None, deadline: Optional[datetime.date] = None) -> None:
+    @property
+    def task_saver(self) -> TaskSaver:
+        """
+        The strategy used to save (and, if it provides a load method, to load) the tasks.
+        """
+        return self._task_saver
+
+    @task_saver.setter
+    def task_saver(self, task_saver: TaskSaver) -> None:
+        task_saver.bind(self._tasks)
+        if self._metrics is not None:
+            self._metrics.uninstrument(self._task_saver, SAVER_OPERATIONS)
+            self._metrics.instrument(task_saver, SAVER_OPERATIONS, type(task_saver).__name__ + ".")
+        self._task_saver = task_saver
+
+    @property
+    def tasks(self) -> TaskStore:
+        """
+        The tasks in the to-do list, kept in a compact TaskStore.
+        """
+        return self._tasks
+
+    @tasks.setter
+    def tasks(self, tasks: Iterable[Task]) -> None:
+        self._tasks.replace(tasks)
+
+    def add_task(self, description: str, priority: Optional[int] = None, deadline: Optional[datetime.date] = None) -> int:
         """
         Adds a new task to the list.
 
         :param description: The description of the task.
         :param priority: The priority of the task (1-3, where 1 is highest).
         :param deadline: The deadline for the task.
+        :return: The id of the new task, which stays valid when other tasks are deleted.
         """
         if not isinstance(description, str):
             raise TypeError("Description must be a string.")
@@ -74,19 +189,154 @@ class TodoListManager:
             raise TypeError("Deadline must be a datetime.date object or None.")
 
         self.tasks.append(Task(description, priority=priority, deadline=deadline))
+        return self.tasks.id_at(-1)
+
+    def add_tasks(self, tasks: Iterable[Task]) -> List[int]:
+        """
+        Adds many tasks in one pass.  Task validates its own fields, so only empty descriptions are checked here.
+
+        :param tasks: The tasks to add.
+        :return: The ids of the new tasks.
+        """
+        tasks = list(tasks)
+        for task in tasks:
+            if not isinstance(task, Task):
+                raise TypeError("Tasks must be Task objects.")
+            if not task.description:
+                raise ValueError("Description cannot be empty.")
+        with self._undo_step():
+            start = len(self.tasks)
+            self.tasks.extend(tasks)
+            return self.tasks.ids(start)
+
+    def _slots_of(self, task_ids: Iterable[int]) -> List[int]:
+        """
+        Resolves task ids to positions, checking all of them before anything is changed.
+        """
+        slots = []
+        for task_id in task_ids:
+            if not isinstance(task_id, int):
+                raise TypeError("Task ids must be integers.")
+            slots.append(self.tasks.slot_of(task_id))
+        return slots
+
+    def get_task(self, task_id: int) -> Task:
+        """
+        Returns the task with the given id.
+
+        :param task_id: The id returned when the task was added.
+        """
+        return self.tasks[self._slots_of([task_id])[0]]
+
+    def mark_done_many(self, task_ids: Iterable[int]) -> None:
+        """
+        Marks the tasks with the given ids as done.
+
+        :param task_ids: The ids of the tasks.
+        """
+        slots = self._slots_of(task_ids)
+        with self._undo_step():
+            for slot in slots:
+                self.tasks.mark_done(slot)
+
+    def delete_many(self, task_ids: Iterable[int]) -> None:
+        """
+        Deletes the tasks with the given ids in one pass over the list.
 
-    def list_tasks(self) -> str:
+        :param task_ids: The ids of the tasks.
         """
-        Lists all tasks in the to-do list.
+        slots = self._slots_of(task_ids)
+        with self._undo_step():
+            self.tasks.delete_slots(slots)
 
+    def list_tasks(self, offset: int = 0, limit: Optional[int] = None) -> str:
+        """
+        Lists the tasks in the to-do list, or one page of them.
+
+        :param offset: The number of tasks to skip.
+        :param limit: The maximum number of tasks to list; by default all remaining tasks.
         :return: A string representation of the tasks.
         """
         if not self.tasks:
             return "No tasks in the to-do list."
-        task_list_string = "To-Do List:\n"
-        for index, task in enumerate(self.tasks):
-            task_list_string += f"{index + 1}. {task}\n"
-        return task_list_string
+        lines = self.iter_task_lines(offset, limit)
+        return "To-Do List:\n" + "".join(line + "\n" for line in lines)
+
+    def iter_task_lines(self, offset: int = 0, limit: Optional[int] = None) -> Iterator[str]:
+        """
+        Yields the numbered lines of list_tasks one at a time.  The text of each task is cached until it changes.
+
+        :param offset: The number of tasks to skip.
+        :param limit: The maximum number of tasks to yield; by default all remaining tasks.
+        """
+        if not isinstance(offset, int) or (limit is not None and not isinstance(limit, int)):
+            raise TypeError("Offset and limit must be integers.")
+        if offset < 0 or (limit is not None and limit < 0):
+            raise ValueError("Offset and limit cannot be negative.")
+        if self._renderer is None:
+            self._renderer = TaskRenderer(self._tasks)
+        return self._renderer.lines(offset, limit)
+
+    def find(self, priority=ANY, due_before: Optional[datetime.date] = None, due_after: Optional[datetime.date] = None,
+             done: Optional[bool] = None) -> Iterator[Task]:
+        """
+        Lazily yields the tasks matching all given conditions, e.g. find(priority=1, due_before=today, done=False).
+
+        The first call builds indexes over priority, deadline and completion state, which are then kept up to date.
+
+        :param priority: The priority (1-3, or None for tasks without one).  By default every priority matches.
+        :param due_before: Only tasks with a deadline strictly before this date.
+        :param due_after: Only tasks with a deadline strictly after this date.
+        :param done: The completion state.  None matches both.
+        """
+        if self._index is None:
+            self._index = TaskIndex(self._tasks)
+        return self._index.find(priority, due_before, due_after, done)
+
+    def _search_index(self) -> TaskSearchIndex:
+        if self._search is None:
+            self._search = TaskSearchIndex(self._tasks)
+        return self._search
+
+    def search(self, query: str, limit: Optional[int] = None, prefix: bool = False) -> List[Task]:
+        """
+        Returns the tasks whose descriptions contain any word of the query, best matches first.
+
+        Tasks matching more of the words come first, then tasks matching rarer words.  The first call
+        builds an inverted index over the descriptions, which is then kept up to date.
+
+        :param query: The words to look for; case is ignored.
+        :param limit: The maximum number of tasks; by default all matches.
+        :param prefix: Whether the last word also matches longer words starting with it, for type-ahead.
+        """
+        return self._search_index().search(query, limit, prefix)
+
+    def search_lines(self, query: str, limit: Optional[int] = None, prefix: bool = True) -> List[str]:
+        """
+        Returns the numbered lines, as in list_tasks, of the tasks that search would return.
+        """
+        task_ids = self._search_index().search_ids(query, limit, prefix)
+        if self._renderer is None:
+            self._renderer = TaskRenderer(self._tasks)
+        slots = [self.tasks.slot_of(task_id) for task_id in task_ids]
+        return [f"{slot + 1}. {self._renderer.render(slot)}" for slot in slots]
+
+    def next_tasks(self, k: int = 1, key: Callable[[Task], object] = urgency_key) -> List[Task]:
+        """
+        Returns the k tasks to work on next: the open tasks with the smallest keys, in order.
+
+        The first call (and the first call with a different key) builds a heap over the open tasks,
+        which is then kept up to date, so later calls cost O(k log k).
+
+        :param k: The number of tasks.
+        :param key: Computes the sort key of a task.  By default the earliest deadline comes first, then the
+                    highest priority; tasks without a deadline or priority come last.
+        """
+        if self._scheduler is None or self._scheduler.key is not key:
+            if self._scheduler is not None:
+                self._scheduler.close()
+            self._scheduler = TaskScheduler(self._tasks, key)
+        return self._scheduler.next(k)
 
     def mark_task_as_done(self, index: int) -> None:
         """
@@ -98,7 +348,7 @@ class TodoListManager:
             raise TypeError("Index must be an integer.")
         if not 1 <= index <= len(self.tasks):
             raise IndexError("Invalid task index.")
-        self.tasks[index - 1].mark_as_done()
+        self.tasks.mark_done(index - 1)
 
     def delete_task(self, index: int) -> None:
         """
@@ -112,59 +362,231 @@ class TodoListManager:
             raise IndexError("Invalid task index.")
         del self.tasks[index - 1]
 
-    def save_to_file(self, filename: str) -> None:
+    def enable_autosave(self, filename: str, delay: float = 1.0) -> None:
+        """
+        Saves the to-do list in the background whenever no change has happened for delay seconds.
+
+        Changes return immediately; bursts of changes are written once, using the injected strategy.
+
+        :param filename: The name of the file to save to.
+        :param delay: The quiet period in seconds after the last change before saving.
+        """
+        self.disable_autosave()
+        self._autosaver = Autosaver(self._tasks, self.task_saver, filename, delay)
+
+    def flush_autosave(self, timeout: Optional[float] = None) -> bool:
+        """
+        Writes pending autosave changes now and waits for the write.
+
+        :param timeout: The maximum number of seconds to wait; by default no limit.
+        :return: True if every change made so far has been written.
+        """
+        if self._autosaver is None:
+            return True
+        return self._autosaver.flush(timeout)
+
+    def disable_autosave(self) -> None:
+        """
+        Writes pending autosave changes and stops autosaving.
+        """
+        autosaver, self._autosaver = self._autosaver, None
+        if autosaver is not None:
+            autosaver.close()
+
+    def enable_undo(self, limit: int = 100) -> None:
+        """
+        Starts recording changes for undo and redo.
+
+        Each step records only what it changed (one task for add_task, mark_task_as_done and delete_task),
+        never a copy of the list.  Loading a file or assigning tasks clears the history.
+
+        :param limit: The maximum number of steps that can be undone.
+        """
+        self.disable_undo()
+        self._history = History(self._tasks, limit)
+
+    def disable_undo(self) -> None:
+        """
+        Stops recording changes and drops the history.
+        """
+        history, self._history = self._history, None
+        if history is not None:
+            history.close()
+
+    def _undo_step(self) -> ContextManager[None]:
+        """
+        Groups the changes of one bulk operation into a single undo step.
+        """
+        return self._history.step() if self._history is not None else contextlib.nullcontext()
+
+    def undo(self) -> bool:
+        """
+        Reverts the most recent change; a bulk operation such as add_tasks counts as one change.
+
+        :return: False if there is nothing to undo or undo is not enabled.
+        """
+        return self._history is not None and self._history.undo()
+
+    def redo(self) -> bool:
+        """
+        Repeats the most recently undone change.
+
+        :return: False if there is nothing to redo or undo is not enabled.
+        """
+        return self._history is not None and self._history.redo()
+
+    def enable_metrics(self, metrics: Optional[Metrics] = None) -> Metrics:
+        """
+        Records latency, call counts, rows and bytes of the manager's operations and of its saver.
+
+        Until this is called the operations run without any instrumentation.
+
+        :param metrics: The Metrics object to record into; by default a new one.
+        :return: The Metrics object, for snapshot, prometheus and add_hook.
+        """
+        self.disable_metrics()
+        self._metrics = metrics or Metrics()
+        self._metrics.instrument(self, MANAGER_OPERATIONS)
+        self._metrics.instrument(self.task_saver, SAVER_OPERATIONS, type(self.task_saver).__name__ + ".")
+        return self._metrics
+
+    def disable_metrics(self) -> None:
+        """
+        Stops recording metrics.  The Metrics object keeps what it has recorded.
+        """
+        metrics, self._metrics = self._metrics, None
+        if metrics is not None:
+            metrics.uninstrument(self, MANAGER_OPERATIONS)
+            metrics.uninstrument(self.task_saver, SAVER_OPERATIONS)
+
+    def save_to_file(self, filename: str, search_index: bool = False) -> None:
         """
         Saves the to-do list to a file.  Uses the injected strategy.
 
         :param filename: The name of the file to save to.
+        :param search_index: Whether to also save the search index next to the file, so that loading
+                             with search_index=True does not have to rebuild it.
         """
         self.task_saver.save(self.tasks, filename)
+        if search_index:
+            self._search_index().save(filename, self.task_saver.version(filename))
+
+    def _source_file(self, filename: str) -> str:
+        """
+        Returns the name of the file load_from_file reads: the CSV loader reads "x.csv" for "x.txt".
+        """
+        if getattr(self.task_saver, "load", None) is None and not filename.endswith(".csv"):
+            return filename.replace(".txt", ".csv")
+        return filename
 
-    def load_from_file(self, filename: str = "todo_list.txt") -> None:
+    def load_from_file(self, filename: str = "todo_list.txt", chunk_size: int = DEFAULT_CHUNK_SIZE,
+                       progress: Optional[Callable[[int], None]] = None, search_index: bool = False) -> None:
         """
-        Loads the to-do list from a file.  Assumes CSV format.
+        Loads the to-do list from a file.  Assumes CSV format unless the saver provides its own load method.
+
+        The file is streamed in chunks, so the loader itself runs in constant memory.
 
         :param filename: The name of the file to load from.
+        :param chunk_size: The number of rows parsed per chunk.
+        :param progress: Called with the number of tasks loaded so far after each chunk.
+        :param search_index: Whether to use the search index saved next to the file.  It is only used if
+                             the file has not changed since; otherwise the index is rebuilt on the first search.
         """
         if not isinstance(filename, str):
             raise TypeError("Filename must be a string.")
-        if not filename.endswith(".csv"):
-            filename = filename.replace(".txt", ".csv")
+        if search_index and self._search is not None:
+            self._search.close()  # replaced below instead of being rebuilt for the new tasks
+            self._search = None
+        loader = getattr(self.task_saver, "load", None)
+        if loader is not None:
+            try:
+                loaded = loader(filename)
+                if isinstance(loaded, TaskStore) and not self.task_saver.keeps_ids:
+                    loaded = self._renumbered(loaded)
+                self.tasks = loaded
+                if progress is not None:
+                    progress(len(self.tasks))
+            except FileNotFoundError:
+                self.tasks = []
+            except Exception as e:
+                raise Exception(f"Error loading from file: {e}")
+            if search_index:
+                self._search = TaskSearchIndex.load(self._tasks, filename, self.task_saver.version(filename))
+            return
+        filename = self._source_file(filename)
+        if not isinstance(chunk_size, int):
+            raise TypeError("Chunk size must be an integer.")
+        if chunk_size < 1:
+            raise ValueError("Chunk size must be positive.")
         self.tasks = []
         try:
-            with open(filename, "r") as f:
-                reader = f.readlines()
-                if reader:
-                    header = reader[0].strip().split(",")
-                    if header == ["is_done", "description", "priority", "deadline"]:
-                        for line in reader[1:]:
-                            parts = line.strip().split(",")
-                            if len(parts) == 4:
-                                is_done = parts[0] == "X"
-                                description = parts[1]
-                                priority = int(parts[2]) if parts[2] != "None" else None
-                                deadline_str = parts[3]
-                                deadline = datetime.datetime.strptime(deadline_str,
-                                                                     '%Y-%m-%d').date() if deadline_str != "None" and deadline_str != "None" else None
-                                self.tasks.append(
-                                    Task(description, is_done, priority, deadline))
-                            else:
-                                print(f"Skipping invalid line: {line.strip()}")
-                    else:
-                         for line in reader:
-                            parts = line.strip().split(",")
-                            if len(parts) == 4:
-                                is_done = parts[0] == "X"
-                                description = parts[1]
-                                priority = int(parts[2]) if parts[2] != "None" else None
-                                deadline_str = parts[3]
-                                deadline = datetime.datetime.strptime(deadline_str,
-                                                                     '%Y-%m-%d').date() if deadline_str != "None" and deadline_str != "None" else None
-                                self.tasks.append(
-                                    Task(description, is_done, priority, deadline))
-                            else:
-                                print(f"Skipping invalid line: {line.strip()}")
+            for chunk in iter_task_chunks(filename, chunk_size):
+                self.tasks.extend(chunk)
+                if progress is not None:
+                    progress(len(self.tasks))
         except FileNotFoundError:
             pass
         except Exception as e:
-            raise Exception(f"Error loading from file: {e}")
\ No newline at end of file
+            raise Exception(f"Error loading from file: {e}")
+        if search_index:
+            self._search = TaskSearchIndex.load(self._tasks, filename, self.task_saver.version(filename))
+
+    def load_many(self, filenames: Sequence[str], workers: Optional[int] = None, dedupe: bool = False,
+                  progress: Optional[Callable[[int], None]] = None) -> None:
+        """
+        Loads several CSV files in parallel and replaces the to-do list with all of their tasks, in file order.
+
+        Each file is parsed in a worker process and comes back as the compact columns of a TaskStore,
+        which are appended without decoding the tasks again.  Missing files count as empty.
+
+        :param filenames: The names of the CSV files to load.
+        :param workers: The number of worker processes; by default one per CPU.  With 1 the files are
+                        loaded in this process.
+        :param dedupe: Whether to keep only the first of several tasks with equal fields.
+        :param progress: Called with the number of files loaded so far after each file.
+        """
+        if isinstance(filenames, str) or not all(isinstance(filename, str) for filename in filenames):
+            raise TypeError("Filenames must be a sequence of strings.")
+        if workers is not None and not isinstance(workers, int):
+            raise TypeError("Workers must be an integer or None.")
+        if workers is not None and workers < 1:
+            raise ValueError("Workers must be positive.")
+        workers = min(workers or os.cpu_count() or 1, len(filenames)) or 1
+        merged = TaskStore()
+        merged._next_id = self.tasks._next_id  # ids handed out before must not name loaded tasks
+        try:
+            if workers == 1:
+                stores = map(load_store, filenames)
+                self._merge(merged, stores, progress)
+            else:
+                with concurrent.futures.ProcessPoolExecutor(workers) as pool:
+                    stores = pool.map(load_store, filenames, chunksize=max(1, len(filenames) // (workers * 4)))
+                    self._merge(merged, stores, progress)
+        except Exception as e:
+            raise Exception(f"Error loading from file: {e}")
+        if dedupe:
+            seen = set()
+            duplicates = []
+            for slot, key in enumerate(zip(merged._descriptions, merged._flags, merged._deadlines)):
+                if key in seen:
+                    duplicates.append(slot)
+                else:
+                    seen.add(key)
+            merged.delete_slots(duplicates)
+        self.tasks = merged
+
+    def _renumbered(self, store: TaskStore) -> TaskStore:
+        """
+        Returns the tasks of a loaded store with new ids, so ids handed out before the load stay unknown.
+        """
+        renumbered = TaskStore()
+        renumbered._next_id = self.tasks._next_id
+        renumbered.extend(store)  # copies the columns without decoding the tasks
+        return renumbered
+
+    @staticmethod
+    def _merge(merged: TaskStore, stores: Iterable[TaskStore], progress: Optional[Callable[[int], None]]) -> None:
+        for count, store in enumerate(stores, 1):
+            merged.extend(store)
+            if progress is not None:
+                progress(count)